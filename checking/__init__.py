@@ -7,8 +7,14 @@ from .classes.mocking import *
 from .classes.fluent_assert import verify
 from .classes.soft_assert import SoftAssert
 from .classes.listeners.file_logger import DefaultFileListener
+from .classes.listeners.dispatcher import AsyncListener
+from .classes.listeners.result_writers import JUnitListener, JsonLinesListener
+from .classes.listeners.report_writer import ReportListener
+from .classes.listeners.history_db import HistoryDbListener
 
 __all__ = ['start', 'common', 'SoftAssert', 'Spy', 'TestDouble', 'DefaultFileListener',
+           'AsyncListener', 'JUnitListener', 'JsonLinesListener', 'ReportListener',
+           'HistoryDbListener',
            'DATA_FILE', 'CONTAINER', 'provider',
            'equals', 'is_none', 'is_not_none', 'should_raise', 'test_fail', 'test_break', 'test_skip',
            'no_exception_expected', 'contains', 'verify', 'not_contains', 'not_equals', 'is_false', 'is_true',
@@ -1,19 +1,26 @@
 import os
 import sys
 import json
+import shutil
 import argparse
 import importlib
-from typing import Dict, Union, List, Type
+from typing import Dict, Union, List, Type, Optional
 
 from checking.runner import start
 from checking.helpers.others import str_date_time
 from checking.helpers.others import is_file_exists
+from checking.helpers.report import FOLDER, REPORT_MODES, generate, store
+from checking.helpers.sharding import parse_shard
+from checking.helpers.serialization import load_results
+from checking.helpers.history_db import HistoryDatabase, LAST_RUNS, REGRESSION_RATIO, format_rows
+from checking.classes.basic_suite import TestSuite
 from checking.classes.listeners.default import DefaultListener
 from checking.classes.listeners.file_logger import DefaultFileListener
 
 HOME_FOLDER = sys.path[0]
 LOOK_FOR = ('import checking', 'from checking')
 DEFAULT_LISTENERS = {'DefaultListener': DefaultListener, 'DefaultFileListener': DefaultFileListener}
+RESULTS_MODES = ('all', 'summary')
 
 
 def read_parameters_from_file(file_name_: str) -> Dict:
@@ -35,8 +42,10 @@ def check_parameters(parameters: Dict):
     :return: None
     :raise ValueError: if the parameters are invalid
     """
-    schema = {bool: ['dry_run', 'random_order', 'generate_report'], str: ['suite_name', 'listener', 'filter_by_name'],
-              int: ['threads', 'verbose', 'max_fail'],
+    schema = {bool: ['dry_run', 'random_order', 'generate_report'], str: ['suite_name', 'listener', 'filter_by_name',
+                                                                            'history_file', 'shard', 'cache_dir',
+                                                                            'results', 'report_mode'],
+              int: ['threads', 'verbose', 'max_fail', 'processes'],
               list: ['modules', 'groups'], dict: ['params']}
     for key, value in schema.items():
         for element in value:
@@ -53,6 +62,12 @@ def check_parameters(parameters: Dict):
     if listener_ and '.' not in listener_ and listener_ not in DEFAULT_LISTENERS:
         raise ValueError(f'Listener parameter must contain the module and class names, e.g. "my_module.MyListener",'
                          f' or it must point to a name of one of the default listeners!')
+    if parameters.get('shard'):
+        parse_shard(parameters['shard'])
+    if parameters.get('results', 'all') not in RESULTS_MODES:
+        raise ValueError(f'Results parameter must be one of {RESULTS_MODES}!')
+    if parameters.get('report_mode', 'inline') not in REPORT_MODES:
+        raise ValueError(f'Report_mode parameter must be one of {REPORT_MODES}!')
 
 
 def _get_default_params():
@@ -65,10 +80,16 @@ def _get_default_params():
         'modules': [],
         'max_fail': 0,
         'threads': 1,
+        'processes': 0,
         'dry_run': False,
         'filter_by_name': '',
         'random_order': False,
         'generate_report': False,
+        'history_file': '',
+        'shard': '',
+        'cache_dir': '',
+        'results': 'all',
+        'report_mode': 'inline',
     }
 
 
@@ -235,17 +256,99 @@ def parse_arguments() -> argparse.Namespace:
     parser.add_argument('-R', '--generate_report',
                         help="Creates a folder with an html report in the current folder!", action='store_const',
                         const=True)
+    parser.add_argument('-s', '--shard', help="Run only the part of the suite, like K/N (e.g. 2/4) - the second "
+                                              "of four parts. Use to split the suite across several machines.")
     return parser.parse_args()
 
 
+def parse_report_arguments(arguments: List[str]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(prog='python -m checking report',
+                                     description="Builds the html report in the current folder from the results files, "
+                                                 "written by JsonLinesListener. The results of several files "
+                                                 "(e.g. of the shards of the suite) are merged into one report.")
+    parser.add_argument('results', nargs='+', help="Results files (*.jsonl or gzipped *.jsonl.gz)")
+    parser.add_argument('-m', '--mode', choices=('inline', 'paged'), default='inline',
+                        help="Report mode, use 'paged' for big suites")
+    parser.add_argument('-a', '--attachments', action='append', default=[],
+                        help="Attachments folder of the run (test_results/attachments) to copy to the report, "
+                             "can be repeated")
+    return parser.parse_args(arguments)
+
+
+def build_report(file_names: List[str], mode: str = 'inline', attachments: List[str] = ()):
+    """
+    Builds the html report from the saved results, without running the tests.
+
+    :param file_names: names of the results files
+    :param mode: report mode (see report.generate)
+    :param attachments: attachments folders of the runs, their files are copied to the report
+    :return: None
+    """
+    test_suite = TestSuite.get_instance()
+    load_results(file_names, test_suite)
+    for folder in attachments:
+        os.makedirs(store.directory, exist_ok=True)
+        for name in os.listdir(folder):
+            # files are named by the hash of the content, so the existing ones are the same
+            if not os.path.exists(os.path.join(store.directory, name)):
+                shutil.copyfile(os.path.join(folder, name), os.path.join(store.directory, name))
+    generate(test_suite, mode)
+    print(f'The report of {test_suite.results_count()} tests is written to the {os.path.abspath(FOLDER)} folder')
+
+
+def parse_history_arguments(arguments: List[str]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(prog='python -m checking history',
+                                     description="Shows the tests of the last runs, saved by HistoryDbListener.")
+    parser.add_argument('database', help="History database file")
+    parser.add_argument('query', choices=('slow', 'regressed', 'flaky'),
+                        help="slow - the greatest mean durations, regressed - the mean duration grew against the "
+                             "earlier runs, flaky - both passed and failed")
+    parser.add_argument('-r', '--runs', type=int, default=LAST_RUNS, help="Number of the last runs to analyze")
+    parser.add_argument('-n', '--limit', type=int, default=50, help="Max number of the tests to show")
+    parser.add_argument('--ratio', type=float, default=REGRESSION_RATIO,
+                        help="Min ratio of the recent and the earlier mean durations of the regressed tests")
+    parser.add_argument('-s', '--suite', help="Name of the test suite, the suite of the last run by default")
+    return parser.parse_args(arguments)
+
+
+def show_history(file_name: str, query: str, runs: int = LAST_RUNS, limit: int = 50,
+                 ratio: float = REGRESSION_RATIO, suite: Optional[str] = None):
+    """
+    Prints the results of the query to the history database.
+
+    :param file_name: path to the database file
+    :param query: 'slow', 'regressed' or 'flaky'
+    :param runs: number of the last runs to analyze
+    :param limit: max number of the tests
+    :param ratio: min ratio of the durations of the regressed tests
+    :param suite: name of the test suite, the suite of the last run if None
+    :return: None
+    """
+    if not is_file_exists(file_name):
+        raise ValueError(f"{file_name} not found!")
+    database = HistoryDatabase(file_name)
+    try:
+        if query == 'slow':
+            rows = database.slowest(runs, limit, suite)
+        elif query == 'regressed':
+            rows = database.regressed(runs, limit, ratio, suite)
+        else:
+            rows = database.flaky(runs, limit, suite)
+    finally:
+        database.close()
+    print(format_rows(rows))
+
+
 def _main_run(file_name_: str, p_: Dict, dry_run_: bool, filter_by_name_: str, random_order: bool, max_fail: int,
-              generate_report: bool):
+              generate_report: bool, shard: str = ''):
     # read the options file if exists
     if is_file_exists(file_name_):
         print(f"{file_name_} is found! Reading...")
         params_ = read_parameters_from_file(file_name_)
         if p_:
             params_.get("params").update(p_)
+        if shard:
+            params_['shard'] = shard
         start_with_parameters(params_)
     # or walk down the folder tree recursively and find all modules with tests
     else:
@@ -253,7 +356,7 @@ def _main_run(file_name_: str, p_: Dict, dry_run_: bool, filter_by_name_: str, r
             print(f"Options file is not found! Searching for tests in all subfolders...")
             _walk_through_and_import()
             start(verbose=3, threads=1, params=p_, dry_run=dry_run_, filter_by_name=filter_by_name_,
-                  random_order=random_order, generate_report=generate_report)
+                  random_order=random_order, generate_report=generate_report, shard=shard)
         # if options file was specified and doesn't exist, halt
         else:
             raise ValueError(f"{file_name_} not found! Stopping...")
@@ -265,6 +368,14 @@ def run():
 
     :return:
     """
+    if sys.argv[1:2] == ['report']:
+        args = parse_report_arguments(sys.argv[2:])
+        build_report(args.results, args.mode, args.attachments)
+        return
+    if sys.argv[1:2] == ['history']:
+        args = parse_history_arguments(sys.argv[2:])
+        show_history(args.database, args.query, args.runs, args.limit, args.ratio, args.suite)
+        return
     args = parse_arguments()
     if args.generate_options:
         _generate_options()
@@ -276,7 +387,8 @@ def run():
         filter_by_name = args.filter_test if args.filter_test else ''
         max_fail = int(args.max_fail) if args.max_fail else 0
         generate_report = args.generate_report if args.generate_report else False
-        _main_run(file_name, params, dry_run, filter_by_name, random_order, max_fail, generate_report)
+        shard = args.shard if args.shard else ''
+        _main_run(file_name, params, dry_run, filter_by_name, random_order, max_fail, generate_report, shard)
 
 
 if __name__ == '__main__':
@@ -16,10 +16,12 @@ from .helpers.others import is_file_exists, fake
 
 def test(*args, enabled: bool = True, name: Optional[str] = None, description: Optional[str] = None,
          data_provider: Optional[str] = None, retries: int = 1, groups: Optional[Tuple[str]] = None,
-         priority: int = 0, timeout: int = 0, only_if: Optional[Callable[[], bool]] = None):
+         priority: int = 0, timeout: int = 0, only_if: Optional[Callable[[], bool]] = None, isolate: bool = False,
+         parallel: bool = False):
     """
     Decorator, marks a function as a test. Does not work with classes, class methods and functions,
     that take arguments, except when explicitly using a data provider.
+    Coroutine functions ('async def') are run on the event loop of the runner.
 
     :param args: handles the '@test' shorthand, holds the wrapped function reference
     :param enabled: marks a test as active or inactive; if inactive, all other parameters are ignored
@@ -33,10 +35,15 @@ def test(*args, enabled: bool = True, name: Optional[str] = None, description: O
         use this parameter to control the test execution order
     :param timeout: number of seconds to wait for a busy test to finish executing;
         if timeout is reached, the thread executing the test is terminated and TestBrokenException is raised;
-        use sparingly due to possible memory leaks
+        use sparingly due to possible memory leaks (or use isolate parameter)
     :param only_if: callable predicate to evaluate before the test execution;
         the test is executed only if the predicate evaluates to True;
         use this parameter to filter tests on a condition, for example the type of OS
+    :param isolate: if True, the test is executed in a child process, which is killed if timeout is reached,
+        so nothing is leaked; the test argument and report parameters must be picklable,
+        fixtures are executed in the main process
+    :param parallel: if True, cases of the data provider are sent in chunks to the tests thread pool
+        (works only if threads > 1), 'before_test' and 'after_test' fixtures run for each case
     :return: fake
     :raise UnknownProviderName: if no corresponding data provider is found during the bootstrap
     :raise TestBrokenException: if test timeout is reached
@@ -67,6 +74,8 @@ def test(*args, enabled: bool = True, name: Optional[str] = None, description: O
             test_object.only_if = only_if
             test_object.retries = retries
             test_object.priority = priority
+            test_object.isolate = isolate
+            test_object.parallel = parallel
             if description:
                 test_object.description = description
             if timeout:
@@ -84,10 +93,10 @@ def test(*args, enabled: bool = True, name: Optional[str] = None, description: O
 
 
 def provider(*args, enabled: bool = True, name: Optional[str] = None, cached: bool = False,
-             map_to_str: Callable[[Any], str] = str):
+             map_to_str: Callable[[Any], str] = str, parallel: bool = False, prefetch: int = 0):
     """
     Decorator, marks a function as data provider, which will supply data to a test.
-    Marked function must return an **Iterable** object
+    Marked function must return an **Iterable** object (or be an async generator)
     and typing error will be raised at runtime if the returned value is not an **Iterable**.
     Any test using a rising provider will be marked as 'ignored'.
 
@@ -100,6 +109,10 @@ def provider(*args, enabled: bool = True, name: Optional[str] = None, cached: bo
         all subsequent calls will use the cached data to avoid repeating resource-intensive data fetches;
         be wary of the memory consumption
     :param map_to_str: callable attribute, must return a string representation of the data item
+    :param parallel: if True, cases of all tests using the provider are sent in chunks to the tests thread pool
+        (works only if threads > 1)
+    :param prefetch: if greater than 0, values are read at the background thread, no more than this number ahead
+        of the running tests; use this parameter for the providers with slow reads or parsing
     :return: fake
     :raise DuplicateProviderNameException: if provider name is already registered
     :raise WrongDecoratedObject: if decorator is used on a function without return or yield statements
@@ -121,6 +134,10 @@ def provider(*args, enabled: bool = True, name: Optional[str] = None, cached: bo
         nonlocal cached
         if cached:
             TestSuite.get_instance().cached.append(name_)
+        if parallel:
+            TestSuite.get_instance().parallel.append(name_)
+        if prefetch > 0:
+            TestSuite.get_instance().prefetch[name_] = int(prefetch)
         return fake
 
     if args:
@@ -177,7 +194,7 @@ def after(*args, group_name: Optional[str] = None):
     return real_decorator
 
 
-def before_group(*args, name: Optional[str] = None):
+def before_group(*args, name: Optional[str] = None, parallel: bool = False, max_concurrency: int = 1):
     """
     Decorator, marks a function as a mandatory part of a test group bootstrap process.
     The marked function is executed once strictly before the first test in the specified test group.
@@ -186,6 +203,12 @@ def before_group(*args, name: Optional[str] = None):
     :param args: handles the '@before_group' shorthand, holds the wrapped function reference
     :param name: the name of a module or a test group the function is executed in advance of,
         if no name is specified, the name of the current module is used
+    :param parallel: if True, tests of the group are executed in parallel with the threads of the suite,
+        tests with the same priority run at the same time, tests with lower priority wait for them to finish;
+        use it for I/O-bound tests, which do not depend on each other
+    :param max_concurrency: if greater than 1, tests of the group are executed at the event loop of the runner,
+        up to this number of 'async def' tests (and provider cases) run at the same time and overlap their waits;
+        tests with the same priority run at the same time, tests with lower priority wait for them to finish
     :return: fake
     """
 
@@ -193,6 +216,10 @@ def before_group(*args, name: Optional[str] = None):
         __check_is_function_without_args(func, 'before_group')
         group = name if name else func.__module__
         TestSuite.get_instance().get_or_create(group).add_before(func)
+        if parallel:
+            TestSuite.get_instance().get_or_create(group).parallel = True
+        if max_concurrency > 1:
+            TestSuite.get_instance().get_or_create(group).max_concurrency = int(max_concurrency)
         return fake
 
     if args:
@@ -319,7 +346,7 @@ def __check_is_function_for_provider(func: Callable[[Any], None]):
 
 
 def DATA_FILE(file_path: str, name: Optional[str] = None, cached: bool = False, encoding: str = 'UTF-8',
-              map_function: Optional[Callable] = None):
+              map_function: Optional[Callable] = None, parallel: bool = False, prefetch: int = 0):
     """
     Convenience helper, simplifies usage of a text file as a data provider.
     Lazy-reads the specified file.
@@ -335,6 +362,9 @@ def DATA_FILE(file_path: str, name: Optional[str] = None, cached: bool = False,
         relative paths are allowed but the file must be accessible from the current module directory
     :param encoding: text file encoding, defaults to UTF-8
     :param map_function: callable to execute against each read line
+    :param parallel: if True, lines are sent in chunks to the tests thread pool (works only if threads > 1)
+    :param prefetch: if greater than 0, lines are read (and mapped) at the background thread,
+        no more than this number ahead of the running tests
     :return: None
     :raise FileNotFoundError: if specified file does no exist
     """
@@ -355,7 +385,9 @@ def DATA_FILE(file_path: str, name: Optional[str] = None, cached: bool = False,
     try:
         if not is_file_exists(real_path):
             raise FileNotFoundError(f"Data source file '{real_path}' not found.")
-        provider(name=name, cached=cached)(wrapper)
+        # the persistent cache of the provider is reset when the file is changed
+        wrapper.input_files = (real_path,)
+        provider(name=name, cached=cached, parallel=parallel, prefetch=prefetch)(wrapper)
     finally:
         del frame
 
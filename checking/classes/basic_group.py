@@ -1,8 +1,10 @@
 from random import shuffle
-from typing import List, Callable
+from threading import Lock
+from typing import Dict, List, Callable, Optional
 
-from .basic_test import Test
+from .basic_test import Test, TestResult
 from .basic_case import TestCase
+from .result_summary import ResultSummary
 
 
 class TestGroup(TestCase):
@@ -14,7 +16,7 @@ class TestGroup(TestCase):
     """
 
     __slots__ = ('name', 'before', 'after', 'is_before_failed', 'always_run_after', 'tests', 'before_all', 'after_all',
-                 'test_results')
+                 '_results', 'parallel', 'max_concurrency', 'summary', '_by_status', '_indexed', '_lock', 'on_result')
 
     def __init__(self, name: str):
         super().__init__(name)
@@ -24,8 +26,20 @@ class TestGroup(TestCase):
         self.before_all: List[Callable] = []
         # The list of functions that executed after each test
         self.after_all: List[Callable] = []
-        # The list of the results of the run of this set
-        self.test_results: List[Test] = []
+        # The list of the results of the run of this set (records of every test execution)
+        self._results: List[TestResult] = []
+        # Index of the results by status and the number of the indexed results
+        self._by_status: Dict[str, List[TestResult]] = {}
+        self._indexed = 0
+        self._lock = Lock()
+        # The flag to run the tests of the set in parallel (tests with the same priority run at the same time)
+        self.parallel: bool = False
+        # The number of tests of the set running at the same time at the event loop of the runner
+        self.max_concurrency: int = 1
+        # Aggregates of the passed tests at the 'summary' results mode (their records are not kept), None otherwise
+        self.summary: Optional[ResultSummary] = None
+        # The function called with the status and the change of the number of the results (the suite counters)
+        self.on_result: Optional[Callable[[str, int], None]] = None
 
     def add_test(self, test: Test):
         """
@@ -55,13 +69,37 @@ class TestGroup(TestCase):
         """
         self.after_all.append(func)
 
-    def add_result(self, test: Test):
+    def add_result(self, test: TestResult):
         """
-        Adding the test in appropriate section of the results dictionary.
-        :param test: is the instance of the TestCase
+        Adding the record of the test execution to the results.
+        At the 'summary' results mode passed tests are folded into the aggregates.
+        :param test: is the instance of the TestResult
         :return: None
         """
-        self.test_results.append(test)
+        if self.summary is not None and test.status == 'success':
+            self.summary.add(test.duration())
+            self._count(test.status, 1)
+            return
+        with self._lock:
+            self._index()
+            self._results.append(test)
+            self._by_status.setdefault(test.status, []).append(test)
+            self._indexed += 1
+            self._count(test.status, 1)
+
+    @property
+    def test_results(self) -> List[TestResult]:
+        return self._results
+
+    @test_results.setter
+    def test_results(self, results: List[TestResult]):
+        with self._lock:
+            self._index()
+            for status, tests in self._by_status.items():
+                self._count(status, -len(tests))
+            self._results = results
+            self._by_status = {}
+            self._indexed = 0
 
     def is_empty(self):
         """
@@ -78,7 +116,8 @@ class TestGroup(TestCase):
         providers.
         :return: the number of the tests
         """
-        return len(self.test_results) if self.test_results else len(self.tests)
+        count = self.results_count()
+        return count if count else len(self.tests)
 
     def sort_test_by_priority(self):
         self.tests = sorted(self.tests, key=lambda t: t.priority)
@@ -90,5 +129,50 @@ class TestGroup(TestCase):
         """
         shuffle(self.tests)
 
-    def tests_by_status(self, status: str) -> List[Test]:
-        return [test for test in self.test_results if test.status == status]
+    def tests_by_status(self, status: str) -> List[TestResult]:
+        with self._lock:
+            self._index()
+            return list(self._by_status.get(status, ()))
+
+    def results_count(self, status: Optional[str] = None) -> int:
+        """
+        Returns the number of the test executions, including the passed ones folded into the summary.
+        :param status: status of the tests to count, all tests if None
+        :return: the number of executions
+        """
+        summarized = self.summary.count if self.summary is not None and status in (None, 'success') else 0
+        if status is None:
+            return len(self._results) + summarized
+        with self._lock:
+            self._index()
+            return len(self._by_status.get(status, ())) + summarized
+
+    def results_duration(self) -> float:
+        """
+        Returns the total duration of the test executions, including the passed ones folded into the summary.
+        :return: seconds
+        """
+        summarized = self.summary.duration if self.summary is not None else 0.0
+        # the tests, which were not started (e.g. ignored), have no duration
+        started = (test.duration() for test in self.test_results if test.timer.start_time >= 0)
+        return sum(max(duration, 0.0) for duration in started) + summarized
+
+    def _index(self):
+        """
+        Rebuilds the index by status, if the results were changed bypassing add_result (e.g. appended to the list).
+        Must be called under the lock.
+        """
+        if self._indexed == len(self._results):
+            return
+        for status, tests in self._by_status.items():
+            self._count(status, -len(tests))
+        self._by_status = {}
+        for test in self._results:
+            self._by_status.setdefault(test.status, []).append(test)
+        for status, tests in self._by_status.items():
+            self._count(status, len(tests))
+        self._indexed = len(self._results)
+
+    def _count(self, status: str, number: int):
+        if self.on_result is not None and number:
+            self.on_result(status, number)
@@ -1,8 +1,11 @@
-from typing import Dict, List, Tuple, Callable
+from threading import RLock
+from typing import Dict, List, Tuple, Callable, Optional
 
 from .timer import Timer
-from .basic_test import Test
+from .basic_test import TestResult
 from .basic_group import TestGroup
+from .provider_cache import ProviderCache
+from .result_summary import ResultSummary
 
 
 class TestSuite:
@@ -18,12 +21,18 @@ class TestSuite:
     # Data providers (available to all tests in all sets)
     providers: Dict[str, Tuple[Callable]] = {}
 
-    # Cache for providers, store name-tuple of values
-    cache: Dict[str, Tuple] = {}
+    # Cache for providers, stores name-values pairs within the memory budget (the rest is spilled to the disk)
+    cache: ProviderCache = ProviderCache()
 
     # Container for cached providers, stores only names!
     cached: List[str] = []
 
+    # Container for providers, which cases run in parallel, stores only names!
+    parallel: List[str] = []
+
+    # Number of the values to read ahead at the background thread by provider names
+    prefetch: Dict[str, int] = {}
+
     # Lists of functions which execute before and after run
     before: List[Callable] = []
     after: List[Callable] = []
@@ -38,6 +47,11 @@ class TestSuite:
     # Timer for suite duration
     timer = Timer()
 
+    # Number of the test executions by status, kept by the groups (see TestGroup.add_result), and the counted groups
+    _counts: Dict[str, int] = {}
+    _counted: Dict[str, TestGroup] = {}
+    _counts_lock = RLock()
+
     def __new__(cls):
         if not cls.instance:
             cls.instance = super(TestSuite, cls).__new__(cls)
@@ -63,7 +77,14 @@ class TestSuite:
         :return: TestGroup
         """
         if group_name not in cls.groups:
-            cls.groups[group_name] = TestGroup(group_name)
+            group = TestGroup(group_name)
+            group.on_result = cls._count
+            cls.groups[group_name] = group
+            # the group of the same name was removed from the suite, its results are not counted anymore
+            if group_name in cls._counted:
+                cls._recount()
+            else:
+                cls._counted[group_name] = group
         return cls.groups[group_name]
 
     @classmethod
@@ -74,6 +95,7 @@ class TestSuite:
         :return: None
         """
         cls.groups = {name: tests for name, tests in cls.groups.items() if name in groups}
+        cls._recount()
 
     @classmethod
     def filter_tests(cls, filter_by_name: str):
@@ -104,15 +126,15 @@ class TestSuite:
         return sum([group.tests_count() for group in cls.groups.values()])
 
     @classmethod
-    def success(cls) -> List[Test]:
+    def success(cls) -> List[TestResult]:
         """
-        Returns the list of successful tests.
+        Returns the list of successful tests. At the 'summary' results mode passed tests are not kept (only counted).
         :return:
         """
         return cls._test_result_of('success')
 
     @classmethod
-    def failed(cls) -> List[Test]:
+    def failed(cls) -> List[TestResult]:
         """
         Returns the list of fell tests.
         :return:
@@ -120,7 +142,7 @@ class TestSuite:
         return cls._test_result_of('failed')
 
     @classmethod
-    def broken(cls) -> List[Test]:
+    def broken(cls) -> List[TestResult]:
         """
         Returns the list of broken tests (fell by exception, not by assert).
         :return:
@@ -128,7 +150,7 @@ class TestSuite:
         return cls._test_result_of('broken')
 
     @classmethod
-    def ignored(cls) -> List[Test]:
+    def ignored(cls) -> List[TestResult]:
         """
         Returns the list of ignored tests (unsuccessful preliminary functions).
         :return:
@@ -136,11 +158,61 @@ class TestSuite:
         return cls._test_result_of('ignored')
 
     @classmethod
-    def _test_result_of(cls, name: str) -> List[Test]:
+    def results_count(cls, status: Optional[str] = None) -> int:
+        """
+        Returns the number of the test executions, including the passed ones, which are only counted at the
+        'summary' results mode.
+        :param status: status of the tests to count, all tests if None
+        :return: the number of executions
+        """
+        with cls._counts_lock:
+            # the groups were removed bypassing the suite (e.g. the dictionary was cleared)
+            if len(cls._counted) != len(cls.groups):
+                cls._recount()
+            if status is None:
+                return sum(cls._counts.values())
+            return cls._counts.get(status, 0)
+
+    @classmethod
+    def summary(cls) -> Optional[ResultSummary]:
+        """
+        Returns the aggregates of the passed tests of all groups at the 'summary' results mode.
+        :return: ResultSummary or None if the records of the passed tests are kept
+        """
+        summaries = [group.summary for group in cls.groups.values() if group.summary is not None]
+        if not summaries:
+            return None
+        result = ResultSummary()
+        for summary in summaries:
+            result.update(summary)
+        return result
+
+    @classmethod
+    def _test_result_of(cls, name: str) -> List[TestResult]:
         return [test for group in cls.groups.values() for test in group.tests_by_status(name)]
 
+    @classmethod
+    def _count(cls, status: str, number: int):
+        with cls._counts_lock:
+            cls._counts[status] = cls._counts.get(status, 0) + number
+
+    @classmethod
+    def _recount(cls):
+        """
+        Counts the results of all groups anew, binding the groups to the counters.
+        """
+        with cls._counts_lock:
+            counts = {}
+            for group in cls.groups.values():
+                group.on_result = cls._count
+                for status in ('success', 'failed', 'broken', 'ignored'):
+                    counts[status] = counts.get(status, 0) + group.results_count(status)
+            cls._counts = counts
+            cls._counted = dict(cls.groups)
+
     @classmethod
     def start_suite(cls):
+        cls._recount()
         cls.timer.start()
 
     @classmethod
@@ -1,7 +1,9 @@
-from typing import Callable, Any, Optional
+from inspect import iscoroutine
+from typing import Callable, Any, Optional, Coroutine
 
 from .timer import Timer
 from .basic_case import TestCase
+from .event_loop import run_coroutine
 from ..exceptions import TestIgnoredException, OnlyIfFailedException, SkipTestException
 
 
@@ -11,7 +13,7 @@ class Test(TestCase):
     """
     __slots__ = ('name', 'before', 'after', 'is_before_failed', 'always_run_after', 'provider', 'retries', 'priority',
                  'test', 'group', 'group_name', 'argument', 'str_arg', 'timeout', 'only_if', 'description', 'timer',
-                 'status', 'reason', 'report_params')
+                 'status', 'reason', 'report_params', 'isolate', 'parallel', 'definition')
 
     def __init__(self, name: str, test: Callable):
         """
@@ -30,6 +32,10 @@ class Test(TestCase):
         self.str_arg = str(self.argument)
         # Time in seconds to finish test
         self.timeout: int = 0
+        # Run the test in a child process, which is killed at the timeout
+        self.isolate: bool = False
+        # Run the provider cases of the test in parallel
+        self.parallel: bool = False
         # Function-predicate, if return False - test will not runs
         self.only_if: Optional[Callable] = None
         # Description of the test
@@ -48,6 +54,8 @@ class Test(TestCase):
         self.reason: Optional[Exception] = None
         # Parameters to attach to html report (not used anywhere else)
         self.report_params = {}
+        # The test, which this one is cloned from (None for the test itself)
+        self.definition: Optional['Test'] = None
 
     def set_group(self, group):
         self.group = group
@@ -56,17 +64,35 @@ class Test(TestCase):
     def run(self):
         """
         The launch of the test (functions mark tests annotation).
+        Coroutine of the 'async def' test is run on the event loop of the runner.
         :return: None
         """
+        result = self._call()
+        if iscoroutine(result):
+            run_coroutine(self._await(result))
+
+    async def run_async(self):
+        """
+        The launch of the test at the event loop, the coroutine of the 'async def' test is awaited.
+        :return: None
+        """
+        result = self._call()
+        if iscoroutine(result):
+            await self._await(result)
+
+    def _call(self) -> Any:
         if self.only_if:
             if not self.only_if():
                 raise OnlyIfFailedException()
         self.timer.start()
         if self.provider is not None:
             self.str_arg = str(self.argument)
-            self.test(self.argument)
-        else:
-            self.test()
+            return self.test(self.argument)
+        return self.test()
+
+    async def _await(self, coroutine: Coroutine):
+        # the frame of this method lets report helpers find the test, while the coroutine runs at the event loop
+        await coroutine
 
     def stop(self, exception_: Optional[BaseException] = None):
         """
@@ -95,7 +121,7 @@ class Test(TestCase):
 
     def _put_to_group_results(self):
         if self.group:
-            self.group.add_result(self)
+            self.group.add_result(self.result())
 
     def __str__(self):
         description = self.description if self.description else ''
@@ -111,10 +137,18 @@ class Test(TestCase):
         """
         clone = Test(self.name, self.test)
         for attr in self.__slots__:
-            if attr != 'report_params':
+            if attr not in ('report_params', 'timer'):
                 setattr(clone, attr, getattr(self, attr))
+        clone.definition = self.definition or self
         return clone
 
+    def result(self) -> 'TestResult':
+        """
+        Record of the test execution, which is kept at the group results instead of the test itself
+        :return: TestResult
+        """
+        return TestResult(self)
+
     def duration(self) -> float:
         return self.timer.duration
 
@@ -126,3 +160,64 @@ class Test(TestCase):
         return {'group': self.group_name, 'name': self.name, 'description': self.description, 'priority': self.priority,
                 'argument': self.argument, 'timeout': self.timeout, 'retries': self.retries, 'status': self.status,
                 'reason': self.reason, 'duration': self.duration()}
+
+
+class TestResult:
+    """
+    Immutable record of one test execution (one provider case or one retry). Keeps only the values of the execution,
+    all other attributes are taken from the test definition, shared by all records of the test.
+    """
+    __slots__ = ('definition', 'name', 'argument', 'str_arg', 'status', 'reason', 'start_time', 'end_time',
+                 '_report_params')
+
+    def __init__(self, test: Test):
+        """
+        :param test: the executed test (clone of the definition or the definition itself)
+        """
+        set_ = object.__setattr__
+        set_(self, 'definition', test.definition or test)
+        # Name of the execution differs from the definition one for retries
+        set_(self, 'name', test.name)
+        set_(self, 'argument', test.argument)
+        set_(self, 'str_arg', test.str_arg)
+        set_(self, 'status', test.status)
+        set_(self, 'reason', test.reason)
+        set_(self, 'start_time', test.timer.start_time)
+        set_(self, 'end_time', test.timer.end_time)
+        # Most tests have no report parameters, so the empty dict is not kept
+        set_(self, '_report_params', test.report_params or None)
+
+    def __getattr__(self, name: str) -> Any:
+        if name == 'definition':
+            raise AttributeError(name)
+        return getattr(self.definition, name)
+
+    def __setattr__(self, name: str, value: Any):
+        raise AttributeError(f"'{type(self).__name__}' object is read-only")
+
+    @property
+    def report_params(self) -> dict:
+        return self._report_params or {}
+
+    @property
+    def timer(self) -> Timer:
+        timer = Timer()
+        timer.start_time = self.start_time
+        timer.end_time = self.end_time
+        timer.duration = self.duration()
+        return timer
+
+    def duration(self) -> float:
+        if self.end_time < 0:
+            return -1
+        return self.end_time - self.start_time
+
+    def __str__(self):
+        return Test.__str__(self)
+
+    def info(self) -> dict:
+        """
+        Statistics of the test execution
+        :return: dict of main parameters
+        """
+        return Test.info(self)
@@ -0,0 +1,104 @@
+import asyncio
+from inspect import isawaitable
+from threading import Thread, Lock, current_thread
+from typing import Any, Iterable, Awaitable, Optional
+
+
+class EventLoop:
+    """
+    The event loop of the runner, works at a separate daemon thread, so coroutines of tests, fixtures and providers
+    can be run from any thread of the suite. The loop is started on the first use.
+    """
+
+    def __init__(self):
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        self.thread: Optional[Thread] = None
+        self._lock = Lock()
+
+    def get(self) -> asyncio.AbstractEventLoop:
+        """
+        Returns the running loop, starts it if necessary.
+        :return: event loop
+        """
+        with self._lock:
+            if self.loop is None:
+                self.loop = asyncio.new_event_loop()
+                self.thread = Thread(target=self.loop.run_forever, name='EventLoop', daemon=True)
+                self.thread.start()
+            return self.loop
+
+    def run(self, awaitable: Awaitable) -> Any:
+        """
+        Runs the awaitable on the loop and waits for the result.
+        :param awaitable: coroutine or any other awaitable object
+        :return: result of the awaitable
+        :raise RuntimeError: if called from the loop thread, which would wait for itself forever
+        """
+        loop = self.get()
+        if current_thread() is self.thread:
+            raise RuntimeError('Can not wait for the coroutine at the event loop thread!')
+        return asyncio.run_coroutine_threadsafe(_wait(awaitable), loop).result()
+
+    def stop(self):
+        """
+        Stops the loop and waits for its thread to finish.
+        :return: None
+        """
+        with self._lock:
+            if self.loop is None:
+                return
+            loop, thread, self.loop, self.thread = self.loop, self.thread, None, None
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join()
+        loop.close()
+
+
+# The event loop of the runner
+_event_loop = EventLoop()
+
+
+def run_coroutine(awaitable: Awaitable) -> Any:
+    """
+    Runs the awaitable on the event loop of the runner and waits for the result.
+
+    :param awaitable: coroutine or any other awaitable object
+    :return: result of the awaitable
+    """
+    return _event_loop.run(awaitable)
+
+
+def stop_event_loop():
+    """
+    Stops the event loop of the runner, if it was started.
+
+    :return: None
+    """
+    _event_loop.stop()
+
+
+def iterate(obj: Any) -> Iterable:
+    """
+    Makes a plain iterable from the value, returned by a data provider: awaitables are awaited and asynchronous
+    iterables (async generators) are iterated on the event loop of the runner.
+
+    :param obj: value returned by a provider
+    :return: iterable
+    """
+    if isawaitable(obj):
+        obj = run_coroutine(obj)
+    if hasattr(obj, '__aiter__'):
+        return _iterate_async(obj)
+    return obj
+
+
+def _iterate_async(obj: Any) -> Iterable:
+    iterator = obj.__aiter__()
+    while True:
+        try:
+            yield run_coroutine(iterator.__anext__())
+        except StopAsyncIteration:
+            return
+
+
+async def _wait(awaitable: Awaitable) -> Any:
+    return await awaitable
@@ -1,49 +1,143 @@
-from typing import Callable
-from threading import Thread, Event
+import heapq
+from time import monotonic
+from itertools import count
+from typing import Callable, List, Optional
+from threading import Thread, Event, Condition, Lock
 
 from ..classes.basic_test import Test
 from ..exceptions import TestBrokenException
 
 
-class ExceptionThread(Thread):
+class TimedCall:
     """
-    The sub-class of the thread, for catching exceptions, which do not catch by the usual approach with multi-threaded
-    execution.
-    Saves exceptions within Event container.
+    The call of the function at the separate daemon thread, which is finished by the function itself or by the
+    watchdog at the deadline, whatever comes first.
     """
+    __slots__ = ('func', 'done', 'expired', 'exception', '_lock')
 
-    def __init__(self, func: Callable, event: Event):
-        super().__init__(target=func, daemon=True)
+    def __init__(self, func: Callable):
         self.func = func
-        self.daemon = True
-        self.event = event
+        # Is set when the function is over or the deadline is reached
+        self.done = Event()
+        self.expired = False
+        self.exception: Optional[BaseException] = None
+        self._lock = Lock()
 
     def run(self):
         try:
             self.func()
-        except Exception as e:
-            self.event.attr = e
+        except (Exception, SystemExit) as e:
+            self.exception = e
+        finally:
+            with self._lock:
+                self.done.set()
+
+    def expire(self):
+        with self._lock:
+            if not self.done.is_set():
+                self.expired = True
+                self.done.set()
+
+
+class Watchdog:
+    """
+    The only thread, which watches the deadlines of all timed calls. Deadlines are kept at the heap and the thread
+    sleeps till the nearest one, so there is no busy waiting.
+    """
+
+    def __init__(self):
+        self._heap: List = []
+        self._condition = Condition()
+        self._counter = count()
+        self._thread: Optional[Thread] = None
+        # Threads of the calls, which were abandoned at the deadline
+        self._abandoned: List[Thread] = []
+
+    def register(self, timeout: float, on_timeout: Callable) -> List:
+        """
+        Registers the deadline.
+        :param timeout: seconds from now
+        :param on_timeout: function to call at the deadline (at the watchdog thread)
+        :return: entry to cancel the deadline
+        """
+        entry = [monotonic() + timeout, next(self._counter), on_timeout]
+        with self._condition:
+            if self._thread is None:
+                self._thread = Thread(target=self._watch, name='Watchdog', daemon=True)
+                self._thread.start()
+            heapq.heappush(self._heap, entry)
+            # wake up the watchdog if the new deadline is the nearest one
+            self._condition.notify()
+        return entry
+
+    def cancel(self, entry: List):
+        """
+        Cancels the deadline, the entry is removed from the heap lazily.
+        :param entry: entry returned by register
+        :return: None
+        """
+        with self._condition:
+            entry[-1] = None
+
+    def abandon(self, thread: Thread):
+        with self._condition:
+            self._abandoned.append(thread)
+
+    def leaked_threads(self) -> int:
+        """
+        Returns the number of threads of the timed out calls, which are still working.
+        """
+        with self._condition:
+            self._abandoned = [thread for thread in self._abandoned if thread.is_alive()]
+            return len(self._abandoned)
+
+    def _watch(self):
+        while True:
+            with self._condition:
+                while self._heap and self._heap[0][-1] is None:
+                    heapq.heappop(self._heap)
+                if not self._heap:
+                    self._condition.wait()
+                    continue
+                wait = self._heap[0][0] - monotonic()
+                if wait > 0:
+                    self._condition.wait(wait)
+                    continue
+                on_timeout = heapq.heappop(self._heap)[-1]
+            on_timeout()
+
+
+# The watchdog of the runner
+_watchdog = Watchdog()
 
 
 def run_with_timeout(test: Test):
-    event = Event()
-    t = Thread(target=_start_test_at_daemon_thread, args=(test, event), daemon=True)
-    t.start()
-    t.join(test.timeout)
-    # If the thread is alive, then it had not over by time-out.
-    if t.is_alive():
-        # Put the notification that it is time to abort the work and give up the exception.
-        event.set()
+    """
+    Runs the test at the separate daemon thread and waits for it till the test timeout. If the time is over,
+    the thread is abandoned (it can not be killed) and the test is broken.
+
+    :param test: Test instance
+    :return: None
+    :raise TestBrokenException: if the time is over
+    """
+    call = TimedCall(test.run)
+    thread = Thread(target=call.run, daemon=True)
+    entry = _watchdog.register(test.timeout, call.expire)
+    thread.start()
+    call.done.wait()
+    _watchdog.cancel(entry)
+    if call.expired:
+        _watchdog.abandon(thread)
         raise TestBrokenException(f'Time ({test.timeout} seconds) is over for test "{test}"!')
-    # If there is an attribute, then the exception inside the thread-demon, then raise it.
-    if hasattr(event, 'attr'):
-        raise event.attr
-
-
-def _start_test_at_daemon_thread(test: Test, event: Event):
-    t = ExceptionThread(test.run, event)
-    t.start()
-    # Not yet notified throw the event or the thread-demon has been working now, then work
-    while not event.is_set():
-        if not t.is_alive():
-            break
+    # If there is an exception inside the thread, then raise it.
+    if call.exception is not None:
+        raise call.exception
+
+
+def leaked_threads() -> int:
+    """
+    Returns the number of threads of the timed out tests, which are still working.
+
+    :return: number of threads
+    """
+    return _watchdog.leaked_threads()
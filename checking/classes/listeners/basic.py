@@ -1,8 +1,9 @@
-from threading import Lock
+from typing import Set
 
 from ..basic_test import Test
 from ..basic_case import TestCase
 from ..basic_suite import TestSuite
+from .console import console
 from ...helpers.others import short
 
 
@@ -15,6 +16,24 @@ class Listener:
     def __init__(self, verbose: int = 0):
         self.verbose = verbose
 
+    def overridden_hooks(self) -> Set[str]:
+        """
+        Returns the names of the hooks, which do something at this listener: overridden by the class or set to the
+        instance attribute. The runner works it out once at the start and does not call other hooks.
+        :return: set of the hook names
+        """
+        own = getattr(self, '__dict__', {})
+        return {name for name in HOOKS
+                if name in own or name in ACTIVE_HOOKS or getattr(type(self), name) is not getattr(Listener, name)}
+
+    def needs_attachments(self) -> bool:
+        """
+        Returns True if the listener writes the results, which refer to the files of the images (see add_img), so
+        the images are written to the attachments folder even if the html report is not generated.
+        :return: False by default
+        """
+        return False
+
     def on_suite_starts(self, test_suite: TestSuite):
         """
         It calls at the start of the run, after checking the providers.
@@ -166,7 +185,14 @@ class Listener:
 
     @staticmethod
     def print_sync(value):
-        lock = Lock()
-        lock.acquire(blocking=True, timeout=1.0)
-        print(value)
-        lock.release()
+        """
+        Prints the value (as a whole, so the outputs of different threads do not interleave) by the shared buffered
+        writer.
+        """
+        console.print(value)
+
+
+# Names of all listener hooks
+HOOKS = tuple(name for name in dir(Listener) if name.startswith('on_'))
+# Hooks of the base class, which do something, so they are always called
+ACTIVE_HOOKS = ('on_empty_suite',)
@@ -0,0 +1,84 @@
+import sys
+import atexit
+from time import sleep
+from threading import Thread, Lock
+from typing import List, Optional
+
+# Seconds between the flushes of the buffered output
+FLUSH_INTERVAL = 0.1
+# Number of the buffered characters, which are flushed at once
+FLUSH_SIZE = 8192
+
+
+class ConsoleWriter:
+    """
+    Buffered writer to the standard output, shared by all threads. Texts are written in batches: by the background
+    thread every FLUSH_INTERVAL seconds or at once when FLUSH_SIZE characters are buffered. Every text is written as a
+    whole, so multi-line reports of different threads never interleave.
+    """
+
+    def __init__(self, interval: float = FLUSH_INTERVAL, size: int = FLUSH_SIZE):
+        """
+        :param interval: seconds between the flushes
+        :param size: number of the buffered characters to flush at once
+        """
+        self.interval = interval
+        self.size = size
+        self._buffer: List[str] = []
+        self._buffered = 0
+        self._lock = Lock()
+        # The flushing thread, it stops when there is nothing to write and is started again by the next text
+        self._thread: Optional[Thread] = None
+
+    def write(self, text: str):
+        """
+        Adds the text to the buffer.
+        :param text: text to write as is (with the line ends, if needed)
+        :return: None
+        """
+        with self._lock:
+            self._buffer.append(text)
+            self._buffered += len(text)
+            if self._buffered >= self.size:
+                self._flush()
+            elif self._thread is None:
+                self._thread = Thread(target=self._flush_periodically, name='Console', daemon=True)
+                self._thread.start()
+
+    def print(self, *values, sep: str = ' ', end: str = '\n'):
+        """
+        Same as the built-in print, but buffered.
+        """
+        self.write(f'{sep.join(str(value) for value in values)}{end}')
+
+    def flush(self):
+        """
+        Writes all buffered texts to the standard output.
+        :return: None
+        """
+        with self._lock:
+            self._flush()
+
+    def _flush(self):
+        if not self._buffer:
+            return
+        text = ''.join(self._buffer)
+        self._buffer = []
+        self._buffered = 0
+        # the current stream is used, it can be redirected
+        sys.stdout.write(text)
+        sys.stdout.flush()
+
+    def _flush_periodically(self):
+        while True:
+            sleep(self.interval)
+            with self._lock:
+                if not self._buffer:
+                    self._thread = None
+                    return
+                self._flush()
+
+
+# The writer, shared by all listeners
+console = ConsoleWriter()
+atexit.register(console.flush)
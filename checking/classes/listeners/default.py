@@ -1,8 +1,11 @@
 import traceback
+from threading import Lock
 
 from .basic import Listener
+from .console import console
 from ..basic_test import Test
 from ..basic_suite import TestSuite
+from ..exc_thread import leaked_threads
 from ...helpers.others import short
 from ...helpers.others import format_seconds
 from ...exceptions import SkipTestException
@@ -19,6 +22,7 @@ class DefaultListener(Listener):
     def __init__(self, verbose: int):
         super().__init__(verbose)
         self.counts = 0
+        self._lock = Lock()
 
     def on_before_suite_failed(self, test_suite):
         super().on_before_suite_failed(test_suite)
@@ -45,43 +49,51 @@ class DefaultListener(Listener):
 
     def on_suite_ends(self, test_suite: TestSuite):
         super().on_suite_ends(test_suite)
-        if not self.verbose:
-            print()
-        print()
-        print("=" * 30)
+        lines = [] if self.verbose else ['']
+        lines.append('')
+        lines.append("=" * 30)
         elapsed = format_seconds(test_suite.suite_duration())
-        success_count = len(test_suite.success())
-        f_count = len(test_suite.failed())
-        b_count = len(test_suite.broken())
-        i_count = len(test_suite.ignored())
+        success_count = test_suite.results_count('success')
+        f_count = test_suite.results_count('failed')
+        b_count = test_suite.results_count('broken')
+        i_count = test_suite.results_count('ignored')
         all_count = f_count + b_count + i_count + success_count
-        print(f'Total tests: {all_count}, success tests: {success_count}, failed tests: {f_count}, broken tests: '
-              f'{b_count}, ignored tests: {i_count}')
-        print(f'Time elapsed: {elapsed}.')
-        print(f'Success percent: {success_count / all_count :.2%}')
+        lines.append(f'Total tests: {all_count}, success tests: {success_count}, failed tests: {f_count}, '
+                     f'broken tests: {b_count}, ignored tests: {i_count}')
+        lines.append(f'Time elapsed: {elapsed}.')
+        lines.append(f'Success percent: {success_count / all_count :.2%}')
+        summary = test_suite.summary()
+        if summary is not None and summary.count:
+            lines.append(f'Durations of the passed tests: {summary}')
+        leaked = leaked_threads()
+        if leaked:
+            lines.append(f'Threads of the timed out tests, which are still working: {leaked}')
+        if test_suite.cache.duplicates_avoided:
+            lines.append(f'Provider calls avoided by sharing cached values between threads: '
+                         f'{test_suite.cache.duplicates_avoided}')
         if self.verbose == 3:
             if f_count:
-                print(f'\nFailed tests are:')
+                lines.append(f'\nFailed tests are:')
                 for failed_test in test_suite.failed():
-                    print(' ' * 4, failed_test, Listener._get_test_arg_short_without_new_line(failed_test))
+                    lines.append(f'{" " * 4} {failed_test} '
+                                 f'{Listener._get_test_arg_short_without_new_line(failed_test)}')
             if b_count:
-                print(f'\nBroken tests are:')
+                lines.append(f'\nBroken tests are:')
                 for broken_test in test_suite.broken():
-                    print(' ' * 4, broken_test, Listener._get_test_arg_short_without_new_line(broken_test))
+                    lines.append(f'{" " * 4} {broken_test} '
+                                 f'{Listener._get_test_arg_short_without_new_line(broken_test)}')
             if i_count:
-                print(f'\nIgnored tests are:')
+                lines.append(f'\nIgnored tests are:')
                 for ignored_test in test_suite.ignored():
-                    print(' ' * 4, ignored_test)
-        print("=" * 30)
+                    lines.append(f'{" " * 4} {ignored_test}')
+        lines.append("=" * 30)
+        console.write('\n'.join(lines) + '\n')
+        console.flush()
 
     def on_success(self, test: Test):
         super().on_success(test)
         if not self.verbose:
-            print('.', end='')
-            self.counts += 1
-            if self.counts > 100:
-                print('')
-                self.counts = 0
+            self._print_letter('.')
         elif self.verbose > 1:
             add_ = Listener._get_test_arg_short_without_new_line(test)
             text = f'{"-" * 10}\nTest "{test}" {add_} SUCCESS!\n'
@@ -106,8 +118,7 @@ class DefaultListener(Listener):
         text = f'{"-" * 10}\nFixture {fixture_type} "{group_name}" failed!\n'
         for tb in (e for e in traceback.extract_tb(exception_.__traceback__)):
             text = f'{text}File "{tb.filename}", line {tb.lineno}, in {tb.name}\n'
-        print(exception_)
-        text = f'{text}{exception_}'
+        text = f'{exception_}\n{text}{exception_}'
         Listener.print_sync(text)
 
     def on_ignored_with_provider(self, test: Test):
@@ -142,11 +153,7 @@ class DefaultListener(Listener):
     def _failed_or_broken(self, test: Test, exception_: Exception, _result: str):
         _letter = f'{_result.upper()}!'
         if not self.verbose:
-            print(_letter[0], end='')
-            self.counts += 1
-            if self.counts > 100:
-                print('')
-                self.counts = 0
+            self._print_letter(_letter[0])
         else:
             text = ''
             if self.verbose > 0:
@@ -154,3 +161,15 @@ class DefaultListener(Listener):
             add_ = Listener._get_test_arg_short_without_new_line(test)
             text = f'{text}Test "{test}" {add_} {_letter}\n{get_trace_filtered_by_filename(exception_)}\n{exception_}'
             Listener.print_sync(text)
+
+    def _print_letter(self, letter: str):
+        """
+        Prints the short result of the test (a dot or a letter), 100 results per line.
+        """
+        with self._lock:
+            self.counts += 1
+            if self.counts > 100:
+                self.counts = 0
+                letter = f'{letter}\n'
+            # written under the lock, so the line break is not overtaken by the letters of the other threads
+            console.write(letter)
@@ -0,0 +1,132 @@
+import sys
+import traceback
+from queue import Queue
+from threading import Thread, Lock
+from typing import List, Set, Tuple
+
+from .basic import Listener, HOOKS
+from ..basic_suite import TestSuite
+
+# Max number of the events, waiting for delivery to one listener, the test thread waits if the queue is full
+QUEUE_SIZE = 10000
+
+
+class AsyncListener(Listener):
+    """
+    Composite listener, which delivers the events to several listeners at the background, so slow listeners (writing
+    files, sending events over the network etc.) do not slow the tests down. Each listener has its own queue and
+    dispatcher thread, so it gets the events in the same order they happened and a slow listener does not hold up
+    the others. Only the events of the hooks, which the listener overrides, are queued to it.
+    At the end of the suite all queued events are delivered before the runner goes on.
+    """
+
+    def __init__(self, *listeners: Listener, queue_size: int = QUEUE_SIZE):
+        """
+        :param listeners: listeners to deliver the events to
+        :param queue_size: max number of the events waiting for delivery to one listener
+        """
+        super().__init__(listeners[0].verbose if listeners else 0)
+        self.listeners: List[Listener] = list(listeners)
+        self.queue_size = queue_size
+        # Queues of the listeners with the names of the hooks, which are delivered to them
+        self._routes: List[Tuple[Queue, Set[str]]] = []
+        self._threads: List[Thread] = []
+        self._lock = Lock()
+        # The max number of the events, which were waiting for delivery to one listener at the same time
+        self.max_queue_depth = 0
+
+    def queue_depth(self) -> int:
+        """
+        Returns the number of the events waiting for delivery to the slowest listener.
+        """
+        return max((queue.qsize() for queue, _ in list(self._routes)), default=0)
+
+    def flush(self):
+        """
+        Waits for all queued events to be delivered.
+        :return: None
+        """
+        for queue, _ in list(self._routes):
+            queue.join()
+
+    def overridden_hooks(self) -> Set[str]:
+        """
+        Returns the names of the hooks, which are overridden by any of the listeners.
+        """
+        hooks = {'on_suite_ends'}
+        for listener in self.listeners:
+            hooks.update(listener.overridden_hooks())
+        return hooks
+
+    def needs_attachments(self) -> bool:
+        return any(listener.needs_attachments() for listener in self.listeners)
+
+    def on_suite_ends(self, test_suite: TestSuite):
+        self._put('on_suite_ends', (test_suite,))
+        self._stop()
+
+    def _put(self, hook_name: str, args: tuple):
+        with self._lock:
+            if not self._threads:
+                self._start()
+            routes = list(self._routes)
+        for queue, hooks in routes:
+            if hook_name not in hooks:
+                continue
+            queue.put((hook_name, args))
+            depth = queue.qsize()
+            if depth > self.max_queue_depth:
+                self.max_queue_depth = depth
+
+    def _start(self):
+        for listener in self.listeners:
+            queue = Queue(self.queue_size)
+            # the end of the suite is always delivered to stop the thread
+            self._routes.append((queue, listener.overridden_hooks() | {'on_suite_ends'}))
+            thread = Thread(target=_deliver, args=(listener, queue), name='Listener', daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def _stop(self):
+        """
+        Delivers all queued events and stops the dispatcher threads, they are started again by the next event.
+        """
+        with self._lock:
+            routes, threads = self._routes, self._threads
+            self._routes, self._threads = [], []
+        for queue, _ in routes:
+            queue.put(None)
+        for thread in threads:
+            thread.join()
+
+
+def _deliver(listener: Listener, queue: Queue):
+    """
+    Dispatcher thread, calls the listener hooks one by one, till the end marker (None).
+    """
+    while True:
+        event = queue.get()
+        try:
+            if event is None:
+                return
+            hook_name, args = event
+            getattr(listener, hook_name)(*args)
+        except Exception:
+            # the failed listener must not stop the delivery of the next events
+            traceback.print_exc(file=sys.stderr)
+        finally:
+            queue.task_done()
+
+
+def _dispatched(hook_name: str):
+    def hook(self: AsyncListener, *args):
+        self._put(hook_name, args)
+
+    hook.__name__ = hook_name
+    hook.__doc__ = getattr(Listener, hook_name).__doc__
+    return hook
+
+
+for _hook_name in HOOKS:
+    if _hook_name != 'on_suite_ends':
+        setattr(AsyncListener, _hook_name, _dispatched(_hook_name))
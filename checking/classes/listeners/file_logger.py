@@ -1,4 +1,10 @@
+import os
+import gzip
+import queue
+import atexit
+import shutil
 import logging
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler, TimedRotatingFileHandler
 from threading import currentThread
 
 from .basic import Listener
@@ -7,27 +13,71 @@ from ..basic_suite import TestSuite
 from ...helpers.others import short, format_seconds, str_date_time
 
 
+class _LazyQueueHandler(QueueHandler):
+    """
+    Queue handler, which leaves the formatting of the record (including the traceback) to the writer thread.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+
 class DefaultFileListener(Listener):
     """
     Listener by default for logging all events to local file.
+    The records are written to the file by the separate thread, so the tests do not wait for the disk.
     The user can write his own listeners by the class blueprint.
     """
 
-    def __init__(self, log_level: str = logging.DEBUG, name: str = None, use_time: bool = True):
+    def __init__(self, log_level: str = logging.DEBUG, name: str = None, use_time: bool = True, max_bytes: int = 0,
+                 when: str = '', backup_count: int = 5, compress: bool = False, lazy_traceback: bool = True):
         """
         Init all parameters for logger
         :param log_level: level of logging, DEBUG by default
         :param name: name of the result file, by default is 'test_suite'
         :param use_time: if True, appends date and time to file name of the log.
         Example: test_suite_2020-04-09_17-51-29.log
+        :param max_bytes: if greater than 0, the log is rotated when its size reaches this number of bytes
+        :param when: if specified and max_bytes is 0, the log is rotated by time, the values are the same as for
+            logging.handlers.TimedRotatingFileHandler ('S', 'M', 'H', 'D', 'midnight', 'W0'-'W6')
+        :param backup_count: number of the rotated files to keep
+        :param compress: if True, rotated files are compressed with gzip
+        :param lazy_traceback: if True, tracebacks of the failed tests are formatted by the writer thread,
+            otherwise by the test thread (at the moment of the fail)
         """
         super().__init__(0)
         name_ = 'test_suite' if not name else name
         str_time = str_date_time()
         time_ = f'_{str_time}' if use_time else ''
         format_ = '%(asctime)-15s Thread[%(threadName)s] %(levelname)s: %(message)s'
-        handler = logging.FileHandler(f'{name_}{time_}.log', 'w', encoding='utf-8')
-        logging.basicConfig(level=log_level, format=format_, handlers=(handler,))
+        handler = _file_handler(f'{name_}{time_}.log', max_bytes, when, backup_count, compress)
+        handler.setFormatter(logging.Formatter(format_))
+        queue_ = queue.Queue(-1)
+        queue_handler = _LazyQueueHandler(queue_) if lazy_traceback else QueueHandler(queue_)
+        # the record is formatted by the file handler, the queue handler only puts the message (with the traceback)
+        queue_handler.setFormatter(logging.Formatter('%(message)s'))
+        self._writer = QueueListener(queue_, handler)
+        self._writer.start()
+        self._stopped = False
+        atexit.register(self._stop)
+        logging.basicConfig(level=log_level, format=format_, handlers=(queue_handler,))
+
+    def flush(self):
+        """
+        Waits for all records to be written to the file.
+        :return: None
+        """
+        # the writer thread marks every written record as done, so the queue is drained while the thread keeps running
+        if not self._stopped:
+            self._writer.queue.join()
+
+    def _stop(self):
+        """
+        Stops the writer thread at the exit of the interpreter, the rest of the records are written before.
+        """
+        if not self._stopped:
+            self._stopped = True
+            self._writer.stop()
 
     def on_suite_starts(self, test_suite: TestSuite):
         super().on_suite_starts(test_suite)
@@ -42,10 +92,10 @@ class DefaultFileListener(Listener):
     def on_suite_ends(self, test_suite: TestSuite):
         super().on_suite_ends(test_suite)
         elapsed = format_seconds(test_suite.suite_duration())
-        success_count = len(test_suite.success())
-        f_count = len(test_suite.failed())
-        b_count = len(test_suite.broken())
-        i_count = len(test_suite.ignored())
+        success_count = test_suite.results_count('success')
+        f_count = test_suite.results_count('failed')
+        b_count = test_suite.results_count('broken')
+        i_count = test_suite.results_count('ignored')
         all_count = f_count + b_count + i_count + success_count
         logger = logging.getLogger()
         logger.info(f'Test-suite "{test_suite.name}" finished!')
@@ -53,6 +103,7 @@ class DefaultFileListener(Listener):
                     f'{b_count}, ignored tests: {i_count}')
         logger.info(f'Time elapsed: {elapsed}.')
         logger.info(f'Success percent: {success_count / all_count :.2%}')
+        self.flush()
 
     def on_test_starts(self, test: Test):
         super().on_test_starts(test)
@@ -113,3 +164,31 @@ class DefaultFileListener(Listener):
         super().on_before_suite_failed(test_suite)
         logger = logging.getLogger()
         logger.critical(f'Before suite "{test_suite.name}" failed! Process stopped!')
+
+
+def _file_handler(file_name: str, max_bytes: int, when: str, backup_count: int, compress: bool) -> logging.Handler:
+    """
+    Helper, creates the handler to write the log file, rotated by size or by time, if needed.
+    """
+    if max_bytes > 0 or when:
+        # the rotating handlers append to the file (the mode is ignored when rotating by size), so it is truncated here
+        open(file_name, 'w', encoding='utf-8').close()
+    if max_bytes > 0:
+        handler = RotatingFileHandler(file_name, maxBytes=max_bytes, backupCount=backup_count, encoding='utf-8')
+    elif when:
+        handler = TimedRotatingFileHandler(file_name, when=when, backupCount=backup_count, encoding='utf-8')
+    else:
+        return logging.FileHandler(file_name, 'w', encoding='utf-8')
+    if compress:
+        handler.namer = lambda name_: f'{name_}.gz'
+        handler.rotator = _compress
+    return handler
+
+
+def _compress(source: str, destination: str):
+    """
+    Helper, rotator of the log file, compresses it with gzip.
+    """
+    with open(source, 'rb') as file, gzip.open(destination, 'wb') as compressed:
+        shutil.copyfileobj(file, compressed)
+    os.remove(source)
@@ -0,0 +1,92 @@
+import re
+from threading import Lock
+from typing import List, Optional, Tuple
+
+from .basic import Listener
+from ..basic_test import Test
+from ..basic_suite import TestSuite
+from ...helpers.history_db import HistoryDatabase
+
+# Number of the test executions, which are inserted to the database in one transaction
+BATCH_SIZE = 500
+# Suffix of the name of the retry of the test ('name (1)')
+_RETRY = re.compile(r' \(\d+\)$')
+
+
+class HistoryDbListener(Listener):
+    """
+    Saves the results of every run to the local SQLite database (see HistoryDatabase): the run with its counters and
+    every test execution with its group, name, argument, status, duration and reason. Executions are inserted by
+    batches of BATCH_SIZE in one transaction, the rest at the end of the suite. Retries are saved by the name of the
+    test, the tests, which were not started (e.g. ignored), have no start time and duration.
+    The slowest, regressed and flaky tests are shown by 'python -m checking history <database> <query>'.
+    """
+
+    def __init__(self, file_name: str = 'history.db', batch_size: int = BATCH_SIZE):
+        """
+        :param file_name: path to the database file
+        :param batch_size: number of the test executions to insert in one transaction
+        """
+        super().__init__(0)
+        self.file_name = file_name
+        self.batch_size = batch_size
+        self._database: Optional[HistoryDatabase] = None
+        self._run_id = 0
+        self._rows: List[Tuple] = []
+        self._lock = Lock()
+
+    def on_suite_starts(self, test_suite: TestSuite):
+        with self._lock:
+            self._database = HistoryDatabase(self.file_name)
+            self._run_id = self._database.start_run(test_suite.name, test_suite.timer.start_time)
+            self._rows = []
+
+    def on_suite_ends(self, test_suite: TestSuite):
+        with self._lock:
+            if self._database is None:
+                return
+            self._flush()
+            counters = {status: test_suite.results_count(status) for status in ('success', 'failed', 'broken',
+                                                                               'ignored')}
+            counters['tests'] = test_suite.results_count()
+            self._database.end_run(self._run_id, test_suite.timer.end_time, test_suite.suite_duration(), counters)
+            self._database.close()
+            self._database = None
+
+    def on_success(self, test: Test):
+        self._add(test)
+
+    def on_failed(self, test: Test, exception_: Exception):
+        self._add(test)
+
+    def on_broken(self, test: Test, exception_: Exception):
+        self._add(test)
+
+    def on_ignored(self, test: Test, fixture_type: str):
+        self._add(test)
+
+    def on_ignored_by_condition(self, test: Test, exc: Exception):
+        self._add(test)
+
+    def on_ignored_with_provider(self, test: Test):
+        self._add(test)
+
+    def _add(self, test: Test):
+        info = test.info()
+        reason = info['reason']
+        name = _RETRY.sub('', info['name']) if test.retries > 1 else info['name']
+        started = test.timer.start_time >= 0
+        row = (info['group'], name, test.str_arg if test.provider else '', info['status'],
+               test.timer.start_time if started else None, info['duration'] if started else None,
+               None if reason is None else f'{type(reason).__name__}: {reason}')
+        with self._lock:
+            if self._database is None:
+                return
+            self._rows.append(row)
+            if len(self._rows) >= self.batch_size:
+                self._flush()
+
+    def _flush(self):
+        if self._rows:
+            self._database.add_results(self._run_id, self._rows)
+            self._rows = []
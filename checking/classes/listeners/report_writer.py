@@ -0,0 +1,136 @@
+from os import sep, makedirs
+from time import time
+from threading import Lock
+from typing import Any, Dict, List, Set
+
+from .basic import Listener
+from ..basic_test import Test
+from ..basic_suite import TestSuite
+from ...helpers import report
+
+# Seconds between the writes of the not full page of results, so the crashed run loses only the last ones
+FLUSH_INTERVAL = 1.0
+INDEX = f'{report.FOLDER}{sep}index.html'
+
+
+class ReportListener(Listener):
+    """
+    Writes the paged HTML report (see report_mode parameter of the start) while the suite runs: the results and the
+    attachments are written to the data files of the report folder as the tests finish, so at the end of the suite
+    only the index of groups and the info header are left to write, and the report of the crashed run shows the
+    results till the last FLUSH_INTERVAL seconds. Tests are listed in the order they finished.
+    Add it to the list of listeners, so it writes the files at the background thread (runner does it by itself at
+    the 'incremental' report mode).
+    """
+
+    def __init__(self, flush_interval: float = FLUSH_INTERVAL):
+        """
+        :param flush_interval: seconds between the writes of the not full page of results
+        """
+        super().__init__(0)
+        self.flush_interval = flush_interval
+        self._lock = Lock()
+        # The template of the page, which info header is filled at the start and at the end
+        self._template = ''
+        self._reset()
+
+    def _reset(self):
+        self._started = False
+        self._page: List[Dict[str, Any]] = []
+        self._pages = 0
+        self._count = 0
+        # Records of the groups by their names, in the order of their first results
+        self._groups: Dict[str, Dict[str, Any]] = {}
+        self._group_ids: Dict[str, int] = {}
+        # Hashes of the attachments, referred by the listed tests
+        self._attachments: Set[str] = set()
+        self._last_flush = time()
+
+    def on_suite_starts(self, test_suite: TestSuite):
+        with self._lock:
+            self._start(test_suite)
+
+    def on_suite_ends(self, test_suite: TestSuite):
+        with self._lock:
+            if not self._started:
+                self._start(test_suite)
+            if self._page:
+                report.write_data(f'page_{self._pages}', self._page)
+                self._pages += 1
+                self._page = []
+            for name, group in test_suite.groups.items():
+                first = self._groups[name]['first'] if name in self._groups else self._count
+                self._groups[name] = report.paged_group_record(name, group, first)
+            self._write_index()
+            with open(INDEX, 'wt') as file:
+                file.write(report.create_info(self._template, test_suite))
+            report.store.remove_unused(self._attachments)
+            self._reset()
+
+    def needs_attachments(self) -> bool:
+        return True
+
+    def on_success(self, test: Test):
+        # passed tests are not listed at the 'summary' results mode
+        self._add(test, test.group is None or test.group.summary is None)
+
+    def on_failed(self, test: Test, exception_: Exception):
+        self._add(test)
+
+    def on_broken(self, test: Test, exception_: Exception):
+        self._add(test)
+
+    def on_ignored(self, test: Test, fixture_type: str):
+        self._add(test)
+
+    def on_ignored_by_condition(self, test: Test, exc: Exception):
+        self._add(test)
+
+    def on_ignored_with_provider(self, test: Test):
+        self._add(test)
+
+    def _start(self, test_suite: TestSuite):
+        self._reset()
+        self._started = True
+        report.prepare_folder('index_paged.html')
+        makedirs(f'{report.FOLDER}{sep}data', exist_ok=True)
+        with open(INDEX) as template:
+            self._template = template.read()
+        with open(INDEX, 'wt') as file:
+            file.write(report.create_info(self._template, test_suite))
+        self._write_index()
+
+    def _add(self, test: Test, listed: bool = True):
+        with self._lock:
+            if not self._started:
+                return
+            group = self._groups.get(test.group_name)
+            if group is None:
+                self._group_ids[test.group_name] = len(self._groups)
+                group = self._groups[test.group_name] = {'name': test.group_name, 'duration': 0.0, 'success': 0,
+                                                         'total': 0, 'first': self._count, 'summary': None}
+            if test.timer.start_time >= 0:
+                group['duration'] += max(test.duration(), 0.0)
+            group['success'] += test.status == 'success'
+            group['total'] += 1
+            if not listed:
+                return
+            self._count += 1
+            self._attachments.update(report.attachments_of([test.report_params]))
+            self._page.append(report.paged_test_record(test, self._group_ids[test.group_name]))
+            if len(self._page) == report.PAGE_SIZE:
+                report.write_data(f'page_{self._pages}', self._page)
+                self._pages += 1
+                self._page = []
+            elif time() - self._last_flush < self.flush_interval:
+                return
+            else:
+                # the not full page is rewritten till it is full
+                report.write_data(f'page_{self._pages}', self._page)
+            self._write_index()
+
+    def _write_index(self):
+        pages = self._pages + (1 if self._page else 0)
+        report.write_data('index', {'groups': list(self._groups.values()), 'pages': pages,
+                                     'page_size': report.PAGE_SIZE, 'tests': self._count})
+        self._last_flush = time()
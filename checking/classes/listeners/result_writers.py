@@ -0,0 +1,194 @@
+import re
+import json
+from datetime import datetime
+from threading import Lock
+from xml.sax.saxutils import escape, quoteattr
+from typing import Any, Dict, Optional, Set, TextIO
+
+from .basic import Listener
+from ..basic_test import Test
+from ..basic_suite import TestSuite
+from ...helpers.report import store as attachment_store, attachments_of
+from ...helpers.serialization import result_record, suite_record
+from ...helpers.exception_traceback import get_trace_filtered_by_filename
+
+# Characters, which are not allowed in XML 1.0 documents
+_INVALID_XML = re.compile('[\x00-\x08\x0b\x0c\x0e-\x1f\ufffe\uffff]')
+# Number of characters reserved at the header of the JUnit file for the counters, which are known only at the end
+_RESERVED = 120
+_FOOTER = '</testsuite>\n</testsuites>\n'
+
+
+class _StreamingListener(Listener):
+    """
+    The parent of the listeners, which write every result to the file as soon as the test finishes. The file is
+    flushed after every record, so the results of the crashed or killed run are not lost, and nothing is kept in
+    memory, however big the suite is.
+    """
+
+    def __init__(self, file_name: str):
+        """
+        :param file_name: name of the file to write, it is rewritten at the start of the suite
+        """
+        super().__init__(0)
+        self.file_name = file_name
+        self._file: Optional[TextIO] = None
+        self._lock = Lock()
+
+    def on_suite_starts(self, test_suite: TestSuite):
+        with self._lock:
+            self._open(test_suite)
+
+    def on_suite_ends(self, test_suite: TestSuite):
+        with self._lock:
+            if self._file is None:
+                # the suite was empty or stopped before the start
+                self._open(test_suite)
+            self._close(test_suite)
+            self._file.close()
+            self._file = None
+
+    def on_success(self, test: Test):
+        self._write(test)
+
+    def on_failed(self, test: Test, exception_: Exception):
+        self._write(test)
+
+    def on_broken(self, test: Test, exception_: Exception):
+        self._write(test)
+
+    def on_ignored(self, test: Test, fixture_type: str):
+        self._write(test, f'{fixture_type} fixture failed')
+
+    def on_ignored_by_condition(self, test: Test, exc: Exception):
+        self._write(test)
+
+    def on_ignored_with_provider(self, test: Test):
+        self._write(test, f'provider "{test.provider}" failed')
+
+    def _write(self, test: Test, message: str = ''):
+        with self._lock:
+            if self._file is None:
+                return
+            self._append(test, message)
+            self._file.flush()
+
+    def _open(self, test_suite: TestSuite):
+        self._file = open(self.file_name, 'w', encoding='utf-8')
+        self._start(test_suite)
+        self._file.flush()
+
+    def _start(self, test_suite: TestSuite):
+        pass
+
+    def _append(self, test: Test, message: str):
+        pass
+
+    def _close(self, test_suite: TestSuite):
+        pass
+
+
+class JsonLinesListener(_StreamingListener):
+    """
+    Writes the results to the JSON Lines file: one JSON object for every finished test (the "type" is "test") and
+    the one for the whole suite at the end (the "type" is "suite"), so the file without the last line is the result
+    of the interrupted run. The HTML report can be built from such files later (python -m checking report), so
+    the images of the tests are written to the attachments folder.
+    """
+
+    def __init__(self, file_name: str = 'results.jsonl'):
+        """
+        :param file_name: name of the file to write, it is rewritten at the start of the suite
+        """
+        super().__init__(file_name)
+        # Hashes of the attachments, referred by the written results
+        self._attachments: Set[str] = set()
+
+    def needs_attachments(self) -> bool:
+        return True
+
+    def _start(self, test_suite: TestSuite):
+        self._attachments = set()
+
+    def _append(self, test: Test, message: str):
+        self._attachments.update(attachments_of([test.report_params]))
+        self._line(result_record(test, message))
+
+    def _close(self, test_suite: TestSuite):
+        self._line(suite_record(test_suite))
+        attachment_store.remove_unused(self._attachments)
+
+    def _line(self, record: Dict[str, Any]):
+        self._file.write(json.dumps(record, ensure_ascii=False, default=str))
+        self._file.write('\n')
+
+
+class JUnitListener(_StreamingListener):
+    """
+    Writes the results to the file of JUnit XML format, which is read by CI servers. Every finished test is written
+    with the closing tags of the document after it, the next one overwrites those tags, so the file is always the
+    valid XML document, even if the run was killed. The totals of the suite are written to the header at the end.
+    """
+
+    def __init__(self, file_name: str = 'junit.xml'):
+        """
+        :param file_name: name of the file to write, it is rewritten at the start of the suite
+        """
+        super().__init__(file_name)
+        # Position of the reserved place for the counters and the one of the closing tags
+        self._reserved = 0
+        self._end = 0
+
+    def _start(self, test_suite: TestSuite):
+        self._file.write(f'<?xml version="1.0" encoding="UTF-8"?>\n<testsuites>\n'
+                         f'<testsuite name={_attr(test_suite.name)} timestamp="{datetime.now().isoformat()}"')
+        self._reserved = self._file.tell()
+        self._file.write(f'{" " * _RESERVED}>\n')
+        self._end = self._file.tell()
+        self._file.write(_FOOTER)
+
+    def _append(self, test: Test, message: str):
+        name = f'{test.name}{self._get_test_arg_short_without_new_line(test)}'
+        # the test, which was not started (e.g. ignored), has no duration
+        time_ = 0.0 if test.timer.start_time < 0 else max(test.duration(), 0)
+        case = f'<testcase classname={_attr(test.group_name)} name={_attr(name)} time="{time_:.3f}"'
+        reason = _reason(test, message)
+        if test.status == 'success':
+            case = f'{case}/>\n'
+        elif test.status == 'ignored':
+            case = f'{case}>\n<skipped message={_attr(reason["message"])}/>\n</testcase>\n'
+        else:
+            tag = 'failure' if test.status == 'failed' else 'error'
+            case = (f'{case}>\n<{tag} message={_attr(reason["message"])} type={_attr(reason["exception"])}>'
+                    f'{_text(reason["traceback"])}</{tag}>\n</testcase>\n')
+        self._file.seek(self._end)
+        self._file.write(case)
+        self._end = self._file.tell()
+        self._file.write(_FOOTER)
+
+    def _close(self, test_suite: TestSuite):
+        counters = (f' tests="{test_suite.results_count()}" failures="{test_suite.results_count("failed")}" '
+                    f'errors="{test_suite.results_count("broken")}" '
+                    f'skipped="{test_suite.results_count("ignored")}" '
+                    f'time="{max(test_suite.suite_duration(), 0):.3f}"')
+        self._file.seek(self._reserved)
+        self._file.write(counters[:_RESERVED].ljust(_RESERVED))
+
+
+def _reason(test: Test, message: str) -> Dict[str, Optional[str]]:
+    """
+    Returns the message, the exception name and the filtered traceback of the not passed test.
+    """
+    reason = test.reason
+    if reason is None:
+        return {'message': message or None, 'exception': None, 'traceback': None}
+    return {'message': message or str(reason), 'exception': type(reason).__name__,
+            'traceback': get_trace_filtered_by_filename(reason)}
+
+
+def _attr(value: Any) -> str:
+    return quoteattr(_INVALID_XML.sub('', str(value or '')))
+
+
+def _text(value: Any) -> str:
+    return escape(_INVALID_XML.sub('', str(value or '')))
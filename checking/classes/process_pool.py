@@ -0,0 +1,334 @@
+import sys
+import pickle
+import importlib
+import traceback
+import multiprocessing
+from concurrent.futures import Future, ProcessPoolExecutor
+from threading import Thread, Event
+from typing import Callable, Dict, List, Tuple, Any
+
+from . import event_loop
+from .basic_test import Test
+from .basic_group import TestGroup
+from .basic_suite import TestSuite
+from .listeners.basic import Listener
+from .result_summary import ResultSummary
+from .exc_thread import _watchdog, run_with_timeout
+from ..exceptions import TestBrokenException
+from ..helpers.report import store as attachment_store
+from ..helpers.serialization import key_of_test, is_picklable, pack_test, unpack_test, pack_exception
+
+# Listener hooks, which are called right after the test is stopped, so the test goes to the group results
+RESULT_HOOKS = ('on_success', 'on_failed', 'on_broken', 'on_ignored', 'on_ignored_by_condition',
+                'on_ignored_with_provider')
+
+
+class _PackedTest:
+    """
+    Container for the test results, sent from a worker process.
+    """
+    __slots__ = ('data',)
+
+    def __init__(self, data: Dict):
+        self.data = data
+
+
+class QueueListener(Listener):
+    """
+    Listener of the worker process, sends all events of the test group execution to the main process, where they are
+    handled by the real listener.
+    """
+
+    def __init__(self, queue):
+        super().__init__(0)
+        self.queue = queue
+        # Name of the group (in the main process), which is executed by the worker now
+        self.group_name = ''
+
+    def on_test_starts(self, test: Test):
+        self._send('on_test_starts', test)
+
+    def on_fixture_failed(self, group_name: str, fixture_type: str, exception_: Exception):
+        self._send('on_fixture_failed', group_name, fixture_type, exception_)
+
+    def on_ignored_with_provider(self, test: Test):
+        self._send('on_ignored_with_provider', test)
+
+    def on_error_with_provider(self, name: str, exc: Exception):
+        self._send('on_error_with_provider', name, exc)
+
+    def on_before_provider_failed(self, test: Test, provider: str):
+        self._send('on_before_provider_failed', test, provider)
+
+    def on_success(self, test: Test):
+        self._send('on_success', test)
+
+    def on_failed(self, test: Test, exception_: Exception):
+        self._send('on_failed', test, exception_)
+
+    def on_broken(self, test: Test, exception_: Exception):
+        self._send('on_broken', test, exception_)
+
+    def on_ignored(self, test: Test, fixture_type: str):
+        self._send('on_ignored', test, fixture_type)
+
+    def on_ignored_by_condition(self, test: Test, exc: Exception):
+        self._send('on_ignored_by_condition', test, exc)
+
+    def _send(self, hook_name: str, *args):
+        packed = tuple(_pack(arg) for arg in args)
+        self.queue.put(pickle.dumps((self.group_name, hook_name, packed)))
+
+
+class ProcessPool:
+    """
+    Pool of worker processes, mimics the ThreadPool behaviour (as FakePoolExecutor does). Each worker imports the
+    modules with tests, so every submitted test group is executed by the worker copy of the group. All listener events
+    of the workers are sent back and handled in order by the callback at the dispatcher thread of the main process.
+    If a worker process dies (os._exit, crash of the native code), the groups, which are not finished, are reported as
+    failed by the 'worker process' fixture.
+    """
+
+    def __init__(self, processes: int, test_suite: TestSuite, params: Dict,
+                 on_event: Callable[[str, Tuple], bool]):
+        """
+        Starts the worker processes.
+        :param processes: number of the worker processes
+        :param test_suite: TestSuite instance to put the results to
+        :param params: common parameters of the suite, only picklable ones are sent to the workers
+        :param on_event: callback, gets the listener hook name and its arguments, returns False to stop the workers
+        """
+        self.suite = test_suite
+        self.on_event = on_event
+        # test definitions of the submitted groups by their keys, to find the definition of the received test
+        self.definitions: Dict[str, Dict[Tuple[str, str], Test]] = {}
+        context = multiprocessing.get_context()
+        self.queue = context.Queue()
+        self.stop_event = context.Event()
+        params = {key: value for key, value in params.items() if is_picklable(value)}
+        args = (_modules_of(test_suite), list(sys.path), params, self.queue, self.stop_event, attachment_store.enabled)
+        self.pool = ProcessPoolExecutor(processes, mp_context=context, initializer=_init_worker, initargs=args)
+        self.dispatcher = Thread(target=self._dispatch, daemon=True)
+        self.dispatcher.start()
+
+    def submit(self, func: Callable, group: TestGroup):
+        """
+        Runs the function of the runner module with the same name in a worker process, the worker copy of the group
+        is used as an argument.
+        :param func: runner function, which takes the group
+        :param group: TestGroup instance
+        :return: None
+        """
+        keys = [key_of_test(test) for test in group.tests]
+        definitions = {}
+        for key, test in zip(keys, group.tests):
+            definitions.setdefault(key, test)
+        self.definitions[group.name] = definitions
+        future = self.pool.submit(_run_in_worker, func.__name__, group.name, keys, group.summary is not None)
+        future.add_done_callback(lambda done: self._check_result(group.name, done))
+
+    def shutdown(self, wait: bool):
+        # the pool is broken (not hangs) if a worker has died, the rest of the groups get the error
+        self.pool.shutdown(wait=True)
+        # all workers are finished, so the end marker is the last message in the queue
+        self.queue.put(None)
+        self.dispatcher.join()
+
+    def _check_result(self, group_name: str, future: Future):
+        exception_ = future.exception()
+        if exception_ is not None:
+            self._send_error(group_name, exception_)
+
+    def _send_error(self, group_name: str, exception_: BaseException):
+        error = pack_exception(exception_)
+        self.queue.put(pickle.dumps((group_name, 'on_fixture_failed', (group_name, 'worker process', error))))
+
+    def _dispatch(self):
+        while True:
+            message = self.queue.get()
+            if message is None:
+                break
+            group_name, hook_name, args = pickle.loads(message)
+            try:
+                args = tuple(_unpack(arg, self.definitions[group_name]) for arg in args)
+            except LookupError as e:
+                hook_name, args = 'on_fixture_failed', (group_name, 'worker process', e)
+            try:
+                if not self.on_event(hook_name, args):
+                    self.stop_event.set()
+            except Exception:
+                traceback.print_exc()
+
+
+def _pack(arg: Any) -> Any:
+    if isinstance(arg, Test):
+        return _PackedTest(pack_test(arg))
+    if isinstance(arg, BaseException):
+        return pack_exception(arg)
+    return arg
+
+
+def _unpack(arg: Any, definitions: Dict[Tuple[str, str], Test]) -> Any:
+    if not isinstance(arg, _PackedTest):
+        return arg
+    key = tuple(arg.data['key'])
+    if key not in definitions:
+        raise LookupError(f'Test {key[0]}.{key[1]} of the worker process is not found at the group!')
+    return unpack_test(arg.data, definitions[key])
+
+
+def _modules_of(test_suite: TestSuite) -> List[str]:
+    """
+    Collects the names of all modules with tests, fixtures and providers of the suite.
+    """
+    functions = [func for func, *_ in test_suite.providers.values()]
+    for group in test_suite.groups.values():
+        functions.extend(test.test for test in group.tests)
+        functions.extend(group.before + group.after + group.before_all + group.after_all)
+    return list(dict.fromkeys(func.__module__ for func in functions if hasattr(func, '__module__')))
+
+
+def _init_worker(modules: List[str], paths: List[str], params: Dict, queue, stop_event: Event, attachments: bool):
+    """
+    Worker process initializer, imports the modules to build the same test suite and replaces the listener.
+    """
+    for path in paths:
+        if path not in sys.path:
+            sys.path.append(path)
+    for name in modules:
+        if name not in sys.modules:
+            importlib.import_module(name)
+    from .. import runner
+    _reset_event_loop()
+    runner._listener = QueueListener(queue)
+    # all events are sent to the main process, the results of the tests are collected there
+    runner._listener_hooks = runner._listener.overridden_hooks()
+    # thread pools are not inherited by forked processes
+    runner._tests_pool = None
+    # failed tests are counted by the main process
+    runner._max_fail = 0
+    runner.common.update(params)
+    attachment_store.start_run(attachments)
+    Thread(target=_stop_on_event, args=(stop_event,), daemon=True).start()
+
+
+def _stop_on_event(stop_event: Event):
+    stop_event.wait()
+    from .. import runner
+    runner._can_run = False
+
+
+def _run_in_worker(func_name: str, group_name: str, keys: List[Tuple[str, str]], summary: bool = False):
+    """
+    Runs the group in the worker process, the tests are ordered as in the main process.
+    The results are kept by the main process, so the worker copy of the group drops them after the run.
+    """
+    from .. import runner
+    runner._listener.group_name = group_name
+    groups = TestSuite.get_instance().groups
+    # the script, launched as __main__, is imported as __mp_main__ by spawned workers
+    group = groups[group_name] if group_name in groups or group_name != '__main__' else groups['__mp_main__']
+    tests_by_key = {}
+    for test in group.tests:
+        tests_by_key.setdefault(key_of_test(test), []).append(test)
+    group.tests = [tests_by_key[tuple(key)].pop(0) for key in keys if tests_by_key.get(tuple(key))]
+    group.summary = ResultSummary() if summary else None
+    try:
+        getattr(runner, func_name)(group)
+    finally:
+        group.test_results = []
+        # the attachments of the group are written before the main process writes the report
+        attachment_store.flush()
+
+
+def run_isolated(test: Test):
+    """
+    Runs the test in a child process, which is killed at the deadline if the test has a timeout. The child process
+    finds the same test definition by its key, so it works with both fork and spawn start methods (with spawn,
+    the child imports the test module by itself).
+
+    :param test: Test instance
+    :return: None
+    :raise TestBrokenException: if the time is over, the child process has died or the argument can not be sent to it
+    """
+    # the workers of the process pool are daemons (before Python 3.9), which can not have children
+    if multiprocessing.current_process().daemon:
+        if test.timeout:
+            run_with_timeout(test)
+        else:
+            test.run()
+        return
+    if test.provider is not None:
+        test.str_arg = str(test.argument)
+    context = multiprocessing.get_context()
+    # arguments of the forked process are not pickled
+    if context.get_start_method() != 'fork' and not is_picklable(test.argument):
+        raise TestBrokenException(f'Argument "{test.str_arg}" of the test "{test}" is not picklable, it can not be '
+                                  f'sent to the child process!')
+    receiver, sender = context.Pipe(duplex=False)
+    process = context.Process(target=_run_in_child,
+                              args=(list(sys.path), key_of_test(test), test.name, test.argument, sender,
+                                    attachment_store.enabled), daemon=True)
+    killed = []
+
+    def kill():
+        killed.append(True)
+        # kill is available since Python 3.7
+        getattr(process, 'kill', process.terminate)()
+
+    test.timer.start()
+    process.start()
+    sender.close()
+    entry = _watchdog.register(test.timeout, kill) if test.timeout else None
+    try:
+        result = receiver.recv()
+    except EOFError:
+        result = None
+    finally:
+        if entry:
+            _watchdog.cancel(entry)
+        receiver.close()
+        process.join()
+    if result is None:
+        if killed:
+            raise TestBrokenException(f'Time ({test.timeout} seconds) is over for test "{test}"!')
+        raise TestBrokenException(f'Process of the test "{test}" has died with exit code {process.exitcode}!')
+    report_params, exception_ = result
+    test.report_params.update(report_params)
+    if exception_ is not None:
+        raise exception_
+
+
+def _run_in_child(paths: List[str], key: Tuple[str, str], name: str, argument: Any, sender, attachments: bool):
+    """
+    Runs the test in the child process and sends back the report parameters and the exception.
+    """
+    for path in paths:
+        if path not in sys.path:
+            sys.path.append(path)
+    _reset_event_loop()
+    attachment_store.start_run(attachments)
+    # the script, launched as __main__, is already imported by spawned processes
+    if key[0] not in sys.modules:
+        importlib.import_module(key[0])
+    definitions = [test for group in TestSuite.get_instance().groups.values() for test in group.tests
+                   if key_of_test(test) == key]
+    test = definitions[0].clone()
+    test.name = name
+    test.argument = argument
+    test.str_arg = str(argument)
+    exception_ = None
+    try:
+        test.run()
+    except (Exception, SystemExit) as e:
+        exception_ = pack_exception(e)
+    attachment_store.flush()
+    sender.send((test.report_params, exception_))
+    sender.close()
+
+
+def _reset_event_loop():
+    """
+    The thread of the event loop is not inherited by forked processes, so the process starts its own loop.
+    """
+    event_loop._event_loop = event_loop.EventLoop()
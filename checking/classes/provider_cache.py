@@ -0,0 +1,390 @@
+import os
+import re
+import sys
+import pickle
+import hashlib
+from io import BytesIO
+from itertools import count
+from tempfile import TemporaryFile
+from threading import RLock, Event
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+# Max size (in bytes) of the cached values of all providers kept in memory, the rest is spilled to the disk
+MEMORY_LIMIT = 256 * 1024 * 1024
+# Max size (in bytes) of the cached values of one provider kept in memory
+PROVIDER_LIMIT = 64 * 1024 * 1024
+# Types of the global values, which are hashed with the provider code
+_STABLE_TYPES = (bool, int, float, complex, str, bytes, type(None))
+# Memory address at the default representation of the object, like <object object at 0x7f...>
+_ADDRESS = re.compile(r' at 0x[0-9a-fA-F]+')
+# Name of the persistent cache file after the provider name and the dash
+_OLD_FILE = re.compile(r'[0-9a-f]{32}\.pickle')
+# Numbers of the temporary files of the persistent cache, written by the process
+_temp_numbers = count()
+
+
+class _Entry:
+    """
+    Cached values of one provider: chunks at the spill file and the tail in memory.
+    Both are replaced at once, so the entry can be read without locking.
+    """
+    __slots__ = ('data', 'size', 'picklable', 'last_used')
+
+    def __init__(self, chunks: Tuple[Tuple[int, int], ...], values: Tuple, size: int, picklable: bool):
+        # Offsets and lengths of the pickled chunks at the spill file and the values kept in memory
+        self.data: Tuple[Tuple[Tuple[int, int], ...], Tuple] = (chunks, values)
+        # Size of the values in memory (pickled)
+        self.size = size
+        # Values which can not be pickled are never spilled
+        self.picklable = picklable
+        # Tick of the last use, for the least recently used eviction
+        self.last_used = 0
+
+
+class CacheWriter:
+    """
+    Collects the values of the provider to the cache. Values are spilled to the disk in chunks, when they do not fit
+    the provider memory budget. If the key is specified, values are also saved to the persistent cache file.
+    The values are available in the cache only after commit, the writer must be committed or discarded to let
+    other threads, waiting for the provider values, go on.
+    """
+
+    def __init__(self, cache: 'ProviderCache', name: str, key: Optional[str] = None):
+        self.cache = cache
+        self.name = name
+        self.chunks: List[Tuple[int, int]] = []
+        self.values: List[Any] = []
+        # Pickled values, each value is pickled once for the size, the spill file and the persistent cache file
+        self.pickled: List[bytes] = []
+        self.size = 0
+        self.picklable = True
+        # Persistent cache file, values are written to the temporary one and it is renamed at commit. Workers and
+        # shards, sharing the cache folder, can write the same file at the same time, so the temporary names differ
+        self.key = key
+        self.file_name = cache.file_name(name, key) if key else None
+        self.temp_name = f'{self.file_name}.{os.getpid()}.{next(_temp_numbers)}.tmp' if key else None
+        self.file = open(self.temp_name, 'wb') if self.file_name else None
+        self.finished = False
+
+    def append(self, value: Any):
+        self.values.append(value)
+        data = self._pickle(value)
+        if data is None:
+            # values which can not be pickled are not saved
+            self._remove_file()
+            self.size += sys.getsizeof(value)
+            return
+        self.pickled.append(data)
+        self.size += len(data)
+        if self.file:
+            self.file.write(data)
+        if self.size > self.cache.provider_limit:
+            self.chunks.append(self.cache.write_chunk(b''.join(self.pickled)))
+            self.values = []
+            self.pickled = []
+            self.size = 0
+
+    def commit(self):
+        if self.file:
+            self.file.close()
+            self.file = None
+            try:
+                os.replace(self.temp_name, self.file_name)
+            except OSError:
+                # the other process has saved the same values first (the file is open on Windows)
+                os.remove(self.temp_name)
+                if not os.path.exists(self.file_name):
+                    raise
+            self.cache.remove_old_files(self.name, self.key)
+        entry = _Entry(tuple(self.chunks), tuple(self.values), self.size, self.picklable)
+        self.cache.put(self.name, entry)
+        self.finished = True
+
+    def discard(self):
+        """
+        Drops the collected values, if the writer was not committed.
+        """
+        if self.finished:
+            return
+        self._remove_file()
+        self.cache.finish(self.name)
+        self.finished = True
+
+    def _remove_file(self):
+        if self.file:
+            self.file.close()
+            self.file = None
+            os.remove(self.temp_name)
+
+    def _pickle(self, value: Any) -> Optional[bytes]:
+        if self.picklable:
+            try:
+                return pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+            except Exception:
+                self.picklable = False
+                self.pickled = []
+        return None
+
+
+class ProviderCache:
+    """
+    Cache of the provider values, used as a dict of provider name - iterable of values.
+    Values are kept in memory within the budgets (for each provider and for all of them), when the total budget is
+    exceeded, the least recently used providers are spilled to the temporary file, which is read back lazily,
+    chunk by chunk.
+    Values of each provider are built once (single-flight): while one thread builds them, other threads wait for the
+    result. Cached values are read without locking.
+    """
+
+    def __init__(self, memory_limit: int = MEMORY_LIMIT, provider_limit: int = PROVIDER_LIMIT):
+        """
+        :param memory_limit: max size (in bytes) of the values of all providers kept in memory
+        :param provider_limit: max size (in bytes) of the values of one provider kept in memory
+        """
+        self.memory_limit = memory_limit
+        self.provider_limit = provider_limit
+        self._entries: Dict[str, _Entry] = {}
+        self._lock = RLock()
+        self._file = None
+        self._clock = count(1)
+        # Events of the providers, which values are being built now
+        self._building: Dict[str, Event] = {}
+        # Folder of the persistent cache, which is kept between the runs, None if not used
+        self.directory: Optional[str] = None
+        # Number of the provider calls, avoided by waiting for the values built by another thread
+        self.duplicates_avoided = 0
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._entries
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __getitem__(self, name: str) -> Iterable:
+        entry = self._entries[name]
+        entry.last_used = next(self._clock)
+        chunks, values = entry.data
+        if not chunks:
+            return values
+        return self._iterate(chunks, values)
+
+    def __setitem__(self, name: str, values: Iterable):
+        writer = self.writer(name)
+        for value in values:
+            writer.append(value)
+        writer.commit()
+
+    def begin(self, name: str, wait: bool = True) -> bool:
+        """
+        Starts building the values of the provider. If another thread builds them now, waits for it to finish.
+        :param name: provider name
+        :param wait: if False, returns at once if another thread builds the values
+        :return: True if the caller must build the values (and then commit or discard the writer),
+            False if the values are cached already (or the other thread has failed to build them, if not in cache)
+        """
+        with self._lock:
+            if name in self._entries:
+                return False
+            event = self._building.get(name)
+            if event is None:
+                self._building[name] = Event()
+                return True
+        if wait:
+            event.wait()
+            if name in self._entries:
+                with self._lock:
+                    self.duplicates_avoided += 1
+        return False
+
+    def finish(self, name: str):
+        """
+        Lets the threads, waiting for the values of the provider, go on.
+        """
+        with self._lock:
+            event = self._building.pop(name, None)
+        if event is not None:
+            event.set()
+
+    def writer(self, name: str, key: Optional[str] = None) -> CacheWriter:
+        """
+        Creates the writer to collect the values of the provider.
+        :param name: provider name
+        :param key: key of the provider source to save the values to the persistent cache, None to keep them in memory
+        :return: CacheWriter instance
+        """
+        return CacheWriter(self, name, key)
+
+    def file_name(self, name: str, key: str) -> str:
+        """
+        Returns the path to the persistent cache file of the provider.
+        """
+        safe_name = ''.join(char if char.isalnum() else '_' for char in name)
+        return os.path.join(self.directory, f'{safe_name}-{key}.pickle')
+
+    def remove_old_files(self, name: str, key: str):
+        """
+        Removes the persistent cache files of the provider, which were saved for its previous sources.
+        :param name: provider name
+        :param key: key of the actual provider source
+        :return: None
+        """
+        actual = os.path.basename(self.file_name(name, key))
+        prefix = actual[:-len(f'{key}.pickle')]
+        for file_name in os.listdir(self.directory):
+            if file_name.startswith(prefix) and file_name != actual and _OLD_FILE.fullmatch(file_name[len(prefix):]):
+                try:
+                    os.remove(os.path.join(self.directory, file_name))
+                except OSError:
+                    # the other process has removed it
+                    pass
+
+    def load(self, name: str, key: str) -> Optional[Iterator]:
+        """
+        Returns the values of the provider, saved by the previous runs, if the provider source was not changed.
+        :param name: provider name
+        :param key: key of the provider source
+        :return: generator, reading the values from the persistent cache file, None if there is no such file
+        """
+        file_name = self.file_name(name, key)
+        if not os.path.exists(file_name):
+            return None
+        return _read_file(file_name)
+
+    def memory_size(self) -> int:
+        """
+        Returns the size (in bytes) of the cached values kept in memory.
+        """
+        return sum(entry.size for entry in list(self._entries.values()))
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.duplicates_avoided = 0
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+    def put(self, name: str, entry: _Entry):
+        """
+        Adds the values to the cache and spills the least recently used providers if the memory budget is exceeded.
+        """
+        with self._lock:
+            entry.last_used = next(self._clock)
+            self._entries[name] = entry
+            total = self.memory_size()
+            for old in sorted(self._entries.values(), key=lambda e: e.last_used):
+                if total <= self.memory_limit:
+                    break
+                chunks, values = old.data
+                if old.picklable and values:
+                    total -= old.size
+                    data = b''.join(pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL) for value in values)
+                    old.data = (chunks + (self.write_chunk(data),), ())
+                    old.size = 0
+        self.finish(name)
+
+    def write_chunk(self, data: bytes) -> Tuple[int, int]:
+        """
+        Writes the pickled values (one after another) to the spill file.
+        :return: offset and length of the chunk
+        """
+        with self._lock:
+            if self._file is None:
+                self._file = TemporaryFile()
+            self._file.seek(0, 2)
+            offset = self._file.tell()
+            self._file.write(data)
+        return offset, len(data)
+
+    def _iterate(self, chunks: Tuple[Tuple[int, int], ...], tail: Tuple) -> Iterator:
+        for offset, length in chunks:
+            yield from self._read(offset, length)
+        yield from tail
+
+    def _read(self, offset: int, length: int) -> List:
+        with self._lock:
+            self._file.seek(offset)
+            data = BytesIO(self._file.read(length))
+        values = []
+        while data.tell() < length:
+            values.append(pickle.load(data))
+        return values
+
+
+def source_key(func: Callable) -> Optional[str]:
+    """
+    Builds the key of the provider source: hash of the function code (including the module-level functions it calls
+    and the functions and values it closes over) and of the paths, modification times and sizes of its input files.
+    Input files are taken from the 'input_files' attribute of the function, which is set by DATA_FILE.
+
+    :param func: provider function
+    :return: hex digest, None if the function closes over the value, which has no stable representation (its repr
+        shows the memory address), so the key would be new at every run
+    """
+    digest = hashlib.sha256()
+    if not _update_with_function(digest, func, set()):
+        return None
+    for path in getattr(func, 'input_files', ()):
+        stat = os.stat(path)
+        digest.update(f'{os.path.abspath(path)}:{stat.st_mtime_ns}:{stat.st_size}'.encode('utf-8'))
+    return digest.hexdigest()[:32]
+
+
+def _update_with_function(digest, func: Callable, seen: set) -> bool:
+    if id(func) in seen:
+        return True
+    seen.add(id(func))
+    code = getattr(func, '__code__', None)
+    if code is None:
+        return _update_with_value(digest, func)
+    digest.update(f'{func.__module__}.{func.__qualname__}'.encode('utf-8'))
+    if not _update_with_code(digest, code, getattr(func, '__globals__', {}), seen):
+        return False
+    for cell in func.__closure__ or ():
+        try:
+            value = cell.cell_contents
+        except ValueError:
+            continue
+        if callable(value) and hasattr(value, '__code__'):
+            if not _update_with_function(digest, value, seen):
+                return False
+        elif not _update_with_value(digest, value):
+            return False
+    return True
+
+
+def _update_with_code(digest, code, globals_: Dict[str, Any], seen: set) -> bool:
+    digest.update(code.co_code)
+    digest.update(repr(code.co_names).encode('utf-8'))
+    for name in code.co_names:
+        value = globals_.get(name)
+        # the module-level functions, called by the provider, are the part of its source
+        if callable(value) and hasattr(value, '__code__'):
+            if not _update_with_function(digest, value, seen):
+                return False
+        elif isinstance(value, _STABLE_TYPES):
+            digest.update(repr(value).encode('utf-8'))
+    for const in code.co_consts:
+        if hasattr(const, 'co_code'):
+            if not _update_with_code(digest, const, globals_, seen):
+                return False
+        else:
+            digest.update(repr(const).encode('utf-8'))
+    return True
+
+
+def _update_with_value(digest, value: Any) -> bool:
+    text = repr(value)
+    if _ADDRESS.search(text):
+        return False
+    digest.update(text.encode('utf-8'))
+    return True
+
+
+def _read_file(file_name: str) -> Iterator:
+    with open(file_name, 'rb') as file:
+        while True:
+            try:
+                yield pickle.load(file)
+            except EOFError:
+                return
@@ -0,0 +1,66 @@
+from threading import Lock
+from typing import List, Tuple
+
+# Upper bounds (in seconds) of the buckets of the durations histogram, the last bucket is for longer durations
+BUCKETS = (0.001, 0.01, 0.1, 1.0, 10.0, 60.0)
+
+
+class ResultSummary:
+    """
+    Aggregates of the passed test executions, which are not kept as records at the 'summary' results mode:
+    the number of executions, their total duration and the histogram of durations.
+    """
+    __slots__ = ('count', 'duration', 'histogram', '_lock')
+
+    def __init__(self):
+        self.count = 0
+        # Total duration (in seconds)
+        self.duration = 0.0
+        # Numbers of the executions by the buckets of BUCKETS (and one more for longer durations)
+        self.histogram: List[int] = [0] * (len(BUCKETS) + 1)
+        self._lock = Lock()
+
+    def add(self, duration: float):
+        """
+        Folds the passed execution into the aggregates.
+        :param duration: duration of the execution in seconds
+        :return: None
+        """
+        duration = max(duration, 0.0)
+        index = len(BUCKETS)
+        for i, bound in enumerate(BUCKETS):
+            if duration < bound:
+                index = i
+                break
+        with self._lock:
+            self.count += 1
+            self.duration += duration
+            self.histogram[index] += 1
+
+    def update(self, other: 'ResultSummary'):
+        """
+        Adds the aggregates of another summary to this one.
+        :param other: ResultSummary instance
+        :return: None
+        """
+        with self._lock:
+            self.count += other.count
+            self.duration += other.duration
+            self.histogram = [a + b for a, b in zip(self.histogram, other.histogram)]
+
+    def buckets(self) -> List[Tuple[str, int]]:
+        """
+        Returns the not empty buckets of the histogram.
+        :return: list of pairs of the bucket label (like '<10ms') and the number of executions
+        """
+        labels = [f'<{_format_bound(bound)}' for bound in BUCKETS] + [f'>={_format_bound(BUCKETS[-1])}']
+        return [(label, count) for label, count in zip(labels, self.histogram) if count]
+
+    def __str__(self):
+        return ', '.join(f'{label}: {count}' for label, count in self.buckets())
+
+
+def _format_bound(bound: float) -> str:
+    if bound < 1:
+        return f'{bound * 1000:g}ms'
+    return f'{bound:g}s'
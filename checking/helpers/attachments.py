@@ -0,0 +1,167 @@
+import os
+import sys
+import hashlib
+import traceback
+from queue import Queue
+from threading import Thread, Lock
+from typing import Dict, Iterable, Optional, Set
+
+# Folder of the attachments inside the report folder
+ATTACHMENTS = 'attachments'
+
+
+class Attachment(str):
+    """
+    Hash of the content of the attachment, which is kept at the report parameters of the test instead of the content.
+    The content is stored once in the attachments folder, in the file named by the hash.
+    """
+    __slots__ = ()
+
+    def file_name(self) -> str:
+        """
+        Returns the path to the attachment file relative to the report folder.
+        """
+        return f'{ATTACHMENTS}/{self}.png'
+
+
+class AttachmentStore:
+    """
+    Content-addressed storage of the attachments (images) of the report. The same content is written only once,
+    however many tests attach it. Files are written at the background thread, so tests do not wait for the disk.
+    If the writing is off (the run makes no report), the contents are kept in memory and are written only when it is
+    turned on.
+    """
+
+    def __init__(self, directory: str, enabled: bool = True):
+        """
+        :param directory: folder to write the attachments to
+        :param enabled: if False, the contents are not written till the enable call
+        """
+        self.directory = directory
+        self.enabled = enabled
+        # Hashes of the contents, which are written, queued to write or kept in memory
+        self._known: Set[str] = set()
+        # Contents, which are not written, because the writing is off
+        self._pending: Dict[str, bytes] = {}
+        # Hashes of the attachments, referred by the results of the run, which are not removed by remove_unused
+        self._used: Set[str] = set()
+        self._queue = Queue()
+        self._lock = Lock()
+        self._thread: Optional[Thread] = None
+        # Number of the attachments, which content was stored already
+        self.duplicates = 0
+
+    def put(self, content: bytes) -> Attachment:
+        """
+        Stores the content (if it is not stored yet) and returns its hash.
+        :param content: bytes of the attachment
+        :return: Attachment (hash of the content)
+        """
+        digest = Attachment(hashlib.sha256(content).hexdigest())
+        with self._lock:
+            if digest in self._known:
+                self.duplicates += 1
+                return digest
+            self._known.add(digest)
+            if not self.enabled:
+                self._pending[digest] = content
+                return digest
+            self._start_thread()
+        self._queue.put((digest, content))
+        return digest
+
+    def start_run(self, enabled: bool):
+        """
+        Prepares the store for the new run: turns the writing of the files on or off and forgets the files of the
+        previous runs (they are checked again, they could be removed). The contents of the previous run, which were
+        not written, are dropped.
+        :param enabled: True if the run makes the report (or the results, which refer to the attachment files)
+        :return: None
+        """
+        with self._lock:
+            self.enabled = False
+            self._known = set()
+            self._pending = {}
+            self._used = set()
+        if enabled:
+            self.enable()
+
+    def enable(self):
+        """
+        Turns the writing of the files on, the contents, kept in memory, are written too.
+        :return: None
+        """
+        with self._lock:
+            self.enabled = True
+            pending, self._pending = self._pending, {}
+            if pending:
+                self._start_thread()
+        for digest, content in pending.items():
+            self._queue.put((digest, content))
+
+    def remove_unused(self, used: Iterable[str]):
+        """
+        Removes the files of the attachments, which are not referred by the results of the report (e.g. the ones of
+        the previous runs). The files, referred by the previous calls of the run, are kept too, so the report and
+        the listeners, which refer to the different results, do not remove each other files.
+        :param used: hashes of the attachments, referred by the results
+        :return: None
+        """
+        self.flush()
+        with self._lock:
+            self._used.update(used)
+            used = set(self._used)
+        if not os.path.isdir(self.directory):
+            return
+        for name in os.listdir(self.directory):
+            digest, extension = os.path.splitext(name)
+            # the temporary files are written by other processes now
+            if extension != '.png' or digest in used:
+                continue
+            try:
+                os.remove(os.path.join(self.directory, name))
+            except OSError:
+                continue
+            with self._lock:
+                self._known.discard(digest)
+
+    def flush(self):
+        """
+        Waits for all queued attachments to be written.
+        :return: None
+        """
+        self._queue.join()
+
+    def path(self, digest: str) -> str:
+        """
+        Returns the path to the file of the attachment.
+        :param digest: hash of the content
+        :return: path to the file
+        """
+        return os.path.join(self.directory, f'{digest}.png')
+
+    def _start_thread(self):
+        if self._thread is None:
+            self._thread = Thread(target=self._write, name='Attachments', daemon=True)
+            self._thread.start()
+
+    def _write(self):
+        while True:
+            digest, content = self._queue.get()
+            try:
+                file_name = self.path(digest)
+                # the file of the previous run has the same content
+                if not os.path.exists(file_name):
+                    os.makedirs(self.directory, exist_ok=True)
+                    temp_name = f'{file_name}.{os.getpid()}.tmp'
+                    with open(temp_name, 'wb') as file:
+                        file.write(content)
+                    # the other process can write the same file at the same time, the whole file is moved at once
+                    os.replace(temp_name, file_name)
+            except OSError:
+                # the attachment is not in the report, but the run goes on
+                traceback.print_exc(file=sys.stderr)
+                with self._lock:
+                    self._known.discard(digest)
+            finally:
+                self._queue.task_done()
@@ -38,6 +38,9 @@ def get_trace(exception: Exception) -> List[Tuple]:
     :return: list, containing pairs consisting of the error location (file name, line number and test function name)
         and the line of code, which triggered an assertion fail
     """
+    # exceptions received from the child processes keep the parsed traceback of the place, where they were raised
+    if hasattr(exception, 'remote_trace'):
+        return list(exception.remote_trace)
     result = []
     for tb in iter(traceback.extract_tb(exception.__traceback__)):
         first = f'File "{tb.filename}", line {tb.lineno}, in {tb.name}'
@@ -86,6 +89,8 @@ def exception_with_assert(exception: Exception) -> Exception:
         message = f'{message}"{trace_last_line}" is False but True was expected'
     error = AssertionError(message)
     error.__traceback__ = exception.__traceback__
+    if hasattr(exception, 'remote_trace'):
+        error.remote_trace = exception.remote_trace
     del exception
     return error
 
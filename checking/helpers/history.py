@@ -0,0 +1,96 @@
+import json
+from typing import Dict, Iterable, List, Optional
+
+from checking.classes.basic_group import TestGroup
+from checking.classes.basic_suite import TestSuite
+from checking.helpers.others import is_file_exists
+
+# Weight of the last run duration, durations of the previous runs are smoothed with it
+LAST_RUN_WEIGHT = 0.5
+
+
+class DurationHistory:
+    """
+    Durations of the tests and groups of the previous runs, stored at the local JSON file.
+    Used to run the longest groups first and to split the suite to the shards of equal duration.
+    """
+
+    def __init__(self, file_name: str):
+        """
+        Reads the durations from the file if it exists.
+        :param file_name: path to the history file
+        """
+        self.file_name = file_name
+        # Durations of the groups by name
+        self.groups: Dict[str, float] = {}
+        # Durations of the tests by 'group::name' key (sum of all provider cases and retries)
+        self.tests: Dict[str, float] = {}
+        if file_name and is_file_exists(file_name):
+            with open(file_name, encoding='utf-8') as file:
+                data = json.load(file)
+            self.groups = data.get('groups', {})
+            self.tests = data.get('tests', {})
+
+    def __bool__(self):
+        return bool(self.groups)
+
+    def expected(self, group: TestGroup) -> Optional[float]:
+        """
+        Returns the expected duration of the group: the saved one or the sum of the saved durations of its tests.
+        :param group: TestGroup instance
+        :return: duration in seconds or None if there is no history for the group and its tests
+        """
+        if group.name in self.groups:
+            return self.groups[group.name]
+        durations = [self.tests[key] for key in (_key(group.name, test.name) for test in group.tests)
+                     if key in self.tests]
+        return sum(durations) if durations else None
+
+    def longest_first(self, groups: Iterable[TestGroup]) -> List[TestGroup]:
+        """
+        Sorts the groups by expected duration, the longest first. Groups without history go first, as they can be
+        the longest ones, the order of such groups is kept.
+        :param groups: test groups
+        :return: list of the groups
+        """
+        def _order(group: TestGroup) -> float:
+            expected = self.expected(group)
+            return -float('inf') if expected is None else -expected
+
+        return sorted(groups, key=_order)
+
+    def update(self, test_suite: TestSuite):
+        """
+        Adds the durations of the finished run. The saved values are smoothed with the new ones.
+        :param test_suite: TestSuite instance after the run
+        :return: None
+        """
+        for group in test_suite.groups.values():
+            tests: Dict[str, float] = {}
+            for test in group.test_results:
+                # ignored tests were not started
+                if test.timer.start_time < 0:
+                    continue
+                key = _key(group.name, test.name.rsplit(' (', 1)[0] if test.retries > 1 else test.name)
+                tests[key] = tests.get(key, 0.0) + test.duration()
+            # passed tests are only counted at the 'summary' results mode, so they add up to the group duration only
+            summarized = group.summary.duration if group.summary is not None else 0.0
+            if not tests and not summarized:
+                continue
+            for key, duration in tests.items():
+                self.tests[key] = _smooth(self.tests.get(key), duration)
+            self.groups[group.name] = _smooth(self.groups.get(group.name), sum(tests.values()) + summarized)
+
+    def save(self):
+        with open(self.file_name, 'wt', encoding='utf-8') as file:
+            json.dump({'groups': self.groups, 'tests': self.tests}, file, indent=1, sort_keys=True)
+
+
+def _key(group_name: str, test_name: str) -> str:
+    return f'{group_name}::{test_name}'
+
+
+def _smooth(previous: Optional[float], last: float) -> float:
+    if previous is None:
+        return last
+    return previous * (1 - LAST_RUN_WEIGHT) + last * LAST_RUN_WEIGHT
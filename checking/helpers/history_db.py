@@ -0,0 +1,201 @@
+import sqlite3
+from threading import Lock
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+# Number of the runs, which are analyzed by the queries by default
+LAST_RUNS = 30
+# Test duration is regressed, if its mean duration in the last runs is greater than the one of the earlier runs
+# by this ratio
+REGRESSION_RATIO = 1.5
+
+_SCHEMA = '''
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    suite TEXT NOT NULL,
+    start_time REAL NOT NULL,
+    end_time REAL,
+    duration REAL,
+    tests INTEGER,
+    success INTEGER,
+    failed INTEGER,
+    broken INTEGER,
+    ignored INTEGER
+);
+CREATE TABLE IF NOT EXISTS results (
+    run_id INTEGER NOT NULL REFERENCES runs (id),
+    group_name TEXT NOT NULL,
+    name TEXT NOT NULL,
+    argument TEXT NOT NULL,
+    status TEXT NOT NULL,
+    start_time REAL,
+    duration REAL,
+    reason TEXT
+);
+CREATE INDEX IF NOT EXISTS results_by_test ON results (group_name, name, argument, run_id);
+CREATE INDEX IF NOT EXISTS results_by_run ON results (run_id, status);
+'''
+
+
+class HistoryDatabase:
+    """
+    History of the runs at the local SQLite database: one row for every run and for every test execution of it.
+    Rows of the executions are inserted by batches in one transaction, the queries find the slowest, regressed and
+    flaky tests of the last runs.
+    """
+
+    def __init__(self, file_name: str):
+        """
+        Opens (or creates) the database.
+        :param file_name: path to the database file
+        """
+        self.file_name = file_name
+        # the rows are inserted by the threads of the tests or listeners, the access is serialized by the lock
+        self._connection = sqlite3.connect(file_name, check_same_thread=False)
+        self._lock = Lock()
+        with self._lock, self._connection:
+            self._connection.executescript(_SCHEMA)
+
+    def close(self):
+        with self._lock:
+            self._connection.close()
+
+    def start_run(self, suite: str, start: float) -> int:
+        """
+        Adds the run and returns its id.
+        :param suite: name of the test suite
+        :param start: start time of the run (timestamp)
+        :return: id of the run
+        """
+        with self._lock, self._connection:
+            cursor = self._connection.execute('INSERT INTO runs (suite, start_time) VALUES (?, ?)', (suite, start))
+            return cursor.lastrowid
+
+    def add_results(self, run_id: int, rows: Iterable[Tuple]):
+        """
+        Inserts the executions of the tests in one transaction.
+        :param run_id: id of the run
+        :param rows: tuples of the group name, test name, argument, status, start, duration and reason
+        :return: None
+        """
+        with self._lock, self._connection:
+            self._connection.executemany('INSERT INTO results VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+                                         ((run_id,) + tuple(row) for row in rows))
+
+    def end_run(self, run_id: int, end: float, duration: float, counters: Dict[str, int]):
+        """
+        Saves the end time and the counters of the run.
+        :param run_id: id of the run
+        :param end: end time of the run (timestamp)
+        :param duration: duration of the run in seconds
+        :param counters: numbers of the tests by status and the total one (the 'tests' key)
+        :return: None
+        """
+        with self._lock, self._connection:
+            self._connection.execute('UPDATE runs SET end_time = ?, duration = ?, tests = ?, success = ?, failed = ?, '
+                                     'broken = ?, ignored = ? WHERE id = ?',
+                                     (end, duration, counters.get('tests', 0), counters.get('success', 0),
+                                      counters.get('failed', 0), counters.get('broken', 0),
+                                      counters.get('ignored', 0), run_id))
+
+    def slowest(self, runs: int = LAST_RUNS, limit: int = 50, suite: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        Returns the tests with the greatest mean duration in the last runs of the suite.
+        :param runs: number of the last runs to analyze
+        :param limit: max number of the tests
+        :param suite: name of the test suite, the suite of the last run if None
+        :return: list of dicts with the test group, name, argument, number of executions, mean and longest durations
+        """
+        suite = self._suite(suite)
+        return self._query('SELECT group_name, name, argument, COUNT(*) AS executions, AVG(results.duration) AS mean, '
+                           'MAX(results.duration) AS longest FROM results JOIN runs ON runs.id = results.run_id '
+                           "WHERE runs.suite = ? AND run_id >= ? AND results.duration >= 0 AND status != 'ignored' "
+                           'GROUP BY group_name, name, argument ORDER BY mean DESC LIMIT ?',
+                           (suite, self._first_run(runs, suite), limit))
+
+    def regressed(self, runs: int = LAST_RUNS, limit: int = 50, ratio: float = REGRESSION_RATIO,
+                  suite: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        Returns the tests, which mean duration of the last runs of the suite is greater than the one of the earlier
+        runs by the ratio, the most regressed first.
+        :param runs: number of the last runs, which are compared with all earlier runs
+        :param limit: max number of the tests
+        :param ratio: min ratio of the durations
+        :param suite: name of the test suite, the suite of the last run if None
+        :return: list of dicts with the test group, name, argument, mean durations of the earlier and the recent runs
+            and their ratio
+        """
+        suite = self._suite(suite)
+        first = self._first_run(runs, suite)
+        return self._query('SELECT group_name, name, argument, earlier, recent, recent / earlier AS ratio FROM ('
+                           'SELECT group_name, name, argument, '
+                           'AVG(CASE WHEN run_id < ? THEN results.duration END) AS earlier, '
+                           'AVG(CASE WHEN run_id >= ? THEN results.duration END) AS recent '
+                           'FROM results JOIN runs ON runs.id = results.run_id '
+                           "WHERE runs.suite = ? AND results.duration >= 0 AND status != 'ignored' "
+                           'GROUP BY group_name, name, argument) '
+                           'WHERE earlier > 0 AND recent >= earlier * ? ORDER BY ratio DESC LIMIT ?',
+                           (first, first, suite, ratio, limit))
+
+    def flaky(self, runs: int = LAST_RUNS, limit: int = 50, suite: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        Returns the tests, which both passed and failed (or were broken) in the last runs of the suite, the most
+        unstable first (the ones, which fail about half of the times). The test, which passed on retry, is flaky too.
+        :param runs: number of the last runs to analyze
+        :param limit: max number of the tests
+        :param suite: name of the test suite, the suite of the last run if None
+        :return: list of dicts with the test group, name, argument, numbers of executions and of the not passed ones
+        """
+        suite = self._suite(suite)
+        return self._query('SELECT group_name, name, argument, executions, failures, '
+                           'MIN(failures, executions - failures) * 1.0 / executions AS flakiness FROM ('
+                           'SELECT group_name, name, argument, COUNT(*) AS executions, '
+                           "SUM(status IN ('failed', 'broken')) AS failures "
+                           'FROM results JOIN runs ON runs.id = results.run_id '
+                           "WHERE runs.suite = ? AND run_id >= ? AND status != 'ignored' "
+                           'GROUP BY group_name, name, argument) '
+                           'WHERE failures > 0 AND failures < executions ORDER BY flakiness DESC, executions DESC '
+                           'LIMIT ?', (suite, self._first_run(runs, suite), limit))
+
+    def _suite(self, suite: Optional[str]) -> Optional[str]:
+        """
+        Returns the name of the suite or the one of the last run, if the name is None.
+        """
+        if suite is not None:
+            return suite
+        with self._lock:
+            row = self._connection.execute('SELECT suite FROM runs ORDER BY id DESC LIMIT 1').fetchone()
+        return row[0] if row else None
+
+    def _first_run(self, runs: int, suite: Optional[str]) -> int:
+        """
+        Returns the id of the first of the last runs of the suite.
+        """
+        with self._lock:
+            row = self._connection.execute('SELECT MIN(id) FROM (SELECT id FROM runs WHERE suite = ? '
+                                           'ORDER BY id DESC LIMIT ?)', (suite, runs)).fetchone()
+        return row[0] if row and row[0] is not None else 0
+
+    def _query(self, sql: str, parameters: Tuple) -> List[Dict[str, Any]]:
+        with self._lock:
+            cursor = self._connection.execute(sql, parameters)
+            names = [column[0] for column in cursor.description]
+            return [dict(zip(names, row)) for row in cursor.fetchall()]
+
+
+def format_rows(rows: List[Dict[str, Any]]) -> str:
+    """
+    Formats the query results as the text table.
+    :param rows: results of the query
+    :return: table with the header, floats are rounded
+    """
+    if not rows:
+        return 'No tests found.'
+    lines = [list(rows[0])] + [[_format_value(value) for value in row.values()] for row in rows]
+    widths = [max(len(line[i]) for line in lines) for i in range(len(lines[0]))]
+    return '\n'.join('  '.join(value.ljust(width) for value, width in zip(line, widths)).rstrip() for line in lines)
+
+
+def _format_value(value: Optional[Any]) -> str:
+    if isinstance(value, float):
+        return f'{value:.3f}'
+    return '' if value is None else str(value)
@@ -1,4 +1,6 @@
 import glob
+from queue import Queue, Empty
+from threading import Thread, Event
 from datetime import datetime
 from collections.abc import Set, Mapping
 from typing import Any, Iterable, Callable
@@ -70,6 +72,48 @@ class FakePoolExecutor:
         pass
 
 
+def prefetch(iterable: Iterable, size: int) -> Iterable:
+    """
+    Reads the iterable at the background thread into the bounded queue, while the values are consumed.
+    The reading thread waits if the queue is full, so no more than 'size' values are read ahead.
+    Exception raised by the iterable is raised to the consumer after all values read before it.
+
+    :param iterable: any iterable
+    :param size: max number of the values read ahead
+    :return: generator
+    """
+    queue = Queue(maxsize=size)
+    stopped = Event()
+    end = object()
+
+    def produce():
+        try:
+            for value in iterable:
+                queue.put((value, None))
+                if stopped.is_set():
+                    return
+            queue.put((end, None))
+        except Exception as e:
+            queue.put((end, e))
+
+    Thread(target=produce, name='Prefetch', daemon=True).start()
+    try:
+        while True:
+            value, exception_ = queue.get()
+            if value is end:
+                if exception_ is not None:
+                    raise exception_
+                return
+            yield value
+    finally:
+        # the consumer has stopped earlier, free the place for the blocked reading thread to let it finish
+        stopped.set()
+        try:
+            queue.get_nowait()
+        except Empty:
+            pass
+
+
 def format_seconds(seconds: float) -> str:
     """
     Formats a time count report string, employing minutes and hours if necessary.
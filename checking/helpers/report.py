@@ -1,11 +1,15 @@
-from os import sep, chdir, mkdir, path
+import json
+import atexit
+from os import sep, makedirs, path
 from sys import _getframe
 from datetime import datetime
-from typing import List, Union
+from typing import Any, Dict, Iterable, List, Set
 
 from checking.helpers.others import is_file_exists
+from checking.helpers.attachments import ATTACHMENTS, Attachment, AttachmentStore
 from checking.classes.basic_test import Test
 from checking.classes.basic_suite import TestSuite
+from checking.classes.basic_group import TestGroup
 from checking.helpers.exception_traceback import get_trace_filtered_by_filename as filtered
 
 __all__ = [
@@ -16,6 +20,14 @@ __all__ = [
 
 # HTML report output folder
 FOLDER = 'test_results'
+# Report modes: the whole report in one HTML file, the page, which loads the results from the data files by pages,
+# or the same page, which data files are written while the suite runs (see ReportListener)
+REPORT_MODES = ('inline', 'paged', 'incremental')
+# Number of the tests in one data file of the paged report
+PAGE_SIZE = 500
+# Storage of the images, attached to the tests, the files are written only if the run makes the report
+store = AttachmentStore(f'{FOLDER}{sep}{ATTACHMENTS}', enabled=False)
+atexit.register(store.flush)
 
 
 def add_text(name: str, value: str):
@@ -32,15 +44,17 @@ def add_text(name: str, value: str):
 def add_img(name: str, bytes_: bytes):
     """
     Convenience wrapper for **_add_to_test()**, handles binary (image) data.
+    The image is stored once in the attachments folder of the report (at the background thread), the test keeps
+    only the hash of its content.
 
     :param name: image parameter name
     :param bytes_: image parameter data
     :return: None
     """
-    _add_to_test(name, bytes_)
+    _add_to_test(name, store.put(bytes_))
 
 
-def _add_to_test(name: str, value: Union[bytes, str]):
+def _add_to_test(name: str, value: str):
     """
     Helper, locates the current test instance by searching the last five stack frames,
     then adds the specified report parameter data to the located test instance.
@@ -54,11 +68,11 @@ def _add_to_test(name: str, value: Union[bytes, str]):
         for _ in range(5):
             frame = _getframe(_)
             current_test = frame.f_locals.get('self')
-            if current_test:
-                if type(value) is bytes:
-                    current_test.report_params[value] = str(name)
-                else:
-                    current_test.report_params[str(name)] = str(value)
+            if isinstance(current_test, Test):
+                # attachments are kept as they are (hashes of the content)
+                text = not isinstance(value, Attachment)
+                key = _free_key(current_test.report_params, str(name), text)
+                current_test.report_params[key] = str(value) if text else value
                 break
     except ValueError:
         pass    # ran out of stack frames, ignore the error and delete the frame reference
@@ -66,56 +80,101 @@ def _add_to_test(name: str, value: Union[bytes, str]):
         del frame
 
 
-def generate(test_suite: TestSuite):
+def _free_key(params: dict, name: str, text: bool) -> str:
+    """
+    Helper, returns the name of the parameter, which is not used yet ('name', 'name (2)', 'name (3)', ...), so the
+    images of the same name are all kept. The text replaces the text of the same name, but not the image.
+    """
+    key, number = name, 1
+    while key in params and not (text and not isinstance(params[key], Attachment)):
+        number += 1
+        key = f'{name} ({number})'
+    return key
+
+
+def generate(test_suite: TestSuite, mode: str = 'inline'):
     """
     Generates an HTML report containing the test suite execution results.
 
     :param test_suite: TestSuite instance to build the report for
+    :param mode: 'inline' - all results are in the index.html file, 'paged' - the results are written to the compact
+        data files (PAGE_SIZE tests each) and the page loads and shows them one by one, so the report of any size
+        is generated and opened in the same time ('incremental' is the same, it is written by ReportListener while
+        the suite runs)
+    :return: None
+    """
+    paged = mode != 'inline'
+    # the images of the run, which was started without the report, are written now
+    store.enable()
+    prepare_folder('index_paged.html' if paged else 'index_real.html')
+    if paged:
+        _generate_paged(test_suite)
+    else:
+        _write_file(_generate_html(test_suite))
+    store.remove_unused(attachments_of(test.report_params for group in test_suite.groups.values()
+                                       for test in group.test_results))
+
+
+def attachments_of(report_params: Iterable[Dict[str, Any]]) -> Set[str]:
+    """
+    Returns the hashes of the attachments of the tests.
+
+    :param report_params: report parameters of the tests
+    :return: set of the hashes
+    """
+    return {value for params in report_params for value in params.values() if isinstance(value, Attachment)}
+
+
+def prepare_folder(template_name: str):
+    """
+    Creates the report folder and copies the template (as index.html) and styles to it.
+
+    :param template_name: name of the template file
     :return: None
     """
     path_to_template = is_file_exists.__globals__['__spec__'].origin
-    full_path = path.join(path.split(path_to_template)[0], 'index_real.html')
+    full_path = path.join(path.split(path_to_template)[0], template_name)
     css_path = path.join(path.split(path_to_template)[0], 'materialize.css')
     roboto_path = path.join(path.split(path_to_template)[0], 'roboto.css')
-    if not is_file_exists(FOLDER):
-        mkdir(FOLDER)
-        chdir(FOLDER)
-        if not is_file_exists('css'):
-            mkdir('css')
-        chdir('..')
+    # no chdir here, the incremental report is written at the background thread, while the tests run
+    makedirs(f'{FOLDER}{sep}css', exist_ok=True)
     with open(f'{FOLDER}{sep}index.html', 'wt') as file, open(full_path) as template:
         file.write(template.read())
     with open(f'{FOLDER}{sep}css{sep}materialize.css', 'wt') as file, open(css_path) as template:
         file.write(template.read())
     with open(f'{FOLDER}{sep}css{sep}roboto.css', 'wt') as file, open(roboto_path) as template:
         file.write(template.read())
-    html = _generate_html(test_suite)
-    _write_file(html)
 
 
-def _create_info(html: str, suite: TestSuite) -> str:
+def create_info(html: str, suite: TestSuite) -> str:
     """
-    Helper, generates the report header (info section).
+    Generates the report header (info section), also used by ReportListener while the suite runs.
 
     :param html: html report string
     :param suite: TestSuite instance to generate the report for
     :return: HTML string with the added report header
     """
     per_col = '#2e7d32'
-    percent = len(suite.success()) / (suite.tests_count() / 100) if suite.tests_count() else 0.0
+    percent = suite.results_count('success') / (suite.tests_count() / 100) if suite.tests_count() else 0.0
     if percent < 99:
         per_col = '#ff6f00'
     if percent < 75:
         per_col = '#d50000'
     start = datetime.fromtimestamp(suite.timer.start_time).strftime('%Y-%m-%d %H:%M:%S')
+    if suite.timer.end_time < suite.timer.start_time:
+        # the report is written while the suite runs
+        return html.replace('#total_time', f'not finished (started at {start})').replace('#percent', '-'). \
+            replace('#suite_name', suite.name).replace('#total_groups', str(len(suite.groups))). \
+            replace('#total_tests', str(suite.tests_count())).replace('#success_tests', '-'). \
+            replace('#failed_tests', '-').replace('#broken_tests', '-').replace('#ignored_tests', '-')
     end = datetime.fromtimestamp(suite.timer.end_time).strftime('%Y-%m-%d %H:%M:%S')
     html = html.replace('#suite_name', suite.name). \
         replace('#total_groups', str(len(suite.groups))). \
         replace('#total_tests', str(suite.tests_count())). \
-        replace('#success_tests', str(len(suite.success()))). \
-        replace('#failed_tests', str(len(suite.failed()))). \
-        replace('#broken_tests', str(len(suite.broken()))). \
-        replace('#ignored_tests', str(len(suite.ignored()))). \
+        replace('#success_tests', str(suite.results_count('success'))). \
+        replace('#failed_tests', str(suite.results_count('failed'))). \
+        replace('#broken_tests', str(suite.results_count('broken'))). \
+        replace('#ignored_tests', str(suite.results_count('ignored'))). \
         replace('#percent', f"<b style='color: {per_col}'>0.0 %</b>"). \
         replace('#total_time', f"{suite.suite_duration():.2} seconds ({start} - {end})")
     return html
@@ -130,7 +189,7 @@ def _generate_html(test_suite: TestSuite) -> List[str]:
     """
     with open(f'{FOLDER}{sep}index.html') as template:
         base = ''.join(template.readlines())
-    base = _create_info(base, test_suite)
+    base = create_info(base, test_suite)
     html_lines = [base, ]
     if test_suite.is_empty():
         html_lines.append("<div id='empty'>No tests found in the suite!</div>\n")
@@ -138,15 +197,18 @@ def _generate_html(test_suite: TestSuite) -> List[str]:
         return html_lines
     count = 1
     for group in test_suite.groups:
-        group_time = float(sum(t.duration() for t in test_suite.groups.get(group).test_results))
+        group_time = float(test_suite.groups.get(group).results_duration())
         results = test_suite.groups.get(group).test_results
-        succ = len(test_suite.groups.get(group).tests_by_status('success'))
+        succ = test_suite.groups.get(group).results_count('success')
         html_lines.append(
             f"<h4 id='id_g_{count}' style='cursor: pointer;'>Group '{group}' (elapsed {group_time:.2} seconds), "
-            f"succeeded tests {succ}/{len(results)}:\n"
+            f"succeeded tests {succ}/{test_suite.groups.get(group).results_count()}:\n"
             f"    <script>document.querySelector('#id_g_{count}')."
             f"addEventListener('click', opclose_sibling('#id_g_{count}'))</script>\n</h4>\n"
             f"<ol style='display: none;'>\n")
+        summary = test_suite.groups.get(group).summary
+        if summary is not None and summary.count:
+            html_lines.append(f"\t<p>Passed tests (not listed): {summary.count}, durations: {str(summary).replace('<', '&lt;')}</p>\n")
         for test in results:
             _add_test_info(test, html_lines, count)
             count += 1
@@ -156,6 +218,82 @@ def _generate_html(test_suite: TestSuite) -> List[str]:
     return html_lines
 
 
+def _generate_paged(test_suite: TestSuite):
+    """
+    Helper, writes the results to the data files of the paged report by PAGE_SIZE tests and the index of groups,
+    only the info header is added to the index.html file.
+
+    :param test_suite: TestSuite instance to generate the report for
+    :return: None
+    """
+    with open(f'{FOLDER}{sep}index.html') as template:
+        base = template.read()
+    _write_file([create_info(base, test_suite)])
+    makedirs(f'{FOLDER}{sep}data', exist_ok=True)
+    groups = []
+    page = []
+    pages = 0
+    count = 0
+    for name, group in test_suite.groups.items():
+        groups.append(paged_group_record(name, group, count))
+        for test in group.test_results:
+            count += 1
+            page.append(paged_test_record(test, len(groups) - 1))
+            if len(page) == PAGE_SIZE:
+                write_data(f'page_{pages}', page)
+                pages += 1
+                page = []
+    if page:
+        write_data(f'page_{pages}', page)
+        pages += 1
+    write_data('index', {'groups': groups, 'pages': pages, 'page_size': PAGE_SIZE, 'tests': count})
+
+
+def paged_group_record(name: str, group: TestGroup, first: int) -> Dict[str, Any]:
+    """
+    Returns the record of the test group for the index of the paged report.
+
+    :param name: name of the group
+    :param group: TestGroup instance
+    :param first: number of the tests of the report before the first test of the group
+    :return: dict, which is used by the page script
+    """
+    summary = group.summary
+    summary_text = f'Passed tests (not listed): {summary.count}, durations: {summary}' \
+        if summary is not None and summary.count else None
+    return {'name': name, 'duration': group.results_duration(), 'success': group.results_count('success'),
+            'total': group.results_count(), 'first': first, 'summary': summary_text}
+
+
+def paged_test_record(test: Test, group: int) -> Dict[str, Any]:
+    """
+    Returns the compact record of the test for the data file of the paged report.
+
+    :param test: Test instance to generate the record for
+    :param group: index of the test group in the report index
+    :return: dict with the short keys, which are used by the page script
+    """
+    params = [(key, None, value.file_name()) if isinstance(value, Attachment) else (key, value, None)
+              for key, value in test.report_params.items()]
+    return {'g': group, 'n': test.name, 'a': str(test.argument) if test.provider else None, 's': test.status,
+            'd': max(test.duration(), 0.0) if test.timer.start_time >= 0 else 0.0, 'ds': test.description, 'rt': test.retries,
+            'r': None if test.reason is None else str(test.reason),
+            't': None if test.reason is None else filtered(test.reason), 'p': params}
+
+
+def write_data(name: str, value: Any):
+    """
+    Writes the data file of the paged report. The data is wrapped into the script call, so the page loads it
+    by the script tag, which works for the local files too (unlike the requests for JSON).
+
+    :param name: name of the data file (without extension)
+    :param value: JSON-serializable data
+    :return: None
+    """
+    with open(f'{FOLDER}{sep}data{sep}{name}.js', 'wt', encoding='utf-8') as file:
+        file.write(f"report_data('{name}', {json.dumps(value, separators=(',', ':'), default=str)});\n")
+
+
 def _write_file(lines: List[str]):
     """
     Helper, writes a list of strings to report's index.html file.
@@ -189,7 +327,7 @@ def _add_test_info(test: Test, lines: List[str], count: int):
     :param count: test case id number to use in the HTML tag
     :return: None
     """
-    time_ = 0.0 if test.duration() < 0.01 else test.duration()
+    time_ = 0.0 if test.timer.start_time < 0 or test.duration() < 0.01 else test.duration()
     add_ = f'[{test.argument}]' if test.provider else ''
     traceback = '' if test.reason is None else ''.join([f"<p>{_}</p>" for _ in filtered(test.reason).split('\n')])
     st_col = '#2e7d32'
@@ -199,7 +337,7 @@ def _add_test_info(test: Test, lines: List[str], count: int):
         st_col = '#d50000'
     if test.status == 'ignored':
         st_col = 'grey'
-    rep_params = _get_rep_params(test, count)
+    rep_params = _get_rep_params(test)
     lines.append(
         f"\t<li id='id_{count}' style='cursor: pointer;'>Test '{test.name}' {add_}: elapsed time {time_:.2} seconds, "
         f"status <b style='color:{st_col}'>{test.status}</b>\n"
@@ -215,23 +353,20 @@ def _add_test_info(test: Test, lines: List[str], count: int):
         f"\t\t</div>\n\t</li>\n")
 
 
-def _get_rep_params(test: Test, count: int) -> str:
+def _get_rep_params(test: Test) -> str:
     """
     Helper, adds additional data (text or image to the test's HTML string.
 
     :param test: Test instance to generate info for
-    :param count: test case id number to use in the HTML tags and image file names.
     :return: test case additional info HTML string
     """
     rep_params = ''
     if not test.report_params:
         return ''
     for key, value in test.report_params.items():
-        if type(key) is str:
-            rep_params += f"\t\t\t<p>Report parameter <b>'{key}'</b>: {value}</p>\n"
+        if isinstance(value, Attachment):
+            rep_params += f"\t\t\t<p>Report parameter <b>'{key}'</b>:</p>\n\t\t\t" \
+                          f"<img src='{value.file_name()}' alt='{key}'>\n"
         else:
-            with open(f'{FOLDER}{sep}test_id_count_{count}.png', 'wb') as f:
-                f.write(key)
-            rep_params += f"\t\t\t<p>Report parameter <b>'{value}'</b>:</p>\n\t\t\t" \
-                          f"<img src='test_id_count_{count}.png' alt='{value}'>\n"
+            rep_params += f"\t\t\t<p>Report parameter <b>'{key}'</b>: {value}</p>\n"
     return rep_params
@@ -0,0 +1,241 @@
+import gzip
+import json
+import pickle
+import builtins
+from typing import Any, Dict, Iterable, Tuple, Optional
+
+from checking import exceptions
+from checking.classes.basic_test import Test
+from checking.classes.basic_suite import TestSuite
+from checking.exceptions import TestBrokenException
+from checking.helpers.others import fake
+from checking.helpers.attachments import Attachment
+from checking.helpers.exception_traceback import get_trace, get_trace_filtered_by_filename
+
+
+def key_of_test(test: Test) -> Tuple[str, str]:
+    """
+    Builds the key to find the test definition in another process, where the same test modules were imported.
+    The module name of the script, launched as __main__, is normalized, because worker processes import it as
+    __mp_main__.
+
+    :param test: Test instance
+    :return: pair of the test function module and qualified name
+    """
+    module = test.test.__module__
+    if module == '__mp_main__':
+        module = '__main__'
+    return module, test.test.__qualname__
+
+
+def is_picklable(obj: Any) -> bool:
+    """
+    Checks if an object survives the pickle round trip.
+
+    :param obj: object to check
+    :return: True if the object can be pickled and unpickled, False otherwise
+    """
+    try:
+        pickle.loads(pickle.dumps(obj))
+        return True
+    except Exception:
+        return False
+
+
+def pack_exception(exception: Optional[BaseException]) -> Optional[BaseException]:
+    """
+    Prepares the exception to be sent to another process. The traceback can not be pickled, so the parsed traceback
+    is saved to the 'remote_trace' attribute of the exception, which is used by the traceback helpers.
+    Exceptions, which can not be pickled, are replaced with TestBrokenException (or AssertionError for failed asserts)
+    with the same message.
+
+    :param exception: exception to pack
+    :return: picklable exception or None
+    """
+    if exception is None:
+        return None
+    trace = get_trace(exception)
+    if not is_picklable(exception):
+        message = f'{type(exception).__name__}: {exception}'
+        exception = AssertionError(message) if isinstance(exception, AssertionError) else TestBrokenException(message)
+    try:
+        exception.remote_trace = trace
+    except AttributeError:
+        pass  # exceptions with __slots__ are sent without traceback
+    return exception
+
+
+def pack_test(test: Test) -> Dict:
+    """
+    Collects the test execution results to send them to another process.
+    Arguments, which can not be pickled, are replaced by their string representation.
+
+    :param test: Test instance
+    :return: dict of the execution results
+    """
+    argument = test.argument if is_picklable(test.argument) else test.str_arg
+    return {'key': key_of_test(test), 'name': test.name, 'argument': argument, 'str_arg': test.str_arg,
+            'status': test.status, 'reason': pack_exception(test.reason), 'report_params': test.report_params,
+            'timer': (test.timer.start_time, test.timer.end_time, test.timer.duration)}
+
+
+def unpack_test(data: Dict, definition: Test) -> Test:
+    """
+    Restores the test execution results, received from another process, as a clone of the test definition.
+
+    :param data: dict of the execution results, created by pack_test
+    :param definition: Test instance with the same key in the current process
+    :return: Test instance
+    """
+    test = definition.clone()
+    test.name = data['name']
+    test.argument = data['argument']
+    test.str_arg = data['str_arg']
+    test.status = data['status']
+    test.reason = data['reason']
+    test.report_params = data['report_params']
+    test.timer.start_time, test.timer.end_time, test.timer.duration = data['timer']
+    return test
+
+
+def result_record(test: Test, message: str = '') -> Dict[str, Any]:
+    """
+    Builds the JSON-serializable record of the test execution, which is saved to the results file (see
+    JsonLinesListener) and restored by restore_test to build the report later.
+
+    :param test: Test instance
+    :param message: reason of the ignored test, which has no exception
+    :return: dict of the execution results
+    """
+    reason = test.reason
+    params = {str(key): str(value) for key, value in test.report_params.items()}
+    attachments = [str(key) for key, value in test.report_params.items() if isinstance(value, Attachment)]
+    return {'type': 'test', 'group': test.group_name, 'name': test.name, 'provider': test.provider,
+            'argument': test.str_arg if test.provider else None, 'status': test.status,
+            'start': test.timer.start_time, 'duration': test.duration(), 'description': test.description,
+            'retries': test.retries, 'message': message or (None if reason is None else str(reason)),
+            'exception': None if reason is None else type(reason).__name__,
+            'traceback': None if reason is None else get_trace_filtered_by_filename(reason),
+            'params': params, 'attachments': attachments}
+
+
+def suite_record(test_suite: TestSuite) -> Dict[str, Any]:
+    """
+    Builds the JSON-serializable record of the suite, which is saved to the end of the results file.
+
+    :param test_suite: TestSuite instance
+    :return: dict of the suite name, timings and counters
+    """
+    record = {'type': 'suite', 'name': test_suite.name, 'start': test_suite.timer.start_time,
+              'end': test_suite.timer.end_time, 'duration': test_suite.suite_duration(),
+              'tests': test_suite.results_count()}
+    for status in ('success', 'failed', 'broken', 'ignored'):
+        record[status] = test_suite.results_count(status)
+    return record
+
+
+def restore_test(record: Dict[str, Any]) -> Test:
+    """
+    Restores the test execution results from the record, built by result_record. The test function is a stub,
+    the exception has the saved traceback.
+
+    :param record: dict of the execution results
+    :return: Test instance
+    """
+    test = Test(record['name'], fake)
+    test.group_name = record['group']
+    test.description = record.get('description')
+    test.provider = record.get('provider')
+    if test.provider:
+        test.argument = test.str_arg = record.get('argument')
+    test.status = record['status']
+    test.retries = record.get('retries', 1)
+    test.reason = _restore_exception(record)
+    attachments = set(record.get('attachments') or ())
+    test.report_params = {key: Attachment(value) if key in attachments else value
+                          for key, value in (record.get('params') or {}).items()}
+    start, duration = record.get('start') or -1, record.get('duration', -1)
+    if start > 0 and duration >= 0:
+        test.timer.start_time, test.timer.end_time, test.timer.duration = start, start + duration, duration
+    return test
+
+
+def _restore_exception(record: Dict[str, Any]) -> Optional[BaseException]:
+    """
+    Restores the exception of the same type (if it is the built-in or the library one) and message, with the saved
+    traceback, or TestBrokenException with the type name in the message.
+    """
+    name = record.get('exception')
+    if not name:
+        return None
+    message = record.get('message') or ''
+    class_ = getattr(builtins, name, None) or getattr(exceptions, name, None)
+    exception = None
+    if isinstance(class_, type) and issubclass(class_, BaseException):
+        try:
+            exception = class_(message)
+        except Exception:
+            pass  # the exception needs other arguments
+    if exception is None:
+        exception = TestBrokenException(f'{name}: {message}')
+    lines = (record.get('traceback') or '').split('\n')
+    exception.remote_trace = list(zip(lines[::2], lines[1::2]))
+    return exception
+
+
+def read_records(file_name: str) -> Iterable[Dict[str, Any]]:
+    """
+    Reads the records of the results file (JSON Lines, gzipped if the name ends with .gz). The last line of the file
+    of the killed run can be cut, such lines are skipped.
+
+    :param file_name: name of the results file
+    :return: generator of the records
+    """
+    opener = gzip.open if file_name.endswith('.gz') else open
+    with opener(file_name, 'rt', encoding='utf-8') as file:
+        for line in file:
+            try:
+                yield json.loads(line)
+            except ValueError:
+                continue
+
+
+def load_results(file_names: Iterable[str], test_suite: TestSuite):
+    """
+    Loads the test results from the results files to the test suite, the results of several files (e.g. of the
+    shards of the suite) are merged: groups with the same names are joined, the suite takes the earliest start and
+    the latest end.
+
+    :param file_names: names of the results files
+    :param test_suite: TestSuite instance to load the results to
+    :return: None
+    """
+    names, starts, ends = [], [], []
+    definitions = set()
+    for file_name in file_names:
+        for record in read_records(file_name):
+            if record.get('type') == 'suite':
+                names.append(record['name'])
+                starts.append(record.get('start', -1))
+                ends.append(record.get('end', -1))
+            elif record.get('type') == 'test':
+                test = restore_test(record)
+                group = test_suite.get_or_create(test.group_name)
+                # the first execution of the test is its definition, so the group is not empty
+                if (test.group_name, test.name) in definitions:
+                    test.set_group(group)
+                else:
+                    definitions.add((test.group_name, test.name))
+                    group.add_test(test)
+                group.add_result(test.result())
+                # the file of the interrupted run has no suite record
+                if test.timer.start_time > 0:
+                    starts.append(test.timer.start_time)
+                    ends.append(test.timer.end_time)
+    if names:
+        test_suite.name = names[0]
+    starts = [start for start in starts if start > 0]
+    ends = [end for end in ends if end > 0]
+    if starts and ends:
+        test_suite.timer.start_time, test_suite.timer.end_time = min(starts), max(ends)
+        test_suite.timer.duration = test_suite.timer.end_time - test_suite.timer.start_time
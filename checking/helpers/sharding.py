@@ -0,0 +1,72 @@
+from zlib import crc32
+from typing import Dict, Optional, Tuple
+
+from checking.classes.basic_suite import TestSuite
+from checking.helpers.history import DurationHistory
+
+
+def parse_shard(shard: str) -> Tuple[int, int]:
+    """
+    Parses the shard parameter.
+    :param shard: string like 'K/N', where K is the number of the shard (starting from 1) and N is the number of shards
+    :return: tuple (K, N)
+    :raise ValueError: if the parameter is invalid
+    """
+    try:
+        index, total = (int(part) for part in shard.split('/'))
+    except ValueError:
+        raise ValueError(f'Shard parameter must be like "K/N" (e.g. "1/4"), but got "{shard}"!') from None
+    if total < 1 or not 1 <= index <= total:
+        raise ValueError(f'Shard number must be from 1 to {total}, but got "{shard}"!')
+    return index, total
+
+
+def split(weights: Dict[str, Optional[float]], total: int) -> Dict[str, int]:
+    """
+    Splits the items to the shards deterministically. If any weight is known, items are distributed greedily,
+    the heaviest first, to the least loaded shard (items without weight get the mean one), so shards have about
+    the same duration. Otherwise the shard is chosen by the stable hash of the item key.
+    :param weights: expected durations by the item keys, None if unknown
+    :param total: number of shards
+    :return: number of the shard (starting from 0) by the item key
+    """
+    known = [weight for weight in weights.values() if weight is not None]
+    if not known:
+        return {key: crc32(key.encode('utf-8')) % total for key in weights}
+    mean = sum(known) / len(known)
+    items = sorted(((mean if weight is None else weight, key) for key, weight in weights.items()),
+                   key=lambda item: (-item[0], item[1]))
+    loads = [0.0] * total
+    result = {}
+    for weight, key in items:
+        shard = loads.index(min(loads))
+        loads[shard] += weight
+        result[key] = shard
+    return result
+
+
+def filter_shard(test_suite: TestSuite, shard: str, history: Optional[DurationHistory] = None):
+    """
+    Leaves in the test suite only the part of it for the specified shard. Whole groups are split if there are
+    at least as many groups as shards, otherwise the tests of the groups are split.
+    All shards must use the same suite (and the same history file) to get the disjoint parts.
+    :param test_suite: TestSuite instance
+    :param shard: string like 'K/N'
+    :param history: durations of the previous runs
+    :return: None
+    """
+    index, total = parse_shard(shard)
+    history = history or DurationHistory('')
+    groups = [group for group in test_suite.groups.values() if group.tests]
+    if len(groups) >= total:
+        shards = split({group.name: history.expected(group) for group in groups}, total)
+        test_suite.filter_groups([name for name, number in shards.items() if number == index - 1])
+        return
+    keys: Dict[str, Optional[float]] = {}
+    for group in groups:
+        for position, test in enumerate(group.tests):
+            keys[f'{group.name}::{test.name}::{position}'] = history.tests.get(f'{group.name}::{test.name}')
+    shards = split(keys, total)
+    for group in groups:
+        group.tests = [test for position, test in enumerate(group.tests)
+                       if shards[f'{group.name}::{test.name}::{position}'] == index - 1]
@@ -1,22 +1,40 @@
+import os
+import sys
+import asyncio
+from collections import deque
+from itertools import groupby
+from threading import Event, local
+from inspect import iscoroutine, iscoroutinefunction
 from concurrent.futures import ThreadPoolExecutor
-from typing import Callable, Any, Dict, List, Union, Optional
+from typing import Callable, Any, Dict, Iterable, List, Set, Union, Optional
 
 from .classes.common import Common
 from .helpers.others import fake
 from .classes.basic_test import Test
-from .helpers.report import generate
+from .helpers.report import generate, store as attachment_store
+from .helpers.sharding import filter_shard
+from .helpers.history import DurationHistory
 from .classes.basic_case import TestCase
 from .classes.basic_suite import TestSuite
 from .classes.basic_group import TestGroup
-from .helpers.others import FakePoolExecutor
-from .classes.listeners.basic import Listener
+from .helpers.others import FakePoolExecutor, prefetch
+from .classes.listeners.basic import Listener, HOOKS
+from .classes.provider_cache import source_key
+from .classes.result_summary import ResultSummary
+from .classes.process_pool import ProcessPool, RESULT_HOOKS, run_isolated
 from .classes.exc_thread import run_with_timeout
+from .classes.event_loop import run_coroutine, stop_event_loop, iterate
 from .classes.listeners.default import DefaultListener
+from .classes.listeners.dispatcher import AsyncListener
+from .classes.listeners.report_writer import ReportListener
 from .helpers.exception_traceback import exception_with_assert
-from .exceptions import UnknownProviderName, TestIgnoredException, OnlyIfFailedException, SkipTestException
+from .exceptions import UnknownProviderName, TestIgnoredException, OnlyIfFailedException, SkipTestException, \
+    TestBrokenException
 
 # Holds the reference to the global test listener object
 _listener: Listener
+# Names of the hooks of the listener to call, other hooks do nothing
+_listener_hooks: Set[str] = set(HOOKS)
 # Test suite execution control flag. Is set to False when max fail count is reached, the test run is then terminated.
 _can_run = True
 # Max number of failed tests for the whole suite. If 0, the execution is not interrupted until the end of all tests.
@@ -25,12 +43,22 @@ _max_fail = 0
 _actual_failed_count = 0
 # Stores the shared parameters and common functions for the whole test suite.
 common: Common = Common()
-
-
-def start(verbose: int = 0, listener: Optional[Listener] = None, groups: Optional[List[str]] = None,
+# Thread pool to run the tests of the parallel groups and the parallel provider cases, is None if there are no such
+# groups and providers or only one thread is used.
+_tests_pool: Optional[ThreadPoolExecutor] = None
+# Number of the threads of the tests thread pool
+_tests_workers = 0
+# Flag 'in_pool' of the thread is set when the thread works for the tests thread pool
+_pool_thread = local()
+# Max number of the provider cases, sent to the tests thread pool at once
+PROVIDER_CHUNK_SIZE = 64
+
+
+def start(verbose: int = 0, listener: Optional[Union[Listener, List[Listener]]] = None, groups: Optional[List[str]] = None,
           params: Optional[Dict[str, Any]] = None, threads: int = 1, suite_name: str = 'Default Test Suite',
           dry_run: bool = False, filter_by_name: Optional[str] = None, random_order: bool = False,
-          max_fail: int = 0, generate_report: bool = False, **kwargs):
+          max_fail: int = 0, generate_report: bool = False, processes: int = 0, history_file: str = '',
+          shard: str = '', cache_dir: str = '', results: str = 'all', report_mode: str = 'inline', **kwargs):
     """
     Launches the test suite.
 
@@ -42,10 +70,13 @@ def start(verbose: int = 0, listener: Optional[Listener] = None, groups: Optiona
         reset to 0 if any other value
     :param listener: test listener instance, defaults to DefaultListener.
         If provided, 'verbose' parameter is ignored and verbose setting from the provided listener is used.
+        If the list of listeners is provided, the events are delivered to all of them at the background threads
+        (see AsyncListener), so the listeners do not slow the tests down.
     :param groups: list of the test group names to execute
     :param params: dict of parameters shared for all tests
     :param threads: number of threads to run tests in.
-        Each test group can be executed in a separate thread.
+        Each test group can be executed in a separate thread, tests of the parallel groups are executed in the
+        separate threads too.
         WARNING! This is an experimental feature which should be used for lightweight tests,
         not performing resource-intensive calculations (not CPU-bound).
         Use threads parameter to run I/O-bound tests (tests using database, file system, network, etc.).
@@ -59,6 +90,31 @@ def start(verbose: int = 0, listener: Optional[Listener] = None, groups: Optiona
     :param random_order: if specified, runs tests within each group in random order
     :param max_fail: if greater than 0, halts the suite execution when number of failed tests reaches to this parameter
     :param generate_report: if specified, creates an HTML report containing the test run results in the test folder
+    :param processes: number of worker processes to run tests in, takes precedence over the threads parameter.
+        Each test group is executed in a separate process, which imports the modules with tests by itself,
+        the results are sent back to the main process. Use this parameter to run CPU-bound tests.
+        Fixtures of the suite are executed in the main process and only picklable common parameters are available
+        to the workers. Ignored at dry run and on Python 3.6 (the process pool needs Python 3.7 or later).
+    :param history_file: if specified, durations of the tests and groups are saved to this JSON file after the run.
+        When the file exists, test groups are handed out to the threads (processes) longest-expected-first, so the
+        longest groups do not start at the end of the run. At dry run it is only read (to split the suite by shard),
+        the durations are not saved.
+    :param shard: if specified (like 'K/N', e.g. '2/4'), runs only the K-th of N parts of the suite, to split the suite
+        across several machines. Parts are the same on every machine (for the same tests and history file): groups
+        (or tests, if there are fewer groups than parts) are split by their durations from the history file,
+        or by the stable hash of their names if there is no history.
+    :param cache_dir: if specified, values of the cached providers are saved to this folder and are loaded from it
+        by the next runs, while the provider code and its input files (e.g. file of DATA_FILE) are not changed
+    :param results: which results are kept:
+        'all' - records of all tests (default)
+        'summary' - records of the failed, broken and ignored tests only, passed tests are folded into the counters
+        and the histogram of durations, so the memory does not grow with the number of passed tests
+    :param report_mode: how the HTML report is generated (if generate_report is specified):
+        'inline' - all results are in one HTML file (default)
+        'paged' - the results are written to the compact data files, which the page loads by pages, use it for big
+        suites, so the report is generated and opened in the same time for any number of tests
+        'incremental' - same as 'paged', but the data files are written while the suite runs (see ReportListener),
+        so only the index is written at the end and the report of the crashed run keeps the finished tests
     :return: None
     """
     verbose = 0 if verbose not in range(4) else verbose
@@ -67,32 +123,53 @@ def start(verbose: int = 0, listener: Optional[Listener] = None, groups: Optiona
         _max_fail = max_fail
     # use specified listener if provided
     global _listener
+    if isinstance(listener, (list, tuple)):
+        listener = AsyncListener(*listener) if listener else None
     _listener = listener if listener else DefaultListener(verbose)
+    # the report is written by the listener at the background thread, while the suite runs
+    if generate_report and report_mode == 'incremental':
+        _listener = AsyncListener(_listener, ReportListener())
+        generate_report = False
+    # hooks, which the listener does not override, are not called at all
+    global _listener_hooks
+    _listener_hooks = _listener.overridden_hooks()
     test_suite = TestSuite.get_instance()
     test_suite.name = suite_name
     if groups:
         test_suite.filter_groups(groups)
     if filter_by_name:
         test_suite.filter_tests(filter_by_name)
+    history = DurationHistory(history_file) if history_file else None
+    if shard:
+        filter_shard(test_suite, shard, history)
     # run the listener hooks and halt if there are no tests found
     if test_suite.is_empty():
         _listener.on_empty_suite(test_suite)
         _listener.on_suite_ends(test_suite)
         if generate_report:
-            generate(test_suite)
+            generate(test_suite, report_mode)
         return
     if params:
         common.update(params)
+    for group in test_suite.groups.values():
+        group.summary = ResultSummary() if results == 'summary' else None
+    if cache_dir:
+        os.makedirs(cache_dir, exist_ok=True)
+    test_suite.cache.directory = cache_dir or None
     if threads < 1:
         threads = 1
-    # use one thread if there's only one test group
-    if threads > 1 and len(test_suite.groups) <= 1:
+    # use one thread if there's only one test group, which tests are not run in parallel
+    if threads > 1 and len(test_suite.groups) <= 1 and not _has_parallel_tests(test_suite):
         threads = 1
+    # same for processes, also the stub functions of the dry run can not be found by the worker processes
+    if processes < 2 or len(test_suite.groups) <= 1 or dry_run or sys.version_info < (3, 7):
+        processes = 0
     if dry_run:
         _dry_run(test_suite)
     # check if all provider names are resolved
     _check_data_providers(test_suite)
-    _run(test_suite, threads, random_order, generate_report)
+    # durations of the stub functions of the dry run are not saved
+    _run(test_suite, threads, random_order, generate_report, processes, None if dry_run else history, report_mode)
 
 
 def _dry_run(test_suite: TestSuite):
@@ -115,17 +192,19 @@ def _dry_run(test_suite: TestSuite):
             test.test = fake
 
 
-def _run(test_suite: TestSuite, threads: int = 1, random_order: bool = False, generate_report: bool = False):
+def _run(test_suite: TestSuite, threads: int = 1, random_order: bool = False, generate_report: bool = False,
+         processes: int = 0, history: Optional[DurationHistory] = None, report_mode: str = 'inline'):
     """
     Helper, executes a test suite with validated parameters.
     """
+    global _tests_pool, _tests_workers
     for group in test_suite.groups.values():
         if random_order:
             group.shuffle_tests()
         else:
             group.sort_test_by_priority()
-    # use fake thread pool for 1 thread
-    pool = FakePoolExecutor() if threads <= 1 else ThreadPoolExecutor(max_workers=threads)
+    # the images are written to the disk only if the report (or the listener) refers to them
+    attachment_store.start_run(generate_report or _listener.needs_attachments())
     test_suite.start_suite()
     # run listener hook
     _listener.on_suite_starts(test_suite)
@@ -134,7 +213,15 @@ def _run(test_suite: TestSuite, threads: int = 1, random_order: bool = False, ge
         # 'after*' fixtures will be executed respecting the fixture's 'always_run' parameter
         if not _run_before_suite(test_suite):
             return
-        for group in test_suite.groups.values():
+        pool = _create_pool(test_suite, threads, processes)
+        if threads > 1 and not processes and _has_parallel_tests(test_suite):
+            _tests_pool = ThreadPoolExecutor(max_workers=threads, thread_name_prefix='Tests')
+            _tests_workers = threads
+        groups = test_suite.groups.values()
+        # the longest groups go first, so idle threads (processes) take the short ones at the end of the run
+        if history and (threads > 1 or processes):
+            groups = history.longest_first(groups)
+        for group in groups:
             # skip empty test groups
             if not group.tests:
                 continue
@@ -142,11 +229,70 @@ def _run(test_suite: TestSuite, threads: int = 1, random_order: bool = False, ge
         pool.shutdown(wait=True)
         _run_after(test_suite)
     finally:
+        if _tests_pool:
+            _tests_pool.shutdown(wait=True)
+            _tests_pool = None
+            _tests_workers = 0
+        stop_event_loop()
+        # the attachments are in the report folder before the report is written
+        attachment_store.flush()
         test_suite.stop_suite()
         # run listener hook
         _listener.on_suite_ends(test_suite)
         if generate_report:
-            generate(test_suite)
+            generate(test_suite, report_mode)
+        if history is not None:
+            history.update(test_suite)
+            history.save()
+
+
+def _has_parallel_tests(test_suite: TestSuite) -> bool:
+    """
+    Helper, checks if there are parallel groups or tests with parallel provider cases in the suite.
+
+    :param test_suite: TestSuite instance
+    :return: True if the tests thread pool is needed
+    """
+    for group in test_suite.groups.values():
+        if group.parallel:
+            return True
+        if any(test.provider and (test.parallel or test.provider in test_suite.parallel) for test in group.tests):
+            return True
+    return False
+
+
+def _create_pool(test_suite: TestSuite, threads: int, processes: int):
+    """
+    Helper, creates the pool to run the test groups in.
+    The process pool is created after the 'before_suite' fixtures, so the workers get the actual common parameters.
+
+    :param test_suite: TestSuite instance
+    :param threads: number of threads
+    :param processes: number of processes, takes precedence over threads if greater than 1
+    :return: pool object
+    """
+    if processes > 1:
+        return ProcessPool(processes, test_suite, common.as_dict(), _run_process_event)
+    # use fake thread pool for 1 thread
+    return FakePoolExecutor() if threads <= 1 else ThreadPoolExecutor(max_workers=threads)
+
+
+def _run_process_event(hook_name: str, args: tuple) -> bool:
+    """
+    Helper, handles the listener event of a worker process: puts the finished test to the group results
+    and runs the listener hook.
+
+    :param hook_name: listener hook name
+    :param args: hook arguments
+    :return: False if the suite must be stopped, True otherwise
+    """
+    if hook_name in RESULT_HOOKS:
+        args[0]._put_to_group_results()
+    if hook_name in _listener_hooks:
+        getattr(_listener, hook_name)(*args)
+    if hook_name == 'on_failed':
+        _count_failed()
+    return _can_run
 
 
 def _run_group_before_and_after_at_separate_thread(group: TestGroup):
@@ -189,7 +335,8 @@ def _run_before_group(group: TestGroup) -> bool:
         for test in group.tests:
             test.stop(TestIgnoredException('Before module/group has failed!'))
             # run listener hook
-            _listener.on_ignored(test, 'before module/group')
+            if 'on_ignored' in _listener_hooks:
+                _listener.on_ignored(test, 'before module/group')
         if group.always_run_after:
             _run_after(group)
         return False
@@ -206,40 +353,168 @@ def _run_test_with_provider(test: Test):
     test_suite = TestSuite.get_instance()
     provider = test.provider
     # get provider data from the cache, if present
-    generator = _provider_next(provider) if provider not in test_suite.cache else test_suite.cache[provider]
+    if provider in test_suite.cache:
+        generator = test_suite.cache[provider]
+    elif provider in test_suite.cached:
+        generator = _cache_provider(provider)
+    else:
+        generator = _provider_next(provider)
     try:
         is_any_value_provides = False
-        need_to_cache = provider in test_suite.cached and provider not in test_suite.cache
-        list_of_arguments = []
-        for param in generator:
-            is_any_value_provides = True
-            if not _can_run:
-                break
-            clone = test.clone()
-            clone.argument = param
-            if need_to_cache:
-                list_of_arguments.append(param)
-            is_one_of_before_test_failed = _run_test_with_before_and_after(clone, False)
-            if is_one_of_before_test_failed:
-                # run listener hook
-                _listener.on_before_provider_failed(test, provider)
-                break
+        if _is_parallel_provider(test):
+            is_any_value_provides = _run_provider_cases_in_parallel(test, generator)
+        else:
+            for param in generator:
+                is_any_value_provides = True
+                if not _can_run:
+                    break
+                clone = test.clone()
+                clone.argument = param
+                is_one_of_before_test_failed = _run_test_with_before_and_after(clone, False)
+                if is_one_of_before_test_failed:
+                    # run listener hook
+                    if 'on_before_provider_failed' in _listener_hooks:
+                        _listener.on_before_provider_failed(test, provider)
+                    break
         # ignore tests with empty providers
         if not is_any_value_provides:
             test.stop(TestIgnoredException(f'Provider {test.provider} is empty.'))
             # run listener hook
-            _listener.on_ignored_with_provider(test)
-        else:
-            if need_to_cache:
-                test_suite.cache[provider] = tuple(list_of_arguments)
+            if 'on_ignored_with_provider' in _listener_hooks:
+                _listener.on_ignored_with_provider(test)
     except TypeError as e:
         if 'is not iterable' not in e.args[0]:
-            _listener.on_error_with_provider(provider, e)
+            if 'on_error_with_provider' in _listener_hooks:
+                _listener.on_error_with_provider(provider, e)
             raise
         else:
             test.stop(TestIgnoredException(f'Error using provider {test.provider}.'))
             # run listener hook and ignore the exception
-            _listener.on_ignored_with_provider(test)
+            if 'on_ignored_with_provider' in _listener_hooks:
+                _listener.on_ignored_with_provider(test)
+    finally:
+        # close the generator at once, to release the resources of the provider
+        if hasattr(generator, 'close'):
+            generator.close()
+
+
+def _cache_provider(provider_name: str) -> Iterable:
+    """
+    Helper, yields the cached provider values. At the first call the provider is read to the end and its values are
+    collected to the cache before the first test runs, so the threads, waiting for the values, wait only for the
+    provider, not for the tests of another group. If the persistent cache is used, values are loaded from it when the
+    provider source was not changed, otherwise they are saved to it.
+
+    Values are built once: if another thread builds them now, waits for it and uses its values.
+
+    :param provider_name: provider name
+    :return: generator
+    """
+    cache = TestSuite.get_instance().cache
+    while not cache.begin(provider_name):
+        if provider_name in cache:
+            yield from cache[provider_name]
+            return
+    writer = None
+    try:
+        key = _persistent_key(provider_name)
+        stored = cache.load(provider_name, key) if key else None
+        writer = cache.writer(provider_name, key if stored is None else None)
+        for value in _provider_next(provider_name) if stored is None else stored:
+            writer.append(value)
+        writer.commit()
+    except BaseException:
+        if writer:
+            writer.discard()
+        else:
+            cache.finish(provider_name)
+        raise
+    yield from cache[provider_name]
+
+
+def _persistent_key(provider_name: str) -> Optional[str]:
+    """
+    Helper, returns the key of the provider source for the persistent cache, None if the persistent cache is not used.
+
+    :param provider_name: provider name
+    :return: key or None
+    """
+    test_suite = TestSuite.get_instance()
+    if not test_suite.cache.directory:
+        return None
+    return source_key(test_suite.providers[provider_name][0])
+
+
+def _is_parallel_provider(test: Test) -> bool:
+    """
+    Helper, checks if the provider cases of the test must be run at the tests thread pool. Cases of the tests, which are
+    already running at the pool (tests of the parallel groups), run at the thread of the test, so the pool threads
+    do not wait for each other.
+
+    :param test: Test instance
+    :return: True if the cases must be run in parallel
+    """
+    if not _tests_pool or getattr(_pool_thread, 'in_pool', False):
+        return False
+    return test.parallel or test.provider in TestSuite.get_instance().parallel
+
+
+def _run_provider_cases_in_parallel(test: Test, generator: Any) -> bool:
+    """
+    Helper, sends the provider cases of the test in chunks to the tests thread pool. Chunks grow from 1 case to
+    PROVIDER_CHUNK_SIZE, so short providers are spread over all threads and long ones have low overhead.
+    The provider is read ahead no more than two chunks for each thread.
+    If the 'before_test' fixture of any case fails, no more cases are run.
+
+    :param test: Test instance
+    :param generator: provider values
+    :return: True if the provider has given any value
+    """
+    is_any_value_provides = False
+    before_failed = Event()
+    futures = deque()
+    chunk = []
+    chunk_size = 1
+    for param in generator:
+        is_any_value_provides = True
+        if not _can_run or before_failed.is_set():
+            break
+        clone = test.clone()
+        clone.argument = param
+        chunk.append(clone)
+        if len(chunk) < chunk_size:
+            continue
+        futures.append(_tests_pool.submit(_run_provider_chunk, chunk, before_failed))
+        chunk = []
+        chunk_size = min(chunk_size * 2, PROVIDER_CHUNK_SIZE)
+        while len(futures) > 2 * _tests_workers:
+            futures.popleft().result()
+    if chunk:
+        futures.append(_tests_pool.submit(_run_provider_chunk, chunk, before_failed))
+    for future in futures:
+        future.result()
+    if before_failed.is_set():
+        # run listener hook
+        if 'on_before_provider_failed' in _listener_hooks:
+            _listener.on_before_provider_failed(test, test.provider)
+    return is_any_value_provides
+
+
+def _run_provider_chunk(clones: List[Test], before_failed: Event):
+    """
+    Helper, thread worker, runs the provider cases with the corresponding fixtures one by one.
+
+    :param clones: Test instances with the provider values
+    :param before_failed: is set when the 'before_test' fixture has failed
+    :return: None
+    """
+    _pool_thread.in_pool = True
+    for clone in clones:
+        if not _can_run or before_failed.is_set():
+            return
+        if _run_test_with_before_and_after(clone, False):
+            before_failed.set()
+            return
 
 
 def _run_all_tests_in_group(group: TestGroup):
@@ -249,6 +524,12 @@ def _run_all_tests_in_group(group: TestGroup):
     :param group: TestGroup instance
     :return: None
     """
+    if group.max_concurrency > 1:
+        run_coroutine(_run_all_tests_in_group_async(group))
+        return
+    if group.parallel and _tests_pool:
+        _run_all_tests_in_group_in_parallel(group)
+        return
     is_one_of_before_test_failed = False
     for test in group.tests:
         if not _can_run:
@@ -259,6 +540,40 @@ def _run_all_tests_in_group(group: TestGroup):
             is_one_of_before_test_failed = _run_test_with_before_and_after(test, is_one_of_before_test_failed)
 
 
+def _run_all_tests_in_group_in_parallel(group: TestGroup):
+    """
+    Helper, executes the tests of the group at the tests thread pool. Tests with the same priority run at the same time,
+    the next priority starts when all tests of the previous one have finished.
+
+    :param group: TestGroup instance
+    :return: None
+    """
+    is_one_of_before_test_failed = False
+    for _, tests in groupby(group.tests, key=lambda t: t.priority):
+        if not _can_run:
+            break
+        futures = [_tests_pool.submit(_run_one_test, test, is_one_of_before_test_failed) for test in tests]
+        if any([future.result() for future in futures]):
+            is_one_of_before_test_failed = True
+
+
+def _run_one_test(test: Test, is_before_failed: bool) -> bool:
+    """
+    Helper, thread worker, runs the test (with a provider or not) with the corresponding fixtures.
+
+    :param test: Test instance
+    :param is_before_failed: True if the 'before_test' fixture has failed already
+    :return: True if the 'before_test' fixture has failed, False otherwise
+    """
+    _pool_thread.in_pool = True
+    if not _can_run:
+        return False
+    if test.provider:
+        _run_test_with_provider(test)
+        return False
+    return _run_test_with_before_and_after(test, is_before_failed)
+
+
 def _run_test_with_before_and_after(test: Test, is_before_failed: bool) -> bool:
     """
     Helper, runs a test with the corresponding 'before_test' and 'after_test' fixtures.
@@ -274,7 +589,8 @@ def _run_test_with_before_and_after(test: Test, is_before_failed: bool) -> bool:
     if test.is_before_failed:
         test.stop(TestIgnoredException("''before_test' fixture has failed."))
         # run listener hook
-        _listener.on_ignored(test, 'before test')
+        if 'on_ignored' in _listener_hooks:
+            _listener.on_ignored(test, 'before test')
         return True
     for retry in range(test.retries):
         clone = test.clone()
@@ -290,19 +606,37 @@ def _run_test_with_before_and_after(test: Test, is_before_failed: bool) -> bool:
 def _provider_next(provider_name: str) -> Any:
     """
     Helper, looks up the specified provider function and yields test data from it.
+    Values are read at the background thread if the provider has the prefetch parameter.
     Tries to close a resource after reading the data, if the provider has a 'close' callable attribute.
 
     :param provider_name: provider name
     :return: generator
     """
-    iter_ = TestSuite.get_instance().providers[provider_name][0]()
-    yield from iter_
-    # try-close the resource (e.g. file) if provider was using it
-    if hasattr(iter_, 'close'):
-        try:
+    test_suite = TestSuite.get_instance()
+    iter_ = test_suite.providers[provider_name][0]()
+    values = iterate(iter_)
+    if provider_name in test_suite.prefetch:
+        values = prefetch(values, test_suite.prefetch[provider_name])
+    yield from values
+    _close_provider(provider_name, iter_)
+
+
+def _close_provider(provider_name: str, iter_: Any):
+    """
+    Helper, tries to close the resource (e.g. file or async generator) if provider was using it.
+
+    :param provider_name: provider name
+    :param iter_: object returned by the provider
+    :return: None
+    """
+    try:
+        if hasattr(iter_, 'close'):
             iter_.close()
-        except Exception as ex:
-            # run listener hook and ignore the exception
+        elif hasattr(iter_, 'aclose'):
+            run_coroutine(iter_.aclose())
+    except Exception as ex:
+        # run listener hook and ignore the exception
+        if 'on_error_with_provider' in _listener_hooks:
             _listener.on_error_with_provider(provider_name, exc=ex)
 
 
@@ -314,40 +648,70 @@ def _run_test(test: Test) -> bool:
     :return: True if test succeeds, False otherwise
     """
     # run listener hook
-    _listener.on_test_starts(test)
+    if 'on_test_starts' in _listener_hooks:
+        _listener.on_test_starts(test)
     try:
-        if test.timeout:
+        if test.isolate:
+            run_isolated(test)
+        elif test.timeout:
             run_with_timeout(test)
         else:
             test.run()
+        return _stop_test(test)
+    except (Exception, SystemExit) as e:
+        return _stop_test(test, e)
+
+
+def _stop_test(test: Test, exception_: Optional[BaseException] = None) -> bool:
+    """
+    Helper, stops the test and runs the listener hook for the test result.
+
+    :param test: Test instance
+    :param exception_: exception raised by the test, None if test succeeds
+    :return: True if test succeeds, False otherwise
+    """
+    if exception_ is None:
         test.stop()
         # run listener hook
-        _listener.on_success(test)
+        if 'on_success' in _listener_hooks:
+            _listener.on_success(test)
         return True
-    except AssertionError as e:
-        e = exception_with_assert(e)
-        test.stop(e)
+    if isinstance(exception_, AssertionError):
+        exception_ = exception_with_assert(exception_)
+        test.stop(exception_)
         # run listener hook
-        _listener.on_failed(test, e)
-        global _actual_failed_count
-        if _max_fail and _actual_failed_count < _max_fail:
-            _actual_failed_count += 1
-        if _max_fail and _actual_failed_count >= _max_fail:
-            global _can_run
-            _can_run = False
-            # run listener hook
-            _listener.on_suite_stop_with_max_fail(_max_fail)
-    except (TestIgnoredException, OnlyIfFailedException, SkipTestException, SystemExit) as e:
-        test.stop(e)
+        if 'on_failed' in _listener_hooks:
+            _listener.on_failed(test, exception_)
+        _count_failed()
+    elif isinstance(exception_, (TestIgnoredException, OnlyIfFailedException, SkipTestException, SystemExit)):
+        test.stop(exception_)
         # run listener hook
-        _listener.on_ignored_by_condition(test, e)
-    except Exception as e:
-        test.stop(e)
+        if 'on_ignored_by_condition' in _listener_hooks:
+            _listener.on_ignored_by_condition(test, exception_)
+    else:
+        test.stop(exception_)
         # run listener hook
-        _listener.on_broken(test, e)
+        if 'on_broken' in _listener_hooks:
+            _listener.on_broken(test, exception_)
     return False
 
 
+def _count_failed():
+    """
+    Helper, counts the failed test and stops the suite if max fail count is reached.
+
+    :return: None
+    """
+    global _actual_failed_count
+    if _max_fail and _actual_failed_count < _max_fail:
+        _actual_failed_count += 1
+    if _max_fail and _actual_failed_count >= _max_fail:
+        global _can_run
+        _can_run = False
+        # run listener hook
+        _listener.on_suite_stop_with_max_fail(_max_fail)
+
+
 def _check_data_providers(suite: TestSuite):
     """
     Helper, checks if any tests in the specified suite use a data provider and the provider name is resolved.
@@ -404,7 +768,235 @@ def _run_fixture(func: Callable, fixture_type: str, group_name: str) -> bool:
     """
     is_failed: bool = False
     try:
-        func()
+        result = func()
+        if iscoroutine(result):
+            run_coroutine(result)
+    except Exception as error:
+        # run listener hook
+        _listener.on_fixture_failed(group_name, fixture_type, error)
+        is_failed = True
+    return is_failed
+
+
+async def _run_all_tests_in_group_async(group: TestGroup):
+    """
+    Helper, executes all tests of the group at the event loop of the runner, so the waits of 'async def' tests overlap.
+    Number of the tests running at the same time is limited by the max_concurrency of the group. Tests with the same
+    priority run at the same time, the next priority starts when all tests of the previous one have finished.
+    Plain (not async) tests run at the threads of the loop executor.
+
+    :param group: TestGroup instance
+    :return: None
+    """
+    semaphore = asyncio.Semaphore(group.max_concurrency)
+    is_one_of_before_test_failed = False
+    for _, tests in groupby(group.tests, key=lambda t: t.priority):
+        if not _can_run:
+            break
+        results = await asyncio.gather(*[_run_one_test_async(test, is_one_of_before_test_failed, semaphore)
+                                         for test in tests])
+        if any(results):
+            is_one_of_before_test_failed = True
+
+
+async def _run_one_test_async(test: Test, is_before_failed: bool, semaphore: asyncio.Semaphore) -> bool:
+    """
+    Helper, async version of _run_one_test.
+    """
+    if not _can_run:
+        return False
+    if test.provider:
+        await _run_test_with_provider_async(test, semaphore)
+        return False
+    async with semaphore:
+        return await _run_test_with_before_and_after_async(test, is_before_failed)
+
+
+async def _run_test_with_provider_async(test: Test, semaphore: asyncio.Semaphore):
+    """
+    Helper, async version of _run_test_with_provider. The next provider value is taken only when the semaphore allows
+    to start one more test, no more values are taken after the 'before_test' fixture has failed.
+
+    :param test: Test instance
+    :param semaphore: semaphore of the group
+    :return: None
+    """
+    test_suite = TestSuite.get_instance()
+    provider = test.provider
+    tasks = []
+    try:
+        stored = await _cache_provider_async(provider) if provider in test_suite.cached else None
+        async for param in _provider_next_async(provider, stored):
+            if not _can_run or any(task.done() and task.result() for task in tasks):
+                break
+            clone = test.clone()
+            clone.argument = param
+            await semaphore.acquire()
+            tasks.append(asyncio.ensure_future(_run_provider_case_async(clone, semaphore)))
+        results = await asyncio.gather(*tasks)
+        # ignore tests with empty providers
+        if not tasks:
+            test.stop(TestIgnoredException(f'Provider {test.provider} is empty.'))
+            # run listener hook
+            if 'on_ignored_with_provider' in _listener_hooks:
+                _listener.on_ignored_with_provider(test)
+        if any(results):
+            # run listener hook
+            if 'on_before_provider_failed' in _listener_hooks:
+                _listener.on_before_provider_failed(test, provider)
+    except TypeError as e:
+        if 'is not iterable' not in e.args[0]:
+            if 'on_error_with_provider' in _listener_hooks:
+                _listener.on_error_with_provider(provider, e)
+            raise
+        else:
+            test.stop(TestIgnoredException(f'Error using provider {test.provider}.'))
+            # run listener hook and ignore the exception
+            if 'on_ignored_with_provider' in _listener_hooks:
+                _listener.on_ignored_with_provider(test)
+
+
+async def _cache_provider_async(provider_name: str) -> Iterable:
+    """
+    Helper, async version of _cache_provider, returns the cached provider values. The provider is read to the end and
+    its values are committed before the first test runs. If another thread builds the values now, waits for it at
+    the executor thread, so the event loop goes on.
+
+    :param provider_name: provider name
+    :return: cached values
+    """
+    cache = TestSuite.get_instance().cache
+    loop = asyncio.get_event_loop()
+    while not await loop.run_in_executor(None, cache.begin, provider_name):
+        if provider_name in cache:
+            return cache[provider_name]
+    writer = None
+    try:
+        key = _persistent_key(provider_name)
+        stored = cache.load(provider_name, key) if key else None
+        writer = cache.writer(provider_name, key if stored is None else None)
+        async for value in _provider_next_async(provider_name, stored):
+            writer.append(value)
+        writer.commit()
+    except BaseException:
+        if writer:
+            writer.discard()
+        else:
+            cache.finish(provider_name)
+        raise
+    return cache[provider_name]
+
+
+async def _run_provider_case_async(test: Test, semaphore: asyncio.Semaphore) -> bool:
+    try:
+        return await _run_test_with_before_and_after_async(test, False)
+    finally:
+        semaphore.release()
+
+
+async def _provider_next_async(provider_name: str, stored: Optional[Iterable] = None):
+    """
+    Helper, async version of _provider_next, yields cached values (or values of the persistent cache) if present.
+    """
+    test_suite = TestSuite.get_instance()
+    if provider_name in test_suite.cache:
+        stored = test_suite.cache[provider_name]
+    if stored is not None:
+        for value in stored:
+            yield value
+        return
+    iter_ = test_suite.providers[provider_name][0]()
+    if iscoroutine(iter_):
+        iter_ = await iter_
+    if hasattr(iter_, '__aiter__'):
+        async for value in iter_:
+            yield value
+        await iter_.aclose()
+        return
+    for value in iter_:
+        yield value
+    _close_provider(provider_name, iter_)
+
+
+async def _run_test_with_before_and_after_async(test: Test, is_before_failed: bool) -> bool:
+    """
+    Helper, async version of _run_test_with_before_and_after.
+    """
+    if not is_before_failed:
+        await _run_before_async(test)
+    else:
+        test.is_before_failed = True
+    if test.is_before_failed:
+        test.stop(TestIgnoredException("''before_test' fixture has failed."))
+        # run listener hook
+        if 'on_ignored' in _listener_hooks:
+            _listener.on_ignored(test, 'before test')
+        return True
+    for retry in range(test.retries):
+        clone = test.clone()
+        if retry > 0:
+            clone.name = clone.name + f' ({retry})'
+        result = await _run_test_async(clone)
+        if result:
+            break
+    await _run_after_async(test)
+    return False
+
+
+async def _run_test_async(test: Test) -> bool:
+    """
+    Helper, async version of _run_test, plain test functions are run at the thread of the loop executor.
+    """
+    if not iscoroutinefunction(test.test) or test.isolate:
+        return await asyncio.get_event_loop().run_in_executor(None, _run_test, test)
+    # run listener hook
+    if 'on_test_starts' in _listener_hooks:
+        _listener.on_test_starts(test)
+    try:
+        if test.timeout:
+            try:
+                await asyncio.wait_for(test.run_async(), test.timeout)
+            except asyncio.TimeoutError:
+                raise TestBrokenException(f'Time ({test.timeout} seconds) is over for test "{test}"!')
+        else:
+            await test.run_async()
+        return _stop_test(test)
+    except (Exception, SystemExit) as e:
+        return _stop_test(test, e)
+
+
+async def _run_before_async(test_case: TestCase):
+    """
+    Helper, async version of _run_before.
+    """
+    for before in test_case.before:
+        result = await _run_fixture_async(before, 'before', test_case.name)
+        if result:
+            test_case.is_before_failed = True
+
+
+async def _run_after_async(test_case: TestCase):
+    """
+    Helper, async version of _run_after.
+    """
+    if not test_case.always_run_after and test_case.is_before_failed:
+        return
+    for after in test_case.after:
+        await _run_fixture_async(after, 'after', test_case.name)
+
+
+async def _run_fixture_async(func: Callable, fixture_type: str, group_name: str) -> bool:
+    """
+    Helper, async version of _run_fixture, plain fixtures are run at the thread of the loop executor.
+    """
+    is_failed: bool = False
+    try:
+        if iscoroutinefunction(func):
+            await func()
+        else:
+            result = await asyncio.get_event_loop().run_in_executor(None, func)
+            if iscoroutine(result):
+                await result
     except Exception as error:
         # run listener hook
         _listener.on_fixture_failed(group_name, fixture_type, error)
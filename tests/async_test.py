@@ -0,0 +1,136 @@
+import asyncio
+from time import time
+from unittest import TestCase, main
+
+from checking import runner as r
+from checking.asserts import equals
+from checking.helpers.report import add_text
+from checking.classes.basic_test import Test
+from checking.classes.basic_suite import TestSuite
+from checking.classes.listeners.basic import Listener
+from checking.classes.event_loop import run_coroutine, iterate, stop_event_loop
+from checking.annotations import test, provider, before, after, before_group
+from tests.fixture_behaviour_test import clear
+
+LOG = []
+
+
+async def sleepy():
+    await asyncio.sleep(0.3)
+
+
+async def failed():
+    await asyncio.sleep(0)
+    equals(1, 2)
+
+
+async def with_report():
+    add_text('key', 'value')
+
+
+async def async_provider():
+    for i in range(3):
+        await asyncio.sleep(0)
+        yield i
+
+
+async def sleepy_case(it):
+    await asyncio.sleep(0.3)
+    LOG.append(it)
+
+
+async def async_before():
+    LOG.append('before')
+
+
+def plain_after():
+    LOG.append('after')
+
+
+class AsyncTest(TestCase):
+
+    def setUp(self):
+        clear()
+        LOG.clear()
+
+    def tearDown(self):
+        stop_event_loop()
+
+    def test_run_coroutine(self):
+        async def _():
+            return 1
+
+        self.assertEqual(1, run_coroutine(_()))
+
+    def test_iterate_async_generator(self):
+        self.assertEqual([0, 1, 2], list(iterate(async_provider())))
+
+    def test_iterate_plain(self):
+        self.assertEqual([1], list(iterate([1])))
+
+    def test_run_async_test(self):
+        test_ = Test('name', failed)
+        with self.assertRaises(AssertionError):
+            test_.run()
+
+    def test_async_test_report_params(self):
+        test_ = Test('name', with_report)
+        test_.run()
+        self.assertEqual({'key': 'value'}, test_.report_params)
+
+    def test_async_tests_and_fixtures(self):
+        test(sleepy)
+        test(failed)
+        before(async_before)
+        after(plain_after)
+        r.start(listener=Listener(0))
+        suite = TestSuite.get_instance()
+        self.assertEqual(1, len(suite.success()))
+        self.assertEqual(1, len(suite.failed()))
+        self.assertEqual(['before', 'after', 'before', 'after'], LOG)
+
+    def test_async_provider(self):
+        provider(async_provider)
+        test(data_provider='async_provider')(sleepy_case)
+        r.start(listener=Listener(0))
+        self.assertEqual([0, 1, 2], LOG)
+
+    def test_max_concurrency_overlaps_tests(self):
+        for name in ('one', 'two', 'three', 'four'):
+            test(name=name)(sleepy)
+        before_group(max_concurrency=4)(async_before)
+        start_time = time()
+        r.start(listener=Listener(0))
+        self.assertTrue(time() - start_time < 1.0)
+        self.assertEqual(4, len(TestSuite.get_instance().success()))
+
+    def test_max_concurrency_overlaps_provider_cases(self):
+        provider(async_provider)
+        test(data_provider='async_provider')(sleepy_case)
+        before_group(max_concurrency=3)(async_before)
+        start_time = time()
+        r.start(listener=Listener(0))
+        self.assertTrue(time() - start_time < 0.8)
+        self.assertEqual(3, len(TestSuite.get_instance().success()))
+        self.assertEqual([0, 1, 2], sorted(LOG[1:]))
+
+    def test_max_concurrency_limits_tests(self):
+        for name in ('one', 'two', 'three', 'four'):
+            test(name=name)(sleepy)
+        before_group(max_concurrency=2)(async_before)
+        start_time = time()
+        r.start(listener=Listener(0))
+        self.assertTrue(time() - start_time >= 0.6)
+
+    def test_async_timeout(self):
+        group = TestSuite.get_instance().get_or_create('group')
+        group.max_concurrency = 2
+        test_ = Test('slow', sleepy)
+        test_.timeout = 0.1
+        group.add_test(test_)
+        r.start(listener=Listener(0))
+        self.assertEqual(1, len(TestSuite.get_instance().broken()))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,72 @@
+import os
+import shutil
+from tempfile import mkdtemp
+from unittest import TestCase, main
+
+from checking.helpers.attachments import Attachment, AttachmentStore
+
+
+class AttachmentStoreTest(TestCase):
+
+    def setUp(self):
+        self.directory = os.path.join(mkdtemp(), 'attachments')
+        self.store = AttachmentStore(self.directory)
+
+    def tearDown(self):
+        shutil.rmtree(os.path.dirname(self.directory))
+
+    def test_same_content_stored_once(self):
+        first = self.store.put(b'image')
+        second = self.store.put(b'image')
+        other = self.store.put(b'other')
+        self.store.flush()
+        self.assertEqual(first, second)
+        self.assertNotEqual(first, other)
+        self.assertEqual(1, self.store.duplicates)
+        self.assertEqual(sorted([f'{first}.png', f'{other}.png']), sorted(os.listdir(self.directory)))
+        with open(self.store.path(first), 'rb') as file:
+            self.assertEqual(b'image', file.read())
+
+    def test_file_of_previous_run_is_kept(self):
+        digest = self.store.put(b'image')
+        self.store.flush()
+        modified = os.path.getmtime(self.store.path(digest))
+        store = AttachmentStore(self.directory)
+        store.put(b'image')
+        store.flush()
+        self.assertEqual(modified, os.path.getmtime(self.store.path(digest)))
+
+    def test_written_only_when_enabled(self):
+        store = AttachmentStore(self.directory, enabled=False)
+        dropped = store.put(b'dropped')
+        store.start_run(False)
+        digest = store.put(b'image')
+        store.flush()
+        self.assertFalse(os.path.exists(self.directory))
+        store.enable()
+        store.flush()
+        self.assertEqual([f'{digest}.png'], os.listdir(self.directory))
+        self.assertNotEqual(dropped, digest)
+
+    def test_unused_are_removed(self):
+        first = self.store.put(b'first')
+        second = self.store.put(b'second')
+        third = self.store.put(b'third')
+        self.store.remove_unused([first, second])
+        # the files of the previous call are kept
+        self.store.remove_unused([second])
+        self.assertEqual(sorted([f'{first}.png', f'{second}.png']), sorted(os.listdir(self.directory)))
+        self.store.start_run(True)
+        self.store.remove_unused([third])
+        self.assertEqual([], os.listdir(self.directory))
+        # the removed file is written again
+        self.store.put(b'first')
+        self.store.flush()
+        self.assertEqual([f'{first}.png'], os.listdir(self.directory))
+
+    def test_attachment_file_name(self):
+        self.assertEqual('attachments/abc.png', Attachment('abc').file_name())
+
+
+if __name__ == '__main__':
+    main()
@@ -2,9 +2,10 @@ from unittest import TestCase as TC
 from unittest import main
 from random import choice
 from time import sleep
+from unittest.mock import patch
 
 from checking.classes.basic_case import TestCase
-from checking.classes.basic_test import Test
+from checking.classes.basic_test import Test, TestResult
 from checking.classes.basic_group import TestGroup
 from checking.classes.basic_suite import TestSuite
 from checking.classes.timer import Timer
@@ -87,6 +88,41 @@ class TestClasses(TC):
         self.assertEqual(test.reason, new_test.reason)
         self.assertNotEqual(test.report_params, new_test.report_params)
         self.assertFalse(new_test.report_params)
+        self.assertIs(test, new_test.definition)
+        self.assertIsNot(test.timer, new_test.timer)
+        self.assertIs(test, new_test.clone().definition)
+
+    def test_result_of_Test(self):
+        test = Test('name', self.fake_runner)
+        test.description = 'descr'
+        test.retries = 2
+        group = TestGroup('group')
+        group.add_test(test)
+        clone = test.clone()
+        clone.name = 'name (1)'
+        clone.argument = [1]
+        clone.report_params['key'] = 'value'
+        clone.timer.start()
+        clone.stop(AssertionError('1'))
+        result = group.test_results[0]
+        self.assertIsInstance(result, TestResult)
+        self.assertIs(test, result.definition)
+        self.assertEqual('name (1)', result.name)
+        self.assertEqual([1], result.argument)
+        self.assertEqual('failed', result.status)
+        self.assertEqual({'key': 'value'}, result.report_params)
+        self.assertEqual(2, result.retries)
+        self.assertEqual('group.name (1) (\'descr\')', str(result))
+        self.assertEqual(clone.duration(), result.duration())
+        self.assertEqual(clone.timer.start_time, result.timer.start_time)
+        self.assertEqual('failed', result.info()['status'])
+
+    def test_result_is_read_only(self):
+        result = Test('name', print).result()
+        self.assertEqual({}, result.report_params)
+        self.assertEqual(-1, result.duration())
+        with self.assertRaises(AttributeError):
+            result.status = 'success'
 
     def test_init_for_TestGroup(self):
         group = TestGroup('default')
@@ -141,6 +177,25 @@ class TestClasses(TC):
         group.add_result(test)
         self.assertEqual(1, len(group.tests_by_status(stat)))
 
+    def test_results_index_by_status(self):
+        group = TestGroup('default')
+        test = Test('name', print)
+        group.add_test(test)
+        test.stop()
+        test.stop(AssertionError())
+        test.stop(ValueError())
+        self.assertEqual(['success'], [t.status for t in group.tests_by_status('success')])
+        self.assertEqual(1, group.results_count('failed'))
+        self.assertEqual(0, group.results_count('ignored'))
+        self.assertEqual(3, group.results_count())
+        # results, added bypassing add_result, are indexed too
+        test.status = 'ignored'
+        group.test_results.append(test)
+        self.assertEqual(1, group.results_count('ignored'))
+        group.test_results = [test]
+        self.assertEqual(0, group.results_count('success'))
+        self.assertEqual(1, len(group.tests_by_status('ignored')))
+
     def test_is_empty_default(self):
         group = TestGroup('default')
         self.assertTrue(group.is_empty())
@@ -260,6 +315,44 @@ class TestClasses(TC):
         self.assertTrue(suite.ignored())
         self.assertEqual(test_, suite.ignored()[0])
 
+    def test_results_count_TestSuite_by_counters(self):
+        clear()
+        suite = TestSuite.get_instance()
+        group = suite.get_or_create('gr_name')
+        for status in ('success', 'failed', 'failed'):
+            test_ = Test('any', print)
+            test_.status = status
+            group.add_result(test_)
+        # the suite does not ask the groups
+        with patch.object(TestGroup, 'results_count', side_effect=AssertionError):
+            self.assertEqual(2, suite.results_count('failed'))
+            self.assertEqual(1, suite.results_count('success'))
+            self.assertEqual(3, suite.results_count())
+
+    def test_results_duration_without_not_started_tests(self):
+        group = TestGroup('gr_name')
+        started = Test('started', print)
+        started.timer.start()
+        started.timer.stop()
+        started.timer.duration = 2.0
+        ignored = Test('ignored', print)
+        ignored.timer.stop()
+        group.add_result(started)
+        group.add_result(ignored)
+        self.assertEqual(2.0, group.results_duration())
+
+    def test_results_count_TestSuite_after_clear(self):
+        clear()
+        suite = TestSuite.get_instance()
+        test_ = Test('any', print)
+        test_.status = 'broken'
+        suite.get_or_create('gr_name').add_result(test_)
+        self.assertEqual(1, suite.results_count('broken'))
+        suite.groups.clear()
+        self.assertEqual(0, suite.results_count())
+        suite.get_or_create('gr_name')
+        self.assertEqual(0, suite.results_count('broken'))
+
     def test_filter_TestSuite(self):
         clear()
         suite = TestSuite.get_instance()
@@ -0,0 +1,89 @@
+import os
+import gzip
+import logging
+from tempfile import mkdtemp
+from unittest import TestCase, main
+from logging.handlers import RotatingFileHandler, TimedRotatingFileHandler
+
+from checking.classes.basic_test import Test
+from checking.classes.listeners.file_logger import DefaultFileListener, _file_handler
+
+
+class FileLoggerTest(TestCase):
+
+    def setUp(self):
+        self.directory = mkdtemp()
+        self.name = os.path.join(self.directory, 'log')
+        self.handlers = logging.root.handlers[:]
+        logging.root.handlers = []
+
+    def tearDown(self):
+        for handler in logging.root.handlers:
+            logging.root.removeHandler(handler)
+        logging.root.handlers = self.handlers
+
+    def _failed(self, listener: DefaultFileListener):
+        try:
+            int('a')
+        except ValueError as e:
+            listener.on_broken(Test('name', lambda: None), e)
+
+    def test_records_written_by_writer_thread(self):
+        listener = DefaultFileListener(name=self.name, use_time=False)
+        self._failed(listener)
+        listener.flush()
+        with open(f'{self.name}.log', encoding='utf-8') as file:
+            text = file.read()
+        self.assertIn('Thread[MainThread] ERROR: Test "__main__.name"  BROKEN!\nTraceback', text)
+        self.assertIn("ValueError: invalid literal for int() with base 10: 'a'", text)
+
+    def test_not_lazy_traceback(self):
+        listener = DefaultFileListener(name=self.name, use_time=False, lazy_traceback=False)
+        self._failed(listener)
+        listener.flush()
+        with open(f'{self.name}.log', encoding='utf-8') as file:
+            text = file.read()
+        self.assertEqual(1, text.count('Thread[MainThread]'))
+        self.assertIn("ValueError: invalid literal for int() with base 10: 'a'", text)
+
+    def test_rotation_by_size_with_compression(self):
+        listener = DefaultFileListener(name=self.name, use_time=False, max_bytes=1000, backup_count=2, compress=True)
+        for _ in range(20):
+            self._failed(listener)
+        listener.flush()
+        self.assertEqual(['log.log', 'log.log.1.gz', 'log.log.2.gz'], sorted(os.listdir(self.directory)))
+        with gzip.open(f'{self.name}.log.1.gz', 'rt', encoding='utf-8') as file:
+            self.assertIn('BROKEN!', file.read())
+
+    def test_file_handler(self):
+        file_name = f'{self.name}.log'
+        for expected, max_bytes, when in ((logging.FileHandler, 0, ''), (RotatingFileHandler, 10, 'H'),
+                                          (TimedRotatingFileHandler, 0, 'H')):
+            handler = _file_handler(file_name, max_bytes, when, 1, False)
+            handler.close()
+            self.assertIs(expected, type(handler))
+
+    def test_file_handler_truncates_old_log(self):
+        file_name = f'{self.name}.log'
+        for max_bytes, when in ((0, ''), (10, ''), (0, 'H')):
+            with open(file_name, 'wt', encoding='utf-8') as file:
+                file.write('old')
+            handler = _file_handler(file_name, max_bytes, when, 1, False)
+            handler.close()
+            self.assertEqual(0, os.path.getsize(file_name))
+
+    def test_flush_keeps_writer_thread(self):
+        listener = DefaultFileListener(name=self.name, use_time=False)
+        thread = listener._writer._thread
+        self._failed(listener)
+        listener.flush()
+        self.assertIs(thread, listener._writer._thread)
+        with open(f'{self.name}.log', encoding='utf-8') as file:
+            self.assertIn('BROKEN!', file.read())
+        listener._stop()
+        listener.flush()
+        self.assertIsNone(listener._writer._thread)
+
+
+if __name__ == '__main__':
+    main()
@@ -29,6 +29,8 @@ def clear():
     test_suite.providers.clear()
     test_suite.cache.clear()
     test_suite.cached.clear()
+    test_suite.parallel.clear()
+    test_suite.prefetch.clear()
     global common_str
     common_str = ''
     runner.common.clear()
@@ -119,6 +121,14 @@ class TestBeforeAndAfter(TestCase):
         start(listener=self._listener)
         self.assertEqual('bg_test', common_str)
 
+    def test_before_group_parallel(self):
+        clear()
+        test(fn)
+        before_group(parallel=True)(b_group)
+        start(listener=self._listener, threads=2)
+        self.assertTrue(TestSuite.get_instance().get_or_create(fn.__module__).parallel)
+        self.assertEqual('bg_test', common_str)
+
     def test_after_group_default(self):
         clear()
         test(fn)
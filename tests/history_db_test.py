@@ -0,0 +1,164 @@
+import os
+import shutil
+import sqlite3
+from io import StringIO
+from tempfile import mkdtemp
+from contextlib import redirect_stdout
+from unittest import TestCase, main
+
+from checking import runner as r
+from checking import __main__ as m
+from checking.annotations import provider, test
+from checking.classes.basic_test import Test
+from checking.classes.basic_suite import TestSuite
+from checking.classes.listeners.basic import Listener
+from checking.classes.listeners.history_db import HistoryDbListener
+from checking.helpers.history_db import HistoryDatabase, format_rows
+from checking.exceptions import TestIgnoredException
+from tests.fixture_behaviour_test import clear
+
+
+def numbers():
+    return range(4)
+
+
+def odd_fails(it):
+    assert it % 2 == 0
+
+
+ATTEMPTS = []
+
+
+def passes_on_retry():
+    ATTEMPTS.append(1)
+    assert len(ATTEMPTS) % 2 == 0
+
+
+class HistoryDatabaseTest(TestCase):
+
+    def setUp(self):
+        self.directory = mkdtemp()
+        self.database = HistoryDatabase(os.path.join(self.directory, 'history.db'))
+
+    def tearDown(self):
+        self.database.close()
+        shutil.rmtree(self.directory)
+
+    def _run(self, rows, suite: str = 'suite'):
+        run_id = self.database.start_run(suite, 1.0)
+        self.database.add_results(run_id, rows)
+        self.database.end_run(run_id, 2.0, 1.0, {'tests': len(rows)})
+
+    def test_slowest(self):
+        self._run([('group', 'fast', '', 'success', 1.0, 0.1, None), ('group', 'slow', '', 'success', 1.0, 2.0, None)])
+        self._run([('group', 'fast', '', 'success', 1.0, 0.3, None), ('group', 'slow', '', 'success', 1.0, 4.0, None)])
+        rows = self.database.slowest(limit=1)
+        self.assertEqual([{'group_name': 'group', 'name': 'slow', 'argument': '', 'executions': 2, 'mean': 3.0,
+                           'longest': 4.0}], rows)
+        self.assertAlmostEqual(0.3, self.database.slowest(runs=1)[1]['mean'])
+
+    def test_regressed(self):
+        for duration in (1.0, 1.0, 3.0):
+            self._run([('group', 'test', '', 'success', 1.0, duration, None),
+                       ('group', 'stable', '', 'success', 1.0, 1.0, None)])
+        rows = self.database.regressed(runs=1)
+        self.assertEqual([('test', 1.0, 3.0, 3.0)], [(row['name'], row['earlier'], row['recent'], row['ratio'])
+                                                     for row in rows])
+        self.assertEqual([], self.database.regressed(runs=1, ratio=5))
+
+    def test_flaky(self):
+        for status in ('success', 'failed', 'success', 'broken'):
+            self._run([('group', 'flaky', '', status, 1.0, 1.0, None),
+                       ('group', 'stable', '', 'failed', 1.0, 1.0, 'AssertionError: ')])
+        rows = self.database.flaky()
+        self.assertEqual([('flaky', 4, 2, 0.5)], [(row['name'], row['executions'], row['failures'], row['flakiness'])
+                                                  for row in rows])
+        self.assertEqual([], self.database.flaky(runs=1))
+
+    def test_ignored_are_not_counted(self):
+        self._run([('group', 'ignored', '', 'ignored', 1.0, 5.0, None), ('group', 'test', '', 'success', 1.0, 1.0, None)])
+        self._run([('group', 'ignored', '', 'ignored', 1.0, 1.0, None), ('group', 'test', '', 'success', 1.0, 3.0, None)])
+        self.assertEqual(['test'], [row['name'] for row in self.database.slowest()])
+        self.assertEqual(['test'], [row['name'] for row in self.database.regressed(runs=1)])
+
+    def test_queries_by_suite(self):
+        self._run([('group', 'other', '', 'failed', 1.0, 1.0, None)], 'other')
+        self._run([('group', 'test', '', 'success', 1.0, 2.0, None)])
+        self._run([('group', 'other', '', 'success', 1.0, 3.0, None)], 'other')
+        self._run([('group', 'test', '', 'failed', 1.0, 4.0, None)])
+        # the suite of the last run by default
+        self.assertEqual([('test', 3.0)], [(row['name'], row['mean']) for row in self.database.slowest()])
+        self.assertEqual([('other', 2.0)], [(row['name'], row['mean']) for row in self.database.slowest(suite='other')])
+        self.assertEqual([('test', 2.0)], [(row['name'], row['ratio'])
+                                           for row in self.database.regressed(runs=1, suite='suite')])
+        self.assertEqual(['test'], [row['name'] for row in self.database.flaky(runs=2, suite='suite')])
+        self.assertEqual([], self.database.flaky(runs=1, suite='suite'))
+
+    def test_format_rows(self):
+        self.assertEqual('No tests found.', format_rows([]))
+        self.assertEqual('name  mean\nlong  1.500\nb',
+                         format_rows([{'name': 'long', 'mean': 1.5}, {'name': 'b', 'mean': None}]))
+
+
+class HistoryDbListenerTest(TestCase):
+
+    def setUp(self):
+        clear()
+        self.directory = mkdtemp()
+        self.file_name = os.path.join(self.directory, 'history.db')
+
+    def tearDown(self):
+        clear()
+        shutil.rmtree(self.directory)
+
+    def test_run_is_saved(self):
+        for _ in range(2):
+            clear()
+            provider(numbers)
+            test(data_provider='numbers')(odd_fails)
+            r.start(listener=[Listener(0), HistoryDbListener(self.file_name, batch_size=3)])
+        with sqlite3.connect(self.file_name) as connection:
+            runs = connection.execute('SELECT tests, success, failed FROM runs').fetchall()
+            results = connection.execute("SELECT argument, status, reason FROM results WHERE run_id = 2 "
+                                         "ORDER BY argument").fetchall()
+        connection.close()
+        self.assertEqual([(4, 2, 2), (4, 2, 2)], runs)
+        self.assertEqual([('0', 'success', None), ('1', 'failed', 'AssertionError'), ('2', 'success', None),
+                          ('3', 'failed', 'AssertionError')],
+                         [(argument, status, reason and reason.split(':')[0]) for argument, status, reason in results])
+        with redirect_stdout(StringIO()) as output:
+            m.show_history(self.file_name, 'slow', limit=2)
+        self.assertEqual(3, len(output.getvalue().splitlines()))
+
+    def test_retries_and_ignored_are_saved(self):
+        ATTEMPTS.clear()
+        test(retries=2)(passes_on_retry)
+        listener = HistoryDbListener(self.file_name)
+        r.start(listener=[Listener(0), listener])
+        ignored = Test('ignored', lambda: None)
+        ignored.stop(TestIgnoredException('ignored'))
+        listener.on_suite_starts(TestSuite.get_instance())
+        listener.on_ignored(ignored, 'before test')
+        listener.on_suite_ends(TestSuite.get_instance())
+        with sqlite3.connect(self.file_name) as connection:
+            results = connection.execute('SELECT name, status, start_time, duration FROM results '
+                                         'ORDER BY run_id, status').fetchall()
+        connection.close()
+        self.assertEqual([('passes_on_retry', 'failed'), ('passes_on_retry', 'success'), ('ignored', 'ignored')],
+                         [row[:2] for row in results])
+        self.assertEqual((None, None), results[2][2:])
+        database = HistoryDatabase(self.file_name)
+        try:
+            self.assertEqual([('passes_on_retry', 2, 1)], [(row['name'], row['executions'], row['failures'])
+                                                          for row in database.flaky(runs=2)])
+        finally:
+            database.close()
+
+    def test_parse_history_arguments(self):
+        args = m.parse_history_arguments(['history.db', 'flaky', '-r', '10', '-n', '5', '-s', 'suite'])
+        self.assertEqual(('history.db', 'flaky', 10, 5, 'suite'), (args.database, args.query, args.runs, args.limit,
+                                                                   args.suite))
+
+
+if __name__ == '__main__':
+    main()
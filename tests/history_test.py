@@ -0,0 +1,102 @@
+import os
+from time import sleep
+from tempfile import mkdtemp
+from unittest import TestCase, main
+
+from checking import runner as r
+from checking.annotations import test
+from checking.classes.basic_test import Test
+from checking.classes.basic_group import TestGroup
+from checking.classes.basic_suite import TestSuite
+from checking.classes.listeners.basic import Listener
+from checking.helpers.history import DurationHistory
+from tests.fixture_behaviour_test import clear
+
+ORDER = []
+
+
+def fast():
+    ORDER.append('fast')
+
+
+def slow():
+    sleep(0.05)
+    ORDER.append('slow')
+
+
+def _group(name: str, *tests: str) -> TestGroup:
+    group = TestGroup(name)
+    for test_name in tests:
+        group.add_test(Test(test_name, fast))
+    return group
+
+
+class DurationHistoryTest(TestCase):
+
+    def setUp(self):
+        clear()
+        ORDER.clear()
+        self.file_name = os.path.join(mkdtemp(), 'history.json')
+
+    def tearDown(self):
+        if os.path.exists(self.file_name):
+            os.remove(self.file_name)
+
+    def test_no_file(self):
+        history = DurationHistory(self.file_name)
+        self.assertFalse(history)
+        self.assertIsNone(history.expected(_group('one', 'a')))
+
+    def test_expected_by_tests(self):
+        history = DurationHistory(self.file_name)
+        history.tests = {'one::a': 1.0, 'one::b': 2.0}
+        self.assertEqual(3.0, history.expected(_group('one', 'a', 'b', 'c')))
+
+    def test_expected_by_group(self):
+        history = DurationHistory(self.file_name)
+        history.groups = {'one': 5.0}
+        history.tests = {'one::a': 1.0}
+        self.assertEqual(5.0, history.expected(_group('one', 'a')))
+
+    def test_longest_first(self):
+        history = DurationHistory(self.file_name)
+        history.groups = {'short': 1.0, 'long': 10.0}
+        groups = [_group('short'), _group('new'), _group('long')]
+        self.assertEqual(['new', 'long', 'short'], [g.name for g in history.longest_first(groups)])
+
+    def test_saved_after_run(self):
+        test(groups=('one',))(fast)
+        test(groups=('two',))(slow)
+        r.start(listener=Listener(0), history_file=self.file_name)
+        history = DurationHistory(self.file_name)
+        self.assertEqual({'one', 'two'}, set(history.groups))
+        self.assertTrue(history.groups['two'] > history.groups['one'])
+        self.assertTrue('two::slow' in history.tests)
+
+    def test_values_are_smoothed(self):
+        history = DurationHistory(self.file_name)
+        history.groups = {'one': 1.0}
+        history.save()
+        group = TestSuite.get_instance().get_or_create('one')
+        test_ = Test('a', fast)
+        test_.timer.start()
+        test_.timer.stop()
+        test_.timer.duration = 3.0
+        group.test_results.append(test_)
+        history = DurationHistory(self.file_name)
+        history.update(TestSuite.get_instance())
+        self.assertEqual(2.0, history.groups['one'])
+
+    def test_run_with_history_and_threads(self):
+        test(groups=('one',))(fast)
+        test(groups=('two',))(slow)
+        history = DurationHistory(self.file_name)
+        history.groups = {'one': 1.0, 'two': 10.0}
+        history.save()
+        r.start(listener=Listener(0), threads=2, history_file=self.file_name)
+        self.assertEqual(2, len(TestSuite.get_instance().success()))
+        self.assertEqual({'one', 'two'}, set(DurationHistory(self.file_name).groups))
+
+
+if __name__ == '__main__':
+    main()
@@ -1,11 +1,19 @@
+from io import StringIO
+from time import sleep, time
+from contextlib import redirect_stderr, redirect_stdout
+from threading import current_thread, Thread
 from importlib import reload
 from unittest import TestCase, main
+from unittest.mock import patch
 
 from checking import runner as r_
 from checking.annotations import test, provider, before, before_suite
 from checking.classes.basic_suite import TestSuite
 from checking.classes.basic_test import Test
 from checking.classes.listeners.basic import Listener
+from checking.classes.listeners.dispatcher import AsyncListener
+from checking.classes.listeners.console import ConsoleWriter
+from checking.classes.listeners.default import DefaultListener
 from tests.fixture_behaviour_test import clear
 
 COUNT = 0
@@ -204,5 +212,170 @@ class ListenerTest(TestCase):
         self.assertEqual(count, COUNT)
 
 
+class ConsoleWriterTest(TestCase):
+
+    def test_flush_by_timer(self):
+        output = StringIO()
+        writer = ConsoleWriter(interval=0.05)
+        with redirect_stdout(output):
+            writer.write('one')
+            writer.print('two', 3)
+            self.assertEqual('', output.getvalue())
+            sleep(0.2)
+        self.assertEqual('onetwo 3\n', output.getvalue())
+        self.assertIsNone(writer._thread)
+
+    def test_flush_by_size(self):
+        output = StringIO()
+        writer = ConsoleWriter(interval=10, size=5)
+        with redirect_stdout(output):
+            writer.write('1234')
+            self.assertEqual('', output.getvalue())
+            writer.write('56')
+            self.assertEqual('123456', output.getvalue())
+            writer.write('7')
+            writer.flush()
+        self.assertEqual('1234567', output.getvalue())
+
+    def test_texts_of_threads_do_not_interleave(self):
+        output = StringIO()
+        writer = ConsoleWriter(interval=0.01, size=100)
+        report = 'line\n' * 10
+        with redirect_stdout(output):
+            threads = [Thread(target=lambda: [writer.write(report) for _ in range(20)]) for _ in range(4)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            writer.flush()
+        self.assertEqual(report * 80, output.getvalue())
+
+    def test_default_listener_output(self):
+        clear()
+        test(fake)
+        test(fail)
+        output = StringIO()
+        with redirect_stdout(output):
+            r_.start(listener=DefaultListener(0))
+        self.assertIn('.F\n\n' + '=' * 30 + '\nTotal tests: 2, success tests: 1, failed tests: 1', output.getvalue())
+
+
+    def test_letters_are_written_under_the_lock(self):
+        listener_ = DefaultListener(0)
+        locked = []
+
+        class Writer:
+            @staticmethod
+            def write(text):
+                locked.append(listener_._lock.locked())
+
+        with patch('checking.classes.listeners.default.console', Writer):
+            threads = [Thread(target=lambda: [listener_._print_letter('.') for _ in range(60)]) for _ in range(4)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        self.assertEqual([True] * 240, locked)
+
+class OverriddenHooksTest(TestCase):
+
+    def test_base_listener(self):
+        self.assertEqual({'on_empty_suite'}, Listener(0).overridden_hooks())
+
+    def test_subclass_and_instance_attribute(self):
+        listener_ = RecordingListener()
+        listener_.on_dry_run = inc
+        self.assertEqual({'on_empty_suite', 'on_test_starts', 'on_success', 'on_failed', 'on_suite_ends', 'on_dry_run'},
+                         listener_.overridden_hooks())
+
+    def test_async_listener(self):
+        listener_ = Listener(0)
+        listener_.on_broken = inc
+        self.assertEqual({'on_empty_suite', 'on_suite_ends', 'on_broken'}, AsyncListener(listener_).overridden_hooks())
+
+    def test_runner_calls_overridden_only(self):
+        clear()
+        listener_ = Listener(0)
+        listener_.on_failed = inc
+        test(fake)
+        r_.start(listener=listener_)
+        self.assertEqual({'on_empty_suite', 'on_failed'}, r_._listener_hooks)
+
+
+class RecordingListener(Listener):
+
+    def __init__(self, delay: float = 0):
+        super().__init__(0)
+        self.delay = delay
+        self.events = []
+        self.threads = set()
+
+    def on_test_starts(self, test):
+        self.events.append(('start', test.name))
+
+    def on_success(self, test):
+        sleep(self.delay)
+        self.threads.add(current_thread().name)
+        self.events.append(('success', test.name))
+
+    def on_failed(self, test, exception_):
+        raise ValueError('listener failed')
+
+    def on_suite_ends(self, test_suite):
+        self.events.append(('end', None))
+
+
+class AsyncListenerTest(TestCase):
+
+    def setUp(self):
+        clear()
+
+    def tearDown(self):
+        clear()
+
+    def test_events_delivered_in_order(self):
+        first, second = RecordingListener(), RecordingListener()
+        for name in ('a', 'b', 'c'):
+            test(name=name)(fake)
+        r_.start(listener=[first, second])
+        expected = [('start', 'a'), ('success', 'a'), ('start', 'b'), ('success', 'b'), ('start', 'c'),
+                    ('success', 'c'), ('end', None)]
+        self.assertEqual(expected, first.events)
+        self.assertEqual(expected, second.events)
+        self.assertEqual({'Listener'}, first.threads)
+
+    def test_slow_listener_does_not_slow_tests(self):
+        listener_ = RecordingListener(0.05)
+        async_listener = AsyncListener(listener_)
+        for name in ('a', 'b', 'c', 'd'):
+            test(name=name)(fake)
+        start_time = time()
+        r_.start(listener=async_listener)
+        # all events are delivered at the end of the suite
+        self.assertEqual(9, len(listener_.events))
+        self.assertTrue(time() - start_time >= 0.2)
+        self.assertTrue(TestSuite.get_instance().suite_duration() < 0.15)
+        self.assertTrue(async_listener.max_queue_depth >= 2)
+        self.assertEqual(0, async_listener.queue_depth())
+
+    def test_failed_listener_does_not_stop_delivery(self):
+        listener_ = RecordingListener()
+        test(name='a')(fail)
+        test(name='b')(fake)
+        errors = StringIO()
+        with redirect_stderr(errors):
+            r_.start(listener=[listener_])
+        self.assertEqual([('start', 'a'), ('start', 'b'), ('success', 'b'), ('end', None)], listener_.events)
+        self.assertIn('ValueError: listener failed', errors.getvalue())
+
+    def test_flush(self):
+        listener_ = RecordingListener(0.05)
+        async_listener = AsyncListener(listener_)
+        async_listener.on_success(Test('a', fake))
+        async_listener.flush()
+        self.assertEqual([('success', 'a')], listener_.events)
+        async_listener.on_suite_ends(TestSuite.get_instance())
+
+
 if __name__ == '__main__':
     main()
@@ -7,7 +7,8 @@ from checking.classes.listeners.default import DefaultListener
 
 PARAMETERS = {'suite_name': 'Default Test Suite', 'verbose': 0, 'groups': [], 'params': {}, 'listener': '',
               'modules': [], 'threads': 1, 'dry_run': False, 'filter_by_name': '', 'random_order': False, 'max_fail': 0,
-              'generate_report': False}
+              'generate_report': False, 'processes': 0, 'history_file': '', 'shard': '', 'cache_dir': '',
+              'results': 'all', 'report_mode': 'inline'}
 
 
 class MainTest(TestCase):
@@ -23,7 +24,8 @@ class MainTest(TestCase):
     def test_read_parameters_from_file_full_changed_dict(self):
         expect = {'suite_name': 'Test', 'verbose': 3, 'groups': ['one'], 'params': {'1': 1}, 'listener': 'default',
                   'modules': ['test'], 'threads': 2, 'dry_run': True, 'filter_by_name': 'test', 'random_order': False,
-                  'max_fail': 0, 'generate_report': True}
+                  'max_fail': 0, 'generate_report': True, 'processes': 0, 'history_file': '', 'shard': '', 'cache_dir': '',
+                  'results': 'all', 'report_mode': 'inline'}
         dic_ = m.read_parameters_from_file('tests/files/op3.json')
         self.assertEqual(dic_, expect)
 
@@ -35,6 +37,16 @@ class MainTest(TestCase):
         with self.assertRaises(ValueError):
             m.check_parameters(dic_)
 
+    def test_check_param_results(self):
+        dic_ = {'results': 'none'}
+        with self.assertRaises(ValueError):
+            m.check_parameters(dic_)
+
+    def test_check_param_report_mode(self):
+        dic_ = {'report_mode': 'lazy'}
+        with self.assertRaises(ValueError):
+            m.check_parameters(dic_)
+
     def test_check_param_verbose_ok(self):
         dic_ = {'verbose': 3}
         m.check_parameters(dic_)
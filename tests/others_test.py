@@ -1,6 +1,7 @@
+from time import sleep
 from unittest import TestCase, main
 
-from checking.helpers.others import fake, diff
+from checking.helpers.others import fake, diff, prefetch
 
 
 class OthersTest(TestCase):
@@ -50,5 +51,38 @@ class OthersTest(TestCase):
         self.assertEqual('', diff(None, None))
 
 
+    def test_prefetch_values(self):
+        self.assertEqual(list(range(10)), list(prefetch(range(10), 3)))
+
+    def test_prefetch_is_bounded(self):
+        read = []
+
+        def _():
+            for i in range(10):
+                read.append(i)
+                yield i
+
+        values = prefetch(_(), 2)
+        self.assertEqual(0, next(values))
+        sleep(0.1)
+        # one value is consumed, two are at the queue and one waits to be put
+        self.assertTrue(len(read) <= 4)
+        values.close()
+
+    def test_prefetch_raises(self):
+        def _():
+            yield 1
+            int('a')
+
+        values = prefetch(_(), 2)
+        self.assertEqual(1, next(values))
+        with self.assertRaises(ValueError):
+            next(values)
+
+    def test_prefetch_not_iterable(self):
+        with self.assertRaises(TypeError):
+            list(prefetch(1, 2))
+
+
 if __name__ == '__main__':
     main()
@@ -0,0 +1,182 @@
+import os
+from time import sleep, time
+from importlib import reload
+from unittest import TestCase, main
+from unittest.mock import patch
+from multiprocessing import get_context
+
+from checking import runner as r
+from checking.annotations import test, provider
+from checking.asserts import equals
+from checking.helpers.report import add_text
+from checking.classes.basic_suite import TestSuite
+from checking.classes.process_pool import _PackedTest, _unpack
+from checking.classes.listeners.basic import Listener
+from checking.helpers.exception_traceback import get_trace_filtered_by_filename
+from tests.fixture_behaviour_test import clear
+
+
+class RecordingListener(Listener):
+
+    def __init__(self):
+        super().__init__(0)
+        self.events = []
+        self.fixtures = []
+
+    def on_fixture_failed(self, group_name, fixture_type, exception_):
+        self.fixtures.append((group_name, fixture_type))
+
+    def on_success(self, test_):
+        self.events.append(('success', test_.name))
+
+    def on_failed(self, test_, exception_):
+        self.events.append(('failed', get_trace_filtered_by_filename(exception_)))
+
+    def on_broken(self, test_, exception_):
+        self.events.append(('broken', str(exception_)))
+
+
+def numbers():
+    return [1, 2, 3]
+
+
+def functions():
+    return [lambda: None]
+
+
+def first():
+    add_text('key', 'value')
+
+
+def second():
+    equals(1, 2)
+
+
+def third(it):
+    if it == 3:
+        int('a')
+
+
+def endless():
+    while True:
+        sleep(0.01)
+
+
+def dies():
+    os._exit(3)
+
+
+class ProcessPoolTest(TestCase):
+
+    def setUp(self):
+        clear()
+        reload(r)
+
+    def tearDown(self):
+        reload(r)
+
+    def test_results_are_sent_back(self):
+        test(groups=('one',))(first)
+        test(groups=('two',))(second)
+        provider(numbers)
+        test(groups=('three',), data_provider='numbers')(third)
+        listener = RecordingListener()
+        r.start(listener=listener, processes=2)
+        suite = TestSuite.get_instance()
+        self.assertEqual(3, len(suite.success()))
+        self.assertEqual(1, len(suite.failed()))
+        self.assertEqual(1, len(suite.broken()))
+        self.assertEqual(5, suite.tests_count())
+        self.assertEqual({'key': 'value'}, suite.groups['one'].test_results[0].report_params)
+        self.assertEqual([1, 2, 3], sorted(t.argument for t in suite.groups['three'].test_results))
+        self.assertEqual(5, len(listener.events))
+
+    def test_traceback_is_sent_back(self):
+        test(groups=('one',))(first)
+        test(groups=('two',))(second)
+        listener = RecordingListener()
+        r.start(listener=listener, processes=2)
+        trace = [text for status, text in listener.events if status == 'failed'][0]
+        self.assertTrue('equals(1, 2)' in trace)
+
+    def test_max_fail_stops_workers(self):
+        test(groups=('one',))(second)
+        test(groups=('two',))(second)
+        r.start(listener=RecordingListener(), processes=2, max_fail=1)
+        self.assertTrue(len(TestSuite.get_instance().failed()) >= 1)
+        self.assertFalse(r._can_run)
+
+    def test_one_group_runs_in_main_process(self):
+        test(groups=('one',))(first)
+        r.start(listener=RecordingListener(), processes=2)
+        self.assertEqual(1, len(TestSuite.get_instance().success()))
+
+    def test_dead_worker_breaks_group(self):
+        test(groups=('one',))(dies)
+        test(groups=('two',))(first)
+        listener = RecordingListener()
+        start_time = time()
+        r.start(listener=listener, processes=2)
+        self.assertTrue(time() - start_time < 30)
+        # the group, which was running at the other worker, can be broken too
+        self.assertIn(('one', 'worker process'), listener.fixtures)
+
+    def test_unknown_test_is_error(self):
+        packed = _PackedTest({'key': ['module', 'name']})
+        with self.assertRaises(LookupError):
+            _unpack(packed, {})
+
+
+class IsolateTest(TestCase):
+
+    def setUp(self):
+        clear()
+        reload(r)
+
+    def tearDown(self):
+        reload(r)
+
+    def test_isolated_results(self):
+        test(isolate=True)(first)
+        test(isolate=True)(second)
+        provider(numbers)
+        test(isolate=True, data_provider='numbers')(third)
+        listener = RecordingListener()
+        r.start(listener=listener)
+        suite = TestSuite.get_instance()
+        self.assertEqual(3, len(suite.success()))
+        self.assertEqual(1, len(suite.failed()))
+        self.assertEqual(1, len(suite.broken()))
+        self.assertEqual({'key': 'value'}, [t for t in suite.success() if t.name == 'first'][0].report_params)
+        self.assertTrue('equals(1, 2)' in [text for status, text in listener.events if status == 'failed'][0])
+        self.assertEqual(['1', '2', '3'], sorted(t.str_arg for t in suite.groups[third.__module__].test_results
+                                                 if t.name.startswith('third')))
+
+    def test_not_picklable_argument_with_spawn(self):
+        provider(functions)
+        test(isolate=True, data_provider='functions')(third)
+        listener = RecordingListener()
+        with patch('multiprocessing.get_context', lambda: get_context('spawn')):
+            r.start(listener=listener)
+        self.assertEqual(1, len(listener.events))
+        self.assertTrue(listener.events[0][1].endswith('can not be sent to the child process!'))
+
+    def test_isolated_timeout_kills_process(self):
+        test(isolate=True, timeout=1)(endless)
+        listener = RecordingListener()
+        start_time = time()
+        r.start(listener=listener)
+        self.assertTrue(time() - start_time < 3)
+        self.assertEqual(1, len(listener.events))
+        self.assertTrue(listener.events[0][1].startswith('Time (1 seconds) is over for test'))
+
+    def test_isolated_process_died(self):
+        test(isolate=True)(dies)
+        listener = RecordingListener()
+        r.start(listener=listener)
+        self.assertEqual(1, len(listener.events))
+        self.assertTrue(listener.events[0][1].endswith('has died with exit code 3!'))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,303 @@
+import os
+import asyncio
+import pickle
+from time import sleep, time
+from threading import Thread
+from tempfile import mkdtemp
+from unittest import TestCase, main
+from unittest.mock import patch
+
+from checking import runner as r
+from checking.annotations import provider, test
+from checking.classes.basic_suite import TestSuite
+from checking.classes.listeners.basic import Listener
+from checking.classes.provider_cache import ProviderCache, source_key
+from tests.fixture_behaviour_test import clear
+
+CALLS = []
+
+
+def numbers():
+    CALLS.append(1)
+    return [1, 2, 3]
+
+
+def check(it):
+    pass
+
+
+def slow_check(it):
+    sleep(0.2)
+
+
+def fast_check(it):
+    sleep(0.1)
+
+
+def six_numbers():
+    CALLS.append(1)
+    sleep(0.1)
+    return range(6)
+
+
+async def async_check(it):
+    await asyncio.sleep(0.2)
+
+
+def slow_numbers():
+    CALLS.append(1)
+    sleep(0.1)
+    return [1, 2, 3]
+
+
+def _make(value):
+    def _():
+        return value
+
+    return _
+
+
+class ProviderCacheTest(TestCase):
+
+    def setUp(self):
+        self.cache = ProviderCache(memory_limit=2000, provider_limit=1000)
+
+    def tearDown(self):
+        self.cache.clear()
+
+    def test_dict_interface(self):
+        self.cache['one'] = [1, 2, 3]
+        self.assertTrue('one' in self.cache)
+        self.assertFalse('two' in self.cache)
+        self.assertEqual(1, len(self.cache))
+        self.assertEqual((1, 2, 3), self.cache['one'])
+
+    def test_clear(self):
+        self.cache['one'] = [1]
+        self.cache.clear()
+        self.assertFalse('one' in self.cache)
+        self.assertEqual(0, len(self.cache))
+
+    def test_provider_limit_spills_values(self):
+        values = ['x' * 100 for _ in range(50)]
+        self.cache['big'] = values
+        self.assertTrue(self.cache.memory_size() <= 1000)
+        self.assertEqual(values, list(self.cache['big']))
+        # cached values can be read many times
+        self.assertEqual(values, list(self.cache['big']))
+
+    def test_values_are_pickled_once(self):
+        self.cache.directory = mkdtemp()
+        values = ['x' * 100 for _ in range(50)]
+        with patch('pickle.dumps', side_effect=pickle.dumps) as dumps:
+            writer = self.cache.writer('big', 'key')
+            for value in values:
+                writer.append(value)
+            writer.commit()
+        self.assertEqual(50, dumps.call_count)
+        self.assertEqual(values, list(self.cache['big']))
+        self.assertEqual(values, list(self.cache.load('big', 'key')))
+
+    def test_least_recently_used_is_spilled(self):
+        self.cache['one'] = ['x' * 100 for _ in range(8)]
+        self.cache['two'] = ['y' * 100 for _ in range(8)]
+        # 'one' is used, so 'two' is the least recently used now
+        list(self.cache['one'])
+        self.cache['three'] = ['z' * 100 for _ in range(8)]
+        self.assertTrue(self.cache.memory_size() <= 2000)
+        self.assertEqual(tuple(['x' * 100] * 8), self.cache['one'])
+        self.assertFalse(isinstance(self.cache['two'], tuple))
+        self.assertEqual(['y' * 100] * 8, list(self.cache['two']))
+
+    def test_not_picklable_values_stay_in_memory(self):
+        values = [lambda: i for i in range(100)]
+        self.cache['lambdas'] = values
+        self.assertEqual(tuple(values), self.cache['lambdas'])
+
+    def test_discarded_values_are_not_cached(self):
+        writer = self.cache.writer('one')
+        writer.append(1)
+        writer.discard()
+        self.assertFalse('one' in self.cache)
+
+    def test_begin_once(self):
+        self.assertTrue(self.cache.begin('one'))
+        self.assertFalse(self.cache.begin('one', wait=False))
+        self.cache['one'] = [1]
+        self.assertFalse(self.cache.begin('one'))
+        self.assertEqual(0, self.cache.duplicates_avoided)
+
+    def test_begin_after_discard(self):
+        self.assertTrue(self.cache.begin('one'))
+        writer = self.cache.writer('one')
+        writer.append(1)
+        writer.discard()
+        self.assertTrue(self.cache.begin('one'))
+
+    def test_waiting_thread_uses_values(self):
+        self.assertTrue(self.cache.begin('one'))
+        results = []
+        thread = Thread(target=lambda: results.append(self.cache.begin('one')))
+        thread.start()
+        sleep(0.05)
+        self.assertTrue(thread.is_alive())
+        self.cache['one'] = [1]
+        thread.join(1)
+        self.assertEqual([False], results)
+        self.assertEqual(1, self.cache.duplicates_avoided)
+
+
+class SingleFlightTest(TestCase):
+
+    def setUp(self):
+        clear()
+        CALLS.clear()
+
+    def tearDown(self):
+        clear()
+
+    def test_provider_called_once_by_threads(self):
+        provider(cached=True)(slow_numbers)
+        results = []
+
+        def run():
+            results.append(list(r._cache_provider('slow_numbers')))
+
+        threads = [Thread(target=run) for _ in range(3)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(2)
+        self.assertEqual(1, len(CALLS))
+        self.assertEqual([[1, 2, 3]] * 3, results)
+        self.assertEqual(2, TestSuite.get_instance().cache.duplicates_avoided)
+
+    def test_provider_called_once_by_groups(self):
+        provider(cached=True)(slow_numbers)
+        for group in ('one', 'two', 'three'):
+            test(groups=(group,), data_provider='slow_numbers')(check)
+        r.start(listener=Listener(0), threads=3)
+        self.assertEqual(9, len(TestSuite.get_instance().success()))
+        self.assertEqual(1, len(CALLS))
+
+    def test_groups_do_not_wait_for_tests_of_each_other(self):
+        provider(cached=True)(slow_numbers)
+        for group in ('one', 'two'):
+            test(groups=(group,), data_provider='slow_numbers')(slow_check)
+        start_time = time()
+        r.start(listener=Listener(0), threads=2)
+        self.assertTrue(time() - start_time < 1.0)
+        self.assertEqual(6, len(TestSuite.get_instance().success()))
+        self.assertEqual(1, len(CALLS))
+
+
+    def test_provider_called_once_by_async_groups(self):
+        provider(cached=True)(slow_numbers)
+        for group in ('one', 'two'):
+            test(groups=(group,), data_provider='slow_numbers')(async_check)
+            TestSuite.get_instance().groups[group].max_concurrency = 2
+        r.start(listener=Listener(0), threads=2)
+        self.assertEqual(6, len(TestSuite.get_instance().success()))
+        self.assertEqual(1, len(CALLS))
+        self.assertEqual(1, TestSuite.get_instance().cache.duplicates_avoided)
+
+    def test_sync_group_does_not_wait_for_async_tests(self):
+        provider(cached=True)(six_numbers)
+        test(groups=('one',), data_provider='six_numbers')(async_check)
+        test(groups=('two',), data_provider='six_numbers')(fast_check)
+        suite = TestSuite.get_instance()
+        suite.groups['one'].max_concurrency = 2
+        # the async group builds the values
+        suite.groups['two'].add_before(lambda: sleep(0.05))
+        start_time = time()
+        r.start(listener=Listener(0), threads=2)
+        self.assertTrue(time() - start_time < 0.95)
+        self.assertEqual(12, len(suite.success()))
+        self.assertEqual(1, len(CALLS))
+
+class PersistentCacheTest(TestCase):
+
+    def setUp(self):
+        clear()
+        CALLS.clear()
+        self.directory = mkdtemp()
+
+    def tearDown(self):
+        clear()
+        TestSuite.get_instance().cache.directory = None
+
+    def test_source_key_is_stable(self):
+        self.assertEqual(source_key(numbers), source_key(numbers))
+        self.assertNotEqual(source_key(numbers), source_key(check))
+
+    def test_source_key_depends_on_closure(self):
+        self.assertEqual(source_key(_make(1)), source_key(_make(1)))
+        self.assertNotEqual(source_key(_make(1)), source_key(_make(2)))
+
+    def test_source_key_without_stable_closure(self):
+        self.assertIsNone(source_key(_make(object())))
+
+    def test_source_key_depends_on_called_functions(self):
+        namespace = {}
+        exec('def helper():\n    return 1\n\ndef values():\n    return [helper()]', namespace)
+        key = source_key(namespace['values'])
+        exec('def helper():\n    return 2', namespace)
+        self.assertNotEqual(key, source_key(namespace['values']))
+
+    def test_old_files_are_removed(self):
+        cache = ProviderCache()
+        cache.directory = self.directory
+        other = os.path.join(self.directory, f'other-{"c" * 32}.pickle')
+        open(other, 'wb').close()
+        for key in ('a' * 32, 'b' * 32):
+            writer = cache.writer('numbers', key)
+            writer.append(1)
+            writer.commit()
+        self.assertEqual(sorted([f'numbers-{"b" * 32}.pickle', os.path.basename(other)]),
+                         sorted(os.listdir(self.directory)))
+
+    def test_source_key_depends_on_input_files(self):
+        file_name = os.path.join(self.directory, 'data.txt')
+        with open(file_name, 'wt') as file:
+            file.write('1')
+        func = _make(1)
+        func.input_files = (file_name,)
+        key = source_key(func)
+        with open(file_name, 'wt') as file:
+            file.write('12')
+        self.assertNotEqual(key, source_key(func))
+
+    def test_values_are_loaded_by_next_run(self):
+        for _ in range(2):
+            clear()
+            provider(cached=True)(numbers)
+            test(data_provider='numbers')(check)
+            r.start(listener=Listener(0), cache_dir=self.directory)
+            self.assertEqual(3, len(TestSuite.get_instance().success()))
+        self.assertEqual(1, len(CALLS))
+        self.assertEqual(1, len(os.listdir(self.directory)))
+
+    def test_same_file_is_written_by_two_processes(self):
+        caches = [ProviderCache(), ProviderCache()]
+        for cache in caches:
+            cache.directory = self.directory
+        writers = [cache.writer('numbers', 'key') for cache in caches]
+        for value in numbers():
+            for writer in writers:
+                writer.append(value)
+        for writer in writers:
+            writer.commit()
+        self.assertEqual([1, 2, 3], list(caches[0].load('numbers', 'key')))
+        self.assertEqual(1, len(os.listdir(self.directory)))
+
+    def test_not_used_without_cache_dir(self):
+        for _ in range(2):
+            clear()
+            provider(cached=True)(numbers)
+            test(data_provider='numbers')(check)
+            r.start(listener=Listener(0))
+        self.assertEqual(2, len(CALLS))
+
+
+if __name__ == '__main__':
+    main()
@@ -1,4 +1,6 @@
 import os
+import json
+import hashlib
 import shutil
 from importlib import reload
 
@@ -8,11 +10,24 @@ from unittest import main, TestCase
 from checking import runner
 from checking import test_break, TestBrokenException
 from checking.annotations import test
+from checking.helpers import report
 from checking.helpers.report import add_text, add_img, generate
+from checking.helpers.attachments import Attachment
+from checking.classes.basic_test import Test
+from checking.classes.listeners.basic import Listener
+from checking.classes.listeners.report_writer import ReportListener
 from checking.classes.basic_suite import TestSuite
 from tests.fixture_behaviour_test import clear
 
 
+def _read_data(name: str):
+    with open(f'{os.getcwd()}{sep}test_results{sep}data{sep}{name}.js', encoding='utf-8') as f:
+        text = f.read()
+    prefix = f"report_data('{name}', "
+    assert text.startswith(prefix)
+    return json.loads(text[len(prefix):-3])
+
+
 class TestReport(TestCase):
 
     def test_add_text(self):
@@ -25,6 +40,21 @@ class TestReport(TestCase):
         t.run()
         self.assertEqual({'A': 'B'}, t.report_params)
 
+    def test_add_img_with_the_same_name(self):
+        def _():
+            add_img('screenshot', b'first')
+            add_img('screenshot', b'second')
+            add_text('screenshot', 'text')
+            add_text('screenshot', 'other text')
+
+        clear()
+        test(_)
+        t = list(TestSuite.get_instance().groups.values())[0].tests[0]
+        t.run()
+        self.assertEqual({'screenshot': hashlib.sha256(b'first').hexdigest(),
+                          'screenshot (2)': hashlib.sha256(b'second').hexdigest(),
+                          'screenshot (3)': 'other text'}, t.report_params)
+
     def test_add_img(self):
         def _():
             add_img("A", b"B")
@@ -33,7 +63,19 @@ class TestReport(TestCase):
         test(_)
         t = list(TestSuite.get_instance().groups.values())[0].tests[0]
         t.run()
-        self.assertEqual({b'B': 'A'}, t.report_params)
+        digest = hashlib.sha256(b'B').hexdigest()
+        self.assertEqual({'A': digest}, t.report_params)
+        self.assertIsInstance(t.report_params['A'], Attachment)
+        report.store.flush()
+        # nothing is written without the report
+        self.assertFalse(os.path.exists(report.store.path(digest)))
+        report.store.enable()
+        report.store.flush()
+        try:
+            with open(report.store.path(digest), 'rb') as f:
+                self.assertEqual(b'B', f.read())
+        finally:
+            shutil.rmtree(f'{os.getcwd()}{sep}test_results')
 
     def generate_empty(self):
         clear()
@@ -232,6 +274,85 @@ class TestReport(TestCase):
 </body>
 </html>""")
 
+    def test_generate_paged(self):
+        def _1():
+            add_text('text', 'value')
+
+        def _2():
+            test_break()
+
+        clear()
+        test(_1)
+        test(_2)
+        TestSuite.get_or_create('other')
+        page_size = report.PAGE_SIZE
+        report.PAGE_SIZE = 1
+        try:
+            runner.start(listener=Listener(0), generate_report=True, report_mode='paged')
+        finally:
+            report.PAGE_SIZE = page_size
+        folder = f'{os.getcwd()}{sep}test_results'
+        try:
+            with open(f'{folder}{sep}index.html') as f:
+                html = f.read()
+            index = _read_data('index')
+            pages = [_read_data('page_0'), _read_data('page_1')]
+        finally:
+            shutil.rmtree(folder)
+        self.assertIn('<td>Default Test Suite</td>', html)
+        self.assertNotIn('#total_tests', html)
+        self.assertEqual(2, index['pages'])
+        self.assertEqual(2, index['tests'])
+        self.assertEqual([(0, 1, 2), (2, 0, 0)],
+                         [(group['first'], group['success'], group['total']) for group in index['groups']])
+        self.assertEqual('other', index['groups'][1]['name'])
+        self.assertEqual([['text', 'value', None]], pages[0][0]['p'])
+        self.assertEqual(('_1', 'success', None), (pages[0][0]['n'], pages[0][0]['s'], pages[0][0]['r']))
+        self.assertEqual(('_2', 'broken', 0), (pages[1][0]['n'], pages[1][0]['s'], pages[1][0]['g']))
+        self.assertIn('test_break()', pages[1][0]['t'])
+
+    def test_generate_incremental(self):
+        def _1():
+            pass
+
+        def _2():
+            test_break()
+
+        clear()
+        test(_1)
+        test(_2)
+        folder = f'{os.getcwd()}{sep}test_results'
+        try:
+            runner.start(listener=Listener(0), generate_report=True, report_mode='incremental')
+            index = _read_data('index')
+            page = _read_data('page_0')
+            with open(f'{folder}{sep}index.html') as f:
+                html = f.read()
+        finally:
+            shutil.rmtree(folder)
+        self.assertEqual((1, 2), (index['pages'], index['tests']))
+        self.assertEqual([(1, 2)], [(group['success'], group['total']) for group in index['groups']])
+        self.assertEqual([('_1', 'success'), ('_2', 'broken')], sorted((test_['n'], test_['s']) for test_ in page))
+        self.assertNotIn('not finished', html)
+
+    def test_report_listener_writes_while_running(self):
+        clear()
+        listener = ReportListener(flush_interval=0)
+        folder = f'{os.getcwd()}{sep}test_results'
+        try:
+            TestSuite.start_suite()
+            listener.on_suite_starts(TestSuite.get_instance())
+            with open(f'{folder}{sep}index.html') as f:
+                self.assertIn('not finished', f.read())
+            self.assertEqual(0, _read_data('index')['pages'])
+            test_ = Test('name', lambda: None)
+            test_.stop()
+            listener.on_success(test_)
+            self.assertEqual(1, _read_data('index')['pages'])
+            self.assertEqual(['name'], [test_['n'] for test_ in _read_data('page_0')])
+        finally:
+            shutil.rmtree(folder)
+
 
 if __name__ == '__main__':
     main()
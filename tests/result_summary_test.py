@@ -0,0 +1,91 @@
+from unittest import TestCase, main
+
+from checking import runner as r
+from checking.annotations import provider, test
+from checking.classes.basic_test import Test
+from checking.classes.basic_group import TestGroup
+from checking.classes.basic_suite import TestSuite
+from checking.classes.listeners.basic import Listener
+from checking.classes.result_summary import ResultSummary
+from tests.fixture_behaviour_test import clear
+
+
+def numbers():
+    return range(10)
+
+
+def odd_fails(it):
+    assert it % 2 == 0
+
+
+class ResultSummaryTest(TestCase):
+
+    def test_add(self):
+        summary = ResultSummary()
+        summary.add(0.0005)
+        summary.add(0.05)
+        summary.add(0.07)
+        summary.add(100)
+        self.assertEqual(4, summary.count)
+        self.assertAlmostEqual(100.1205, summary.duration)
+        self.assertEqual([('<1ms', 1), ('<100ms', 2), ('>=60s', 1)], summary.buckets())
+        self.assertEqual('<1ms: 1, <100ms: 2, >=60s: 1', str(summary))
+
+    def test_update(self):
+        summary = ResultSummary()
+        summary.add(0.5)
+        other = ResultSummary()
+        other.add(0.5)
+        other.add(5)
+        summary.update(other)
+        self.assertEqual(3, summary.count)
+        self.assertEqual([('<1s', 2), ('<10s', 1)], summary.buckets())
+
+    def test_group_folds_passed_tests(self):
+        group = TestGroup('group')
+        group.summary = ResultSummary()
+        passed = Test('passed', print)
+        failed = Test('failed', print)
+        group.add_test(passed)
+        group.add_test(failed)
+        passed.stop()
+        failed.stop(AssertionError())
+        self.assertEqual([], group.tests_by_status('success'))
+        self.assertEqual(1, len(group.test_results))
+        self.assertEqual(1, group.results_count('success'))
+        self.assertEqual(1, group.results_count('failed'))
+        self.assertEqual(2, group.results_count())
+        self.assertEqual(2, group.tests_count())
+
+
+class SummaryModeTest(TestCase):
+
+    def setUp(self):
+        clear()
+
+    def tearDown(self):
+        clear()
+
+    def test_run_with_summary(self):
+        provider(numbers)
+        test(data_provider='numbers')(odd_fails)
+        r.start(listener=Listener(0), results='summary')
+        suite = TestSuite.get_instance()
+        self.assertEqual([], suite.success())
+        self.assertEqual(5, suite.results_count('success'))
+        self.assertEqual(5, len(suite.failed()))
+        self.assertEqual(10, suite.tests_count())
+        self.assertEqual(5, suite.summary().count)
+
+    def test_run_with_all(self):
+        provider(numbers)
+        test(data_provider='numbers')(odd_fails)
+        r.start(listener=Listener(0))
+        suite = TestSuite.get_instance()
+        self.assertEqual(5, len(suite.success()))
+        self.assertEqual(5, suite.results_count('success'))
+        self.assertIsNone(suite.summary())
+
+
+if __name__ == '__main__':
+    main()
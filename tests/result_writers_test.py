@@ -0,0 +1,118 @@
+import os
+import json
+from tempfile import mkdtemp
+from unittest import TestCase, main
+from xml.etree import ElementTree
+
+from checking import runner as r
+from checking.annotations import provider, test
+from checking.classes.basic_test import Test
+from checking.classes.basic_suite import TestSuite
+from checking.classes.listeners.basic import Listener
+from checking.classes.listeners.result_writers import JUnitListener, JsonLinesListener
+from tests.fixture_behaviour_test import clear
+
+
+def numbers():
+    return range(4)
+
+
+def odd_fails(it):
+    assert it % 2 == 0
+
+
+def broken():
+    int('a')
+
+
+def passed():
+    pass
+
+
+class ResultWritersTest(TestCase):
+
+    def setUp(self):
+        clear()
+        self.directory = mkdtemp()
+        provider(numbers)
+        test(data_provider='numbers')(odd_fails)
+        test(broken)
+        test(passed)
+
+    def tearDown(self):
+        clear()
+
+    def _read_lines(self, file_name: str):
+        with open(file_name, encoding='utf-8') as file:
+            return [json.loads(line) for line in file]
+
+    def test_json_lines(self):
+        file_name = os.path.join(self.directory, 'results.jsonl')
+        r.start(listener=[Listener(0), JsonLinesListener(file_name)])
+        lines = self._read_lines(file_name)
+        self.assertEqual(7, len(lines))
+        self.assertEqual(['test'] * 6 + ['suite'], [line['type'] for line in lines])
+        statuses = sorted((line['name'], line['argument'], line['status']) for line in lines[:-1])
+        self.assertEqual([('broken', None, 'broken'), ('odd_fails', '0', 'success'), ('odd_fails', '1', 'failed'),
+                          ('odd_fails', '2', 'success'), ('odd_fails', '3', 'failed'), ('passed', None, 'success')],
+                         statuses)
+        broken_ = [line for line in lines if line.get('status') == 'broken'][0]
+        self.assertEqual('ValueError', broken_['exception'])
+        self.assertIn("int('a')", broken_['traceback'])
+        self.assertEqual({'type': 'suite', 'tests': 6, 'success': 3, 'failed': 2, 'broken': 1, 'ignored': 0},
+                         {key: value for key, value in lines[-1].items() if key not in ('name', 'start', 'end', 'duration')})
+
+    def test_junit(self):
+        file_name = os.path.join(self.directory, 'junit.xml')
+        r.start(listener=[Listener(0), JUnitListener(file_name)])
+        suite = ElementTree.parse(file_name).getroot().find('testsuite')
+        self.assertEqual(TestSuite.name, suite.get('name'))
+        self.assertEqual(('6', '2', '1', '0'), tuple(suite.get(key) for key in ('tests', 'failures', 'errors',
+                                                                                'skipped')))
+        cases = suite.findall('testcase')
+        self.assertEqual(6, len(cases))
+        self.assertEqual(2, len([case for case in cases if case.find('failure') is not None]))
+        error = [case.find('error') for case in cases if case.find('error') is not None][0]
+        self.assertEqual('ValueError', error.get('type'))
+        self.assertIn('odd_fails[1]', [case.get('name') for case in cases])
+
+    def test_junit_is_valid_before_the_end(self):
+        file_name = os.path.join(self.directory, 'junit.xml')
+        listener = JUnitListener(file_name)
+
+        listener.on_suite_starts(TestSuite.get_instance())
+        test_ = Test('name', lambda: None)
+        test_.stop()
+        listener.on_success(test_)
+        suite = ElementTree.parse(file_name).getroot().find('testsuite')
+        self.assertIsNone(suite.get('tests'))
+        self.assertEqual(['name'], [case.get('name') for case in suite.findall('testcase')])
+        test_.stop(AssertionError('<&>'))
+        listener.on_failed(test_, test_.reason)
+        suite = ElementTree.parse(file_name).getroot().find('testsuite')
+        self.assertEqual('<&>', suite.findall('testcase')[1].find('failure').get('message'))
+        listener.on_suite_ends(TestSuite.get_instance())
+        self.assertEqual('0', ElementTree.parse(file_name).getroot().find('testsuite').get('tests'))
+
+    def test_junit_time_of_not_started_test(self):
+        file_name = os.path.join(self.directory, 'junit.xml')
+        listener = JUnitListener(file_name)
+        listener.on_suite_starts(TestSuite.get_instance())
+        test_ = Test('name', lambda: None)
+        test_.status = 'ignored'
+        test_.stop()
+        listener.on_ignored(test_, 'before')
+        listener.on_suite_ends(TestSuite.get_instance())
+        case = ElementTree.parse(file_name).getroot().find('testsuite').find('testcase')
+        self.assertEqual('0.000', case.get('time'))
+
+    def test_empty_suite(self):
+        clear()
+        file_name = os.path.join(self.directory, 'junit.xml')
+        r.start(listener=[Listener(0), JUnitListener(file_name)])
+        suite = ElementTree.parse(file_name).getroot().find('testsuite')
+        self.assertEqual('0', suite.get('tests'))
+
+
+if __name__ == '__main__':
+    main()
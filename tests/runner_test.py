@@ -1,3 +1,6 @@
+from time import sleep, time
+from threading import Thread
+from concurrent.futures import ThreadPoolExecutor
 from importlib import reload
 from unittest import TestCase
 from unittest import main
@@ -280,6 +283,134 @@ class RunnerTest(TestCase):
         self.assertEqual(len(suite.failed()), 2)
         self.assertEqual(suite.tests_count(), 2)
 
+    def test_parallel_group_runs_tests_at_the_same_time(self):
+        clear()
+        reload(r)
+        order = []
+        group = TestSuite.get_instance().get_or_create('group')
+        group.parallel = True
+        group.add_before(lambda: order.append('before'))
+        group.add_after(lambda: order.append('after'))
+        for name in ('one', 'two', 'three', 'four'):
+            group.add_test(Test(name, lambda: sleep(0.3)))
+        start_time = time()
+        r.start(threads=4, listener=TestListener())
+        self.assertTrue(time() - start_time < 1.0)
+        self.assertEqual(['before', 'after'], order)
+        self.assertEqual(4, len(TestSuite.get_instance().success()))
+
+    def test_parallel_group_respects_priority(self):
+        clear()
+        reload(r)
+        order = []
+        group = TestSuite.get_instance().get_or_create('group')
+        group.parallel = True
+        late = Test('late', lambda: order.append('late'))
+        late.priority = 1
+        group.add_test(late)
+        for name in ('one', 'two', 'three'):
+            group.add_test(Test(name, lambda: (sleep(0.1), order.append('early'))))
+        r.start(threads=4, listener=TestListener())
+        self.assertEqual(['early', 'early', 'early', 'late'], order)
+
+    def test_parallel_group_without_threads_runs_serially(self):
+        clear()
+        reload(r)
+        group = TestSuite.get_instance().get_or_create('group')
+        group.parallel = True
+        group.add_test(Test('one', inc))
+        r.start(listener=TestListener())
+        self.assertIsNone(r._tests_pool)
+        self.assertEqual(1, len(TestSuite.get_instance().success()))
+
+
+    def test_parallel_provider_cases(self):
+        clear()
+        reload(r)
+        order = []
+        suite = TestSuite.get_instance()
+        suite.providers['data'] = (lambda: range(8), str)
+        suite.parallel.append('data')
+        test_ = Test('one', lambda it: (sleep(0.2), order.append(it)))
+        test_.provider = 'data'
+        suite.get_or_create('group').add_before_test(lambda: order.append('before'))
+        suite.get_or_create('group').add_test(test_)
+        start_time = time()
+        r.start(threads=4, listener=TestListener())
+        self.assertTrue(time() - start_time < 1.2)
+        self.assertEqual(8, len(suite.success()))
+        self.assertEqual(list(range(8)), sorted(it for it in order if it != 'before'))
+        self.assertEqual(8, order.count('before'))
+
+    def test_parallel_provider_at_thread_named_like_pool(self):
+        reload(r)
+        test_ = Test('one', inc)
+        test_.provider = 'data'
+        test_.parallel = True
+        result = []
+        r._tests_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix='Tests')
+        try:
+            thread = Thread(target=lambda: result.append(r._is_parallel_provider(test_)), name='Tests_user')
+            thread.start()
+            thread.join()
+            r._tests_pool.submit(r._run_one_test, Test('two', inc), False).result()
+            result.append(r._tests_pool.submit(r._is_parallel_provider, test_).result())
+        finally:
+            r._tests_pool.shutdown()
+            reload(r)
+        self.assertEqual([True, False], result)
+
+    def test_parallel_provider_cases_stop_on_before_failed(self):
+        clear()
+        reload(r)
+        suite = TestSuite.get_instance()
+        suite.providers['data'] = (lambda: range(300), str)
+        test_ = Test('one', inc)
+        test_.provider = 'data'
+        test_.parallel = True
+        suite.get_or_create('group').add_before_test(fail_exception)
+        suite.get_or_create('group').add_test(test_)
+        r.start(threads=2, listener=TestListener())
+        self.assertEqual(0, len(suite.success()))
+        self.assertTrue(len(suite.ignored()) < 300)
+
+
+    def test_prefetch_provider_closed(self):
+        clear()
+        reload(r)
+        closed = []
+
+        class Data:
+            def __iter__(self):
+                return iter(range(5))
+
+            def close(self):
+                closed.append(True)
+
+        suite = TestSuite.get_instance()
+        suite.providers['data'] = (Data, str)
+        suite.prefetch['data'] = 2
+        test_ = Test('one', lambda it: None)
+        test_.provider = 'data'
+        suite.get_or_create('group').add_test(test_)
+        r.start(listener=TestListener())
+        self.assertEqual(5, len(suite.success()))
+        self.assertEqual([True], closed)
+
+    def test_provider_cases_keep_own_results(self):
+        clear()
+        suite = TestSuite.get_instance()
+        suite.providers['data'] = (lambda: [0.0, 0.1], str)
+        test_ = Test('one', lambda it: sleep(it))
+        test_.provider = 'data'
+        suite.get_or_create('group').add_test(test_)
+        r.start(listener=TestListener())
+        first, second = suite.success()
+        self.assertIs(test_, first.definition)
+        self.assertIs(test_, second.definition)
+        self.assertEqual([0.0, 0.1], [first.argument, second.argument])
+        self.assertTrue(first.duration() < 0.1 <= second.duration())
+
 
 if __name__ == '__main__':
     main()
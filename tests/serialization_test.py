@@ -0,0 +1,110 @@
+import os
+import json
+import gzip
+import shutil
+from io import StringIO
+from contextlib import redirect_stdout
+from tempfile import mkdtemp
+from unittest import TestCase, main
+
+from checking import __main__ as m
+from checking.classes.basic_test import Test
+from checking.classes.basic_suite import TestSuite
+from checking.helpers.attachments import Attachment
+from checking.helpers.serialization import result_record, restore_test, load_results
+from tests.fixture_behaviour_test import clear
+
+
+def _failed_test() -> Test:
+    test = Test('name', lambda: None)
+    test.group_name = 'group'
+    test.provider = 'numbers'
+    test.argument, test.str_arg = 1, '1'
+    test.report_params = {'text': 'value', 'image': Attachment('abc')}
+    test.timer.start()
+    try:
+        int('a')
+    except ValueError as e:
+        test.stop(e)
+    return test
+
+
+class ResultRecordTest(TestCase):
+
+    def test_round_trip(self):
+        test = _failed_test()
+        record = json.loads(json.dumps(result_record(test)))
+        restored = restore_test(record)
+        self.assertEqual(('group', 'name', 'numbers', '1', 'broken'),
+                         (restored.group_name, restored.name, restored.provider, restored.argument, restored.status))
+        self.assertIs(ValueError, type(restored.reason))
+        self.assertEqual(str(test.reason), str(restored.reason))
+        self.assertIn("int('a')", restored.reason.remote_trace[-1][1])
+        self.assertEqual({'text': 'value', 'image': 'abc'}, restored.report_params)
+        self.assertIsInstance(restored.report_params['image'], Attachment)
+        self.assertNotIsInstance(restored.report_params['text'], Attachment)
+        self.assertAlmostEqual(test.duration(), restored.duration())
+
+    def test_unknown_exception(self):
+        record = result_record(_failed_test())
+        record['exception'] = 'MyError'
+        restored = restore_test(record)
+        self.assertEqual("MyError: invalid literal for int() with base 10: 'a'", str(restored.reason))
+
+
+class LoadResultsTest(TestCase):
+
+    def setUp(self):
+        clear()
+        self.directory = mkdtemp()
+
+    def tearDown(self):
+        clear()
+        shutil.rmtree(self.directory)
+
+    def _write(self, name: str, records: list, opener=open) -> str:
+        file_name = os.path.join(self.directory, name)
+        with opener(file_name, 'wt', encoding='utf-8') as file:
+            for record in records:
+                file.write(f'{json.dumps(record)}\n')
+        return file_name
+
+    def test_shards_are_merged(self):
+        test = _failed_test()
+        first = result_record(test)
+        second = dict(first, argument='2', status='success', exception=None, message=None, traceback=None,
+                      start=first['start'] + 10)
+        other = dict(second, group='other')
+        suite = {'type': 'suite', 'name': 'Suite', 'start': first['start'] - 1, 'end': first['start'] + 20}
+        file_names = [self._write('1.jsonl', [first, other, suite]), self._write('2.jsonl.gz', [second], gzip.open)]
+        # the cut line of the killed run is skipped
+        with open(file_names[0], 'at') as file:
+            file.write('{"type": "te')
+        test_suite = TestSuite.get_instance()
+        load_results(file_names, test_suite)
+        self.assertEqual('Suite', test_suite.name)
+        self.assertEqual(['group', 'other'], sorted(test_suite.groups))
+        self.assertEqual(3, test_suite.tests_count())
+        self.assertEqual((1, 2), (test_suite.results_count('broken'), test_suite.results_count('success')))
+        self.assertEqual(1, len(test_suite.groups['group'].tests))
+        self.assertAlmostEqual(21, test_suite.suite_duration())
+
+    def test_build_report(self):
+        file_name = self._write('results.jsonl', [result_record(_failed_test())])
+        cwd = os.getcwd()
+        os.chdir(self.directory)
+        try:
+            with redirect_stdout(StringIO()) as output:
+                m.build_report([file_name], 'paged')
+            self.assertIn('The report of 1 tests is written', output.getvalue())
+            self.assertTrue(os.path.exists(os.path.join('test_results', 'data', 'page_0.js')))
+        finally:
+            os.chdir(cwd)
+
+    def test_parse_report_arguments(self):
+        args = m.parse_report_arguments(['1.jsonl', '2.jsonl', '-m', 'paged', '-a', 'folder'])
+        self.assertEqual((['1.jsonl', '2.jsonl'], 'paged', ['folder']), (args.results, args.mode, args.attachments))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,102 @@
+import os
+import json
+from tempfile import mkdtemp
+from unittest import TestCase, main
+
+from checking import runner as r
+from checking.annotations import test
+from checking.classes.basic_test import Test
+from checking.classes.basic_suite import TestSuite
+from checking.classes.listeners.basic import Listener
+from checking.helpers.history import DurationHistory
+from checking.helpers.sharding import parse_shard, split, filter_shard
+from tests.fixture_behaviour_test import clear
+
+
+def fake():
+    pass
+
+
+def _fill_suite(groups: int, tests: int):
+    suite = TestSuite.get_instance()
+    for i in range(groups):
+        group = suite.get_or_create(f'group{i}')
+        for j in range(tests):
+            group.add_test(Test(f'test{j}', fake))
+
+
+def _names_of_shard(shard: str, groups: int, tests: int, history: DurationHistory = None):
+    clear()
+    _fill_suite(groups, tests)
+    suite = TestSuite.get_instance()
+    filter_shard(suite, shard, history)
+    return {f'{group.name}::{test.name}' for group in suite.groups.values() for test in group.tests}
+
+
+class ShardingTest(TestCase):
+
+    def setUp(self):
+        clear()
+
+    def test_parse_shard(self):
+        self.assertEqual((2, 4), parse_shard('2/4'))
+
+    def test_parse_shard_failed(self):
+        for shard in ('2', 'a/b', '0/4', '5/4', '1/0', '1/2/3'):
+            with self.assertRaises(ValueError):
+                parse_shard(shard)
+
+    def test_split_by_hash_is_stable(self):
+        keys = {f'key{i}': None for i in range(20)}
+        self.assertEqual(split(keys, 3), split(dict(reversed(list(keys.items()))), 3))
+        self.assertTrue(all(0 <= shard < 3 for shard in split(keys, 3).values()))
+
+    def test_split_by_weights(self):
+        shards = split({'a': 10.0, 'b': 6.0, 'c': 4.0}, 2)
+        self.assertEqual(shards['b'], shards['c'])
+        self.assertNotEqual(shards['a'], shards['b'])
+
+    def test_split_unknown_weight_is_mean(self):
+        shards = split({'a': 4.0, 'b': 1.0, 'c': 1.0, 'd': None}, 2)
+        self.assertEqual(shards['b'], shards['c'])
+        self.assertEqual(shards['b'], shards['d'])
+
+    def test_groups_are_split(self):
+        parts = [_names_of_shard(f'{i}/3', 5, 2) for i in (1, 2, 3)]
+        self.assertEqual(10, sum(len(part) for part in parts))
+        self.assertEqual(10, len(set.union(*parts)))
+
+    def test_tests_are_split_if_few_groups(self):
+        parts = [_names_of_shard(f'{i}/4', 2, 5) for i in (1, 2, 3, 4)]
+        self.assertEqual(10, sum(len(part) for part in parts))
+        self.assertEqual(10, len(set.union(*parts)))
+
+    def test_groups_are_split_by_history(self):
+        history = DurationHistory('')
+        history.groups = {'group0': 10.0, 'group1': 1.0, 'group2': 1.0, 'group3': 1.0}
+        self.assertEqual({'group0::test0'}, _names_of_shard('1/2', 4, 1, history))
+        self.assertEqual(3, len(_names_of_shard('2/2', 4, 1, history)))
+
+    def test_start_with_shard(self):
+        test(groups=('one',))(fake)
+        test(groups=('two',))(fake)
+        r.start(listener=Listener(0), shard='1/2')
+        suite = TestSuite.get_instance()
+        self.assertEqual(1, len(suite.groups))
+        self.assertEqual(1, len(suite.success()))
+
+
+    def test_dry_run_is_split_by_history(self):
+        file_name = os.path.join(mkdtemp(), 'history.json')
+        with open(file_name, 'wt') as file:
+            json.dump({'groups': {'group0': 10.0, 'group1': 1.0, 'group2': 1.0, 'group3': 1.0}, 'tests': {}}, file)
+        for i in range(4):
+            test(groups=(f'group{i}',))(fake)
+        r.start(listener=Listener(0), shard='1/2', dry_run=True, history_file=file_name)
+        self.assertEqual(['group0'], list(TestSuite.get_instance().groups))
+        # the durations of the dry run are not saved
+        with open(file_name) as file:
+            self.assertEqual(10.0, json.load(file)['groups']['group0'])
+
+if __name__ == '__main__':
+    main()
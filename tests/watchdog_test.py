@@ -0,0 +1,68 @@
+from time import sleep, time
+from threading import Event, active_count
+from unittest import TestCase, main
+
+from checking.classes.basic_test import Test
+from checking.exceptions import TestBrokenException
+from checking.classes.exc_thread import Watchdog, run_with_timeout, leaked_threads
+
+
+def long():
+    sleep(0.5)
+
+
+def failed():
+    int('a')
+
+
+class WatchdogTest(TestCase):
+
+    def test_deadlines_in_order(self):
+        watchdog = Watchdog()
+        fired = []
+        done = Event()
+        watchdog.register(0.2, lambda: (fired.append(2), done.set()))
+        watchdog.register(0.1, lambda: fired.append(1))
+        self.assertTrue(done.wait(2))
+        self.assertEqual([1, 2], fired)
+
+    def test_cancel(self):
+        watchdog = Watchdog()
+        fired = []
+        entry = watchdog.register(0.05, lambda: fired.append(1))
+        watchdog.cancel(entry)
+        sleep(0.15)
+        self.assertEqual([], fired)
+
+    def test_run_with_timeout_ok(self):
+        test_ = Test('name', lambda: None)
+        test_.timeout = 1
+        run_with_timeout(test_)
+
+    def test_run_with_timeout_raises_exception(self):
+        test_ = Test('name', failed)
+        test_.timeout = 1
+        with self.assertRaises(ValueError):
+            run_with_timeout(test_)
+
+    def test_run_with_timeout_time_is_over(self):
+        test_ = Test('name', long)
+        test_.timeout = 0.1
+        start_time = time()
+        with self.assertRaises(TestBrokenException):
+            run_with_timeout(test_)
+        self.assertTrue(time() - start_time < 0.4)
+        leaked = leaked_threads()
+        self.assertTrue(leaked >= 1)
+        sleep(0.5)
+        self.assertLess(leaked_threads(), leaked)
+
+    def test_one_thread_per_call(self):
+        before = active_count()
+        test_ = Test('name', lambda: self.assertTrue(active_count() <= before + 2))
+        test_.timeout = 1
+        run_with_timeout(test_)
+
+
+if __name__ == '__main__':
+    main()